@@ -9,6 +9,7 @@ from infrastructure.models.role import Role
 from infrastructure.models.user_role import UserRole
 from infrastructure.models.user_history import UserHistory
 from infrastructure.models.social_account import SocialAccount
+from infrastructure.models.outbox import OutboxEvent
 from settings.config import settings
 
 target_metadata = Base.metadata
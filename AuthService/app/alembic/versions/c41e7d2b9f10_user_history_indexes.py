@@ -0,0 +1,39 @@
+"""user history indexes
+
+Revision ID: c41e7d2b9f10
+Revises: a6747a9f50eb
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7d2b9f10'
+down_revision: Union[str, None] = 'a6747a9f50eb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_user_history_user_id_attempted',
+        'user_history',
+        ['user_id', sa.text('attempted DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_user_history_attempted_brin',
+        'user_history',
+        ['attempted'],
+        unique=False,
+        postgresql_using='brin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_history_attempted_brin', table_name='user_history')
+    op.drop_index('ix_user_history_user_id_attempted', table_name='user_history')
@@ -0,0 +1,21 @@
+from typing import Any
+
+from fastapi import APIRouter, Response
+
+from infrastructure.security.key_ring import get_key_ring
+from settings.config import settings
+
+
+router = APIRouter(
+    tags=['Keys'],
+)
+
+@router.get(
+    "/jwks.json",
+    description="Public keys access tokens are signed with, as a JSON Web Key Set",
+    response_description="JSON Web Key Set",
+    summary="Token verification keys",
+)
+async def get_jwks(response: Response) -> dict[str, list[dict[str, Any]]]:
+    response.headers["Cache-Control"] = f"public, max-age={settings.jwks_max_age_seconds}"
+    return get_key_ring().jwks()
@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 import os
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
@@ -11,11 +12,22 @@ from infrastructure.models.user import User
 from schemas.role import Roles
 from settings.config import settings
 from logic.dependencies.main import setup_dependencies
+from logic.dependencies.registrator import Lifetime, reset_scope
+from logic.services.cache import CacheInvalidationBus
+from logic.services.login_history import get_login_history_writer
+from logic.services.outbox_relay import get_outbox_relay
+from logic.services.password import get_password_hasher, shutdown_password_hasher
+from logic.services.role_catalog import get_role_catalog
 from api.v1.accounts.handlers import router as accounts_router
 from api.v1.roles.handlers import router as roles_router
 from api.v1.users.handlers import router as users_router
 from api.v1.socials.handlers import router as socials_router
+from api.v1.metrics.handlers import router as metrics_router
+from api.v1.keys.handlers import router as keys_router
 from infrastructure.database.postgres import Base, async_session
+from infrastructure.kafka.sender import get_queued_sender, start_producer, stop_producer
+from infrastructure.security.key_ring import get_key_ring
+from infrastructure.storages.revocation import get_revocation_filter
 
 from infrastructure.database import redis
 
@@ -41,7 +53,9 @@ async def create_superuser():
             )
             super_admin_user = User(
                 login=settings.super_admin_login,
-                password=settings.super_admin_password,
+                password_hash=await get_password_hasher().hash(
+                    settings.super_admin_password
+                ),
                 tg_id=settings.super_admin_tg_id,
                 email=settings.super_admin_email
             )
@@ -61,10 +75,38 @@ async def lifespan(_: FastAPI):
         password=settings.redis_password,
         db=0
     )
+    await redis.configure_memory(redis.redis)
+    get_key_ring()
     apply_migrations()
     await create_superuser()
+    listeners = [
+        asyncio.create_task(CacheInvalidationBus(_client=redis.redis).run()),
+        asyncio.create_task(get_role_catalog(redis.redis).run()),
+        asyncio.create_task(get_revocation_filter(redis.redis).run()),
+        asyncio.create_task(start_producer()),
+    ]
+    if settings.outbox_enabled:
+        listeners.append(asyncio.create_task(get_outbox_relay().run()))
+    history_writer = asyncio.create_task(get_login_history_writer().run())
+    queued_sender = None
+    if settings.kafka_send_queued:
+        queued_sender = asyncio.create_task(get_queued_sender().run())
     yield
+    get_login_history_writer().close()
+    await history_writer
+    if queued_sender is not None:
+        get_queued_sender().close()
+        # on timeout the task is cancelled and spills or drops what is left
+        with suppress(TimeoutError):
+            await asyncio.wait_for(queued_sender, settings.kafka_drain_seconds)
+    for listener in listeners:
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+    reset_scope(Lifetime.WORKER)
+    await stop_producer()
     await redis.redis.aclose()
+    shutdown_password_hasher()
     
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -88,6 +130,8 @@ def create_app() -> FastAPI:
     app.include_router(socials_router, prefix='/socials')
     app.include_router(users_router, prefix='/users')
     app.include_router(roles_router, prefix='/roles')
+    app.include_router(metrics_router, prefix='/metrics')
+    app.include_router(keys_router, prefix='/.well-known')
     
     setup_dependencies(app)
     
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+
+from infrastructure.metrics.registry import metrics
+
+
+router = APIRouter(
+    tags=['Metrics'],
+)
+
+@router.get(
+    "/",
+    description="Per-worker service counters and gauges",
+    summary="Service metrics",
+)
+async def get_metrics() -> dict[str, float]:
+    return metrics.snapshot()
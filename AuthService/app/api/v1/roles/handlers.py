@@ -3,9 +3,11 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from infrastructure.models.role import Role
 from schemas.result import GenericResult
-from logic.services.auth import BaseAuthService, require_roles
+from logic.services.auth import require_roles
 from logic.services.role import BaseRoleService
+from schemas.pagination import Page
 from schemas.role import RoleBase, RoleCreateDTO, RoleDTO, RoleUpdateDTO, Roles
+from settings.config import settings
 
 
 router = APIRouter(
@@ -14,19 +16,32 @@ router = APIRouter(
 
 @router.get(
     "/",
-    response_model=list[RoleBase],
+    response_model=Page[RoleBase],
     description="Display existing system roles",
     response_description="Information about available system roles",
     summary="Display existing system roles",
+    dependencies=[require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])],
 )
-@require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])
 async def get_roles(
-    skip: Annotated[int, Query(description="Items to skip", ge=0)] = 0,
-    limit: Annotated[int, Query(description="Pagination page size", ge=1)] = 10,
+    cursor: Annotated[
+        str | None, Query(description="next_cursor of the previous page")
+    ] = None,
+    limit: Annotated[
+        int, Query(description="Pagination page size", ge=1, le=settings.max_page_size)
+    ] = 10,
+    with_total: Annotated[
+        bool, Query(description="Include an estimated total number of roles")
+    ] = False,
     role_service: BaseRoleService = Depends(),
-    auth_service: BaseAuthService = Depends(),
-) -> list[RoleBase]:
-    return await role_service.get_roles(skip=skip, limit=limit)
+) -> Page[RoleBase]:
+    result = await role_service.get_roles(
+        cursor=cursor, limit=limit, with_total=with_total
+    )
+    if not result.is_success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=result.error_code.reason
+        )
+    return result.response
 
 
 @router.get(
@@ -35,12 +50,11 @@ async def get_roles(
     description="Issuing role information",
     response_description="Information about the role in the system",
     summary="Issuing role information",
+    dependencies=[require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])],
 )
-@require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])
 async def get_role(
     role_id: Any,
     role_service: BaseRoleService = Depends(),
-    auth_service: BaseAuthService = Depends(),
 ) -> RoleDTO | None:
     role: GenericResult[Role] = await role_service.get_role(role_id=role_id)
     if not role.is_success:
@@ -54,12 +68,11 @@ async def get_role(
     description="Creating a role in the system",
     response_description="New Role Details",
     summary="Creating a role in the system",
+    dependencies=[require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])],
 )
-@require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])
 async def create_role(
     role_data: RoleCreateDTO,
     role_service: BaseRoleService = Depends(),
-    auth_service: BaseAuthService = Depends(),
 ):
     result = await role_service.create_role(role=role_data)
     if not result.is_success:
@@ -73,13 +86,12 @@ async def create_role(
     description="Editing a role in the system",
     response_description="Edited role",
     summary="Editing a role",
+    dependencies=[require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])],
 )
-@require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])
 async def update_role(
     role_id: Any,
     role_data: RoleUpdateDTO,
     role_service: BaseRoleService = Depends(),
-    auth_service: BaseAuthService = Depends(),
 ):
     result = await role_service.update_role(role_id=role_id, role_dto=role_data)
     if not result.is_success:
@@ -93,11 +105,10 @@ async def update_role(
     response_model=RoleDTO,
     description="Removing a role from the system",
     summary="Removing a role from the system",
+    dependencies=[require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])],
 )
-@require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])
 async def delete_role(
     role_id: Any,
     role_service: BaseRoleService = Depends(),
-    auth_service: BaseAuthService = Depends(),
 ):
     return await role_service.delete_role(role_id=role_id)
\ No newline at end of file
@@ -1,16 +1,19 @@
+from datetime import datetime
 from typing import Annotated
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse
 
-from schemas.token import TokenValidation
+from schemas.token import TokenBatchValidation, TokenIntrospection, TokenValidation
 from infrastructure.models.user import User
 from logic.services.user_role import BaseUserRoleService
 from schemas.result import GenericResult, Result
-from logic.services.auth import BaseAuthService, require_roles
+from logic.services.auth import BaseAuthService, authenticate, require_roles
 from logic.services.user import BaseUserService
+from schemas.pagination import Page
 from schemas.role import Roles
 from schemas.user import UserBase, UserDTO, UserHistoryDTO, UserUpdateDTO
+from settings.config import settings
 
 
 router = APIRouter(
@@ -20,18 +23,31 @@ router = APIRouter(
 @router.get(
     "/",
     description="Retrieve information about all users in the system",
-    response_model=list[UserBase],
-    response_description="List of user accounts in the system",
+    response_model=Page[UserBase],
+    response_description="Page of user accounts in the system",
     tags=["Users"],
+    dependencies=[require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])],
 )
-@require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])
 async def get_users(
-    skip: Annotated[int, Query(description="Items to skip", ge=0)] = 0,
-    limit: Annotated[int, Query(description="Pagination page size", ge=1)] = 10,
+    cursor: Annotated[
+        str | None, Query(description="next_cursor of the previous page")
+    ] = None,
+    limit: Annotated[
+        int, Query(description="Pagination page size", ge=1, le=settings.max_page_size)
+    ] = 10,
+    with_total: Annotated[
+        bool, Query(description="Include an estimated total number of users")
+    ] = False,
     user_service: BaseUserService = Depends(),
-    auth_service: BaseAuthService = Depends(),
 ):
-    return await user_service.get_users(skip=skip, limit=limit)
+    result = await user_service.get_users(
+        cursor=cursor, limit=limit, with_total=with_total
+    )
+    if not result.is_success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=result.error_code.reason
+        )
+    return result.response
 
 @router.get(
     "/profile",
@@ -40,6 +56,7 @@ async def get_users(
     response_description="Details of the authenticated user",
     tags=["Users"],
     summary="Details of the user's account",
+    dependencies=[Depends(authenticate)],
 )
 async def get_user_profile(auth_service: BaseAuthService = Depends()) -> UserDTO:
     result = await auth_service.get_user()
@@ -49,44 +66,72 @@ async def get_user_profile(auth_service: BaseAuthService = Depends()) -> UserDTO
 @router.get(
     "/profile/history",
     description="Retrieve the user's login history",
-    response_model=list[UserHistoryDTO],
-    response_description="List of user logins",
+    response_model=Page[UserHistoryDTO],
+    response_description="Page of user logins, newest first",
     tags=["Users"],
     summary="Retrieve the user's login history",
+    dependencies=[Depends(authenticate)],
 )
 async def get_user_profile_history(
     user_service: BaseUserService = Depends(),
     auth_service: BaseAuthService = Depends(),
-    skip: Annotated[int, Query(description="Items to skip", ge=0)] = 0,
-    limit: Annotated[int, Query(description="Pagination page size", ge=1)] = 10,
+    cursor: Annotated[
+        str | None, Query(description="next_cursor of the previous page")
+    ] = None,
+    limit: Annotated[
+        int, Query(description="Pagination page size", ge=1, le=settings.max_page_size)
+    ] = 10,
+    since: Annotated[
+        datetime | None, Query(alias="from", description="Logins at or after this time")
+    ] = None,
+    until: Annotated[
+        datetime | None, Query(alias="to", description="Logins before this time")
+    ] = None,
 ):
     user = await auth_service.get_user()
     result = await user_service.get_user_history(
-        user_id=user.id, skip=skip, limit=limit
+        user_id=user.id, cursor=cursor, limit=limit, since=since, until=until
     )
-    return result
+    if not result.is_success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=result.error_code.reason
+        )
+    return result.response
 
 
 @router.get(
     "/{user_id}/history",
     description="Retrieve the login history of a user",
-    response_model=list[UserHistoryDTO],
-    response_description="List of user logins",
+    response_model=Page[UserHistoryDTO],
+    response_description="Page of user logins, newest first",
     tags=["Administrator"],
     summary="Retrieve the login history of a user",
+    dependencies=[require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])],
 )
-@require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])
 async def get_user_history(
     user_id: UUID,
-    skip: Annotated[int, Query(description="Items to skip", ge=0)] = 0,
-    limit: Annotated[int, Query(description="Pagination page size", ge=1)] = 10,
+    cursor: Annotated[
+        str | None, Query(description="next_cursor of the previous page")
+    ] = None,
+    limit: Annotated[
+        int, Query(description="Pagination page size", ge=1, le=settings.max_page_size)
+    ] = 10,
+    since: Annotated[
+        datetime | None, Query(alias="from", description="Logins at or after this time")
+    ] = None,
+    until: Annotated[
+        datetime | None, Query(alias="to", description="Logins before this time")
+    ] = None,
     user_service: BaseUserService = Depends(),
-    auth_service: BaseAuthService = Depends(),
 ):
     result = await user_service.get_user_history(
-        user_id=user_id, skip=skip, limit=limit
+        user_id=user_id, cursor=cursor, limit=limit, since=since, until=until
     )
-    return result
+    if not result.is_success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=result.error_code.reason
+        )
+    return result.response
 
 @router.get(
     "/{user_id}",
@@ -95,12 +140,11 @@ async def get_user_history(
     tags=["Administrator"],
     response_description="Details of the registered user",
     summary="Details of the user's account. Administrative functionality",
+    dependencies=[require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])],
 )
-@require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])
 async def get_user(
     user_id: UUID,
     user_service: BaseUserService = Depends(),
-    auth_service: BaseAuthService = Depends(),
 ) -> User:
     user: GenericResult[User] = await user_service.get_user(user_id=user_id)
     if not user.is_success:
@@ -115,6 +159,7 @@ async def get_user(
     tags=["Users"],
     response_description="Updated user account details",
     summary="Update user account details",
+    dependencies=[Depends(authenticate)],
 )
 async def update_user_profile(
     user_info: UserUpdateDTO,
@@ -137,13 +182,12 @@ async def update_user_profile(
     description="Assign a role to a user",
     tags=["Administrator"],
     summary="Assign an additional role to a user",
+    dependencies=[require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])],
 )
-@require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])
 async def assign_role_to_user(
     user_id: UUID,
     role_id: UUID,
     user_role_service: BaseUserRoleService = Depends(),
-    auth_service: BaseAuthService = Depends(),
 ):
     result: Result = await user_role_service.assign_role_to_user(
         user_id=user_id, role_id=role_id
@@ -160,13 +204,12 @@ async def assign_role_to_user(
     description="Revoke a role from a user",
     tags=["Administrator"],
     summary="Revoke a role from a user",
+    dependencies=[require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])],
 )
-@require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])
 async def remove_role_from_user(
     user_id: UUID,
     role_id: UUID,
     user_role_service: BaseUserRoleService = Depends(),
-    auth_service: BaseAuthService = Depends(),
 ):
     result: Result = await user_role_service.remove_role_from_user(
         user_id=user_id, role_id=role_id
@@ -194,11 +237,24 @@ async def get_user_data(
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="400")
 
+@router.post(
+    "/info/batch",
+    description="Validate many access tokens at once; results follow the input order",
+    response_model=list[TokenIntrospection],
+    summary="Batch token introspection",
+    tags=["Users"],
+)
+async def introspect_tokens(
+    token_data: TokenBatchValidation, auth_service: BaseAuthService = Depends()
+) -> list[TokenIntrospection]:
+    return await auth_service.introspect_tokens(token_data.access_tokens)
+
 @router.delete(
     "/profile",
     description="Delete the user's account",
     summary="Delete the user's account",
     tags=["Users"],
+    dependencies=[Depends(authenticate)],
 )
 async def delete_user_profile(
     user_service: BaseUserService = Depends(), auth_service: BaseAuthService = Depends()
@@ -214,12 +270,11 @@ async def delete_user_profile(
     description="Delete a user's account. Requires administrative privileges.",
     summary="Delete a user's account",
     tags=["Administrator"],
+    dependencies=[require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])],
 )
-@require_roles([Roles.ADMIN, Roles.SUPER_ADMIN])
 async def delete_user(
     user_id: UUID,
     user_service: BaseUserService = Depends(),
-    auth_service: BaseAuthService = Depends(),
 ):
     await user_service.delete_user(user_id=user_id)
     return JSONResponse(status_code=status.HTTP_200_OK, content={})
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""Postgres pool usage while unauthenticated and forbidden requests flood
+admin routes.
+
+Run against a started single-worker service (metrics are per worker):
+
+    python -m benchmarks.auth_pool_flood --url https://localhost:8000
+"""
+import argparse
+import asyncio
+from statistics import quantiles
+from time import perf_counter
+from uuid import uuid4
+
+from httpx import AsyncClient
+
+
+async def register_and_login(client: AsyncClient, login: str, password: str) -> str:
+    await client.post(
+        "/accounts/register", json={"login": login, "password": password}
+    )
+    response = await client.post(
+        "/accounts/login", json={"login": login, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def flood(
+    client: AsyncClient, headers: dict[str, str], requests: int
+) -> tuple[list[float], dict[int, int]]:
+    latencies, statuses = [], {}
+    for _ in range(requests):
+        started = perf_counter()
+        response = await client.get("/users/", headers=headers)
+        latencies.append((perf_counter() - started) * 1000)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    return latencies, statuses
+
+
+async def sample_pool(client: AsyncClient, stop: asyncio.Event) -> float:
+    peak = 0.0
+    while not stop.is_set():
+        metrics = (await client.get("/metrics/")).json()
+        peak = max(peak, metrics.get("db_pool_checked_out", 0))
+        await asyncio.sleep(0.01)
+    return peak
+
+
+async def main(url: str, concurrency: int, requests: int) -> None:
+    login, password = f"bench_{uuid4().hex[:8]}", "password"
+    async with AsyncClient(base_url=url, verify=False, timeout=60) as client:
+        token = await register_and_login(client, login, password)
+        before = (await client.get("/metrics/")).json().get("db_pool_checkouts", 0)
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_pool(client, stop))
+        # half the clients carry no token (401), half a non-admin one (403)
+        results = await asyncio.gather(*(
+            flood(
+                client,
+                {"Authorization": f"Bearer {token}"} if index % 2 else {},
+                requests,
+            )
+            for index in range(concurrency)
+        ))
+        stop.set()
+        peak = await sampler
+        after = (await client.get("/metrics/")).json().get("db_pool_checkouts", 0)
+    latencies = [latency for result, _ in results for latency in result]
+    statuses: dict[int, int] = {}
+    for _, result in results:
+        for code, count in result.items():
+            statuses[code] = statuses.get(code, 0) + count
+    percentiles = quantiles(latencies, n=100)
+    print(f"clients: {concurrency}, requests: {len(latencies)}, statuses: {statuses}")
+    print(f"p50: {percentiles[49]:.1f} ms, p99: {percentiles[98]:.1f} ms")
+    print(f"pool checkouts: {after - before}, peak checked out: {peak:.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="https://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.concurrency, args.requests))
@@ -0,0 +1,81 @@
+"""Encode/decode cost and document size of the cache codecs.
+
+    python -m benchmarks.cache_codecs
+    python -m benchmarks.cache_codecs --redis redis://localhost:6379
+"""
+import argparse
+import asyncio
+import json
+from timeit import timeit
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from infrastructure.models.snapshot import RoleSnapshot, UserSnapshot
+from logic.services.codecs import CODECS, CacheSerializer
+
+
+def sample_user() -> UserSnapshot:
+    return UserSnapshot(
+        id=uuid4(),
+        login="benchmark_user",
+        password="$2b$12$" + "x" * 53,
+        email="benchmark_user@example.com",
+        tg_id="123456789",
+        roles=tuple(
+            RoleSnapshot(id=uuid4(), name=name, description=f"{name} role")
+            for name in ("user", "admin", "moderator")
+        ),
+    )
+
+
+async def memory_usage(url: str, documents: dict[str, bytes]) -> dict[str, int]:
+    client = Redis.from_url(url)
+    usage = {}
+    try:
+        for name, document in documents.items():
+            key = f"benchmark_codec_{name}"
+            await client.set(key, document)
+            usage[name] = await client.memory_usage(key)
+            await client.delete(key)
+    finally:
+        await client.aclose()
+    return usage
+
+
+def main(number: int, redis_url: str | None) -> None:
+    data = sample_user().to_dict()
+    documents = {
+        "json": json.dumps(data, default=str).encode(),
+    }
+    timings = {
+        "json": (
+            timeit(lambda: json.dumps(data, default=str).encode(), number=number),
+            timeit(lambda: json.loads(documents["json"]), number=number),
+        ),
+    }
+    for name, codec in CODECS.items():
+        serializer = CacheSerializer(_codec=codec, _schema_version=1)
+        document = serializer.dumps(data)
+        documents[name] = document
+        timings[name] = (
+            timeit(lambda: serializer.dumps(data), number=number),
+            timeit(lambda: serializer.loads(document), number=number),
+        )
+    usage = asyncio.run(memory_usage(redis_url, documents)) if redis_url else {}
+
+    print(f"{'codec':<10}{'bytes':>8}{'encode us':>12}{'decode us':>12}{'redis':>8}")
+    for name, (encode, decode) in timings.items():
+        print(
+            f"{name:<10}{len(documents[name]):>8}"
+            f"{encode / number * 1e6:>12.2f}{decode / number * 1e6:>12.2f}"
+            f"{usage.get(name, '-'):>8}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--redis", dest="redis_url", default=None)
+    args = parser.parse_args()
+    main(args.number, args.redis_url)
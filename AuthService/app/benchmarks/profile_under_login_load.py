@@ -0,0 +1,70 @@
+"""p50/p99 of GET /users/profile while other clients hammer POST /accounts/login.
+
+Run against a started service:
+
+    python -m benchmarks.profile_under_login_load --url https://localhost:8000
+"""
+import argparse
+import asyncio
+from statistics import quantiles
+from time import perf_counter
+from uuid import uuid4
+
+from httpx import AsyncClient
+
+
+async def register_and_login(client: AsyncClient, login: str, password: str) -> str:
+    await client.post(
+        "/accounts/register", json={"login": login, "password": password}
+    )
+    response = await client.post(
+        "/accounts/login", json={"login": login, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def login_load(client: AsyncClient, login: str, password: str, stop: asyncio.Event):
+    while not stop.is_set():
+        await client.post(
+            "/accounts/login", json={"login": login, "password": password}
+        )
+
+
+async def profile_probe(
+    client: AsyncClient, token: str, requests: int
+) -> list[float]:
+    latencies = []
+    headers = {"Authorization": f"Bearer {token}"}
+    for _ in range(requests):
+        started = perf_counter()
+        response = await client.get("/users/profile", headers=headers)
+        latencies.append((perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return latencies
+
+
+async def main(url: str, concurrency: int, requests: int) -> None:
+    login, password = f"bench_{uuid4().hex[:8]}", "password"
+    async with AsyncClient(base_url=url, verify=False, timeout=60) as client:
+        token = await register_and_login(client, login, password)
+        stop = asyncio.Event()
+        load = [
+            asyncio.create_task(login_load(client, login, password, stop))
+            for _ in range(concurrency)
+        ]
+        latencies = await profile_probe(client, token, requests)
+        stop.set()
+        await asyncio.gather(*load)
+    percentiles = quantiles(latencies, n=100)
+    print(f"concurrent logins: {concurrency}, profile requests: {requests}")
+    print(f"p50: {percentiles[49]:.1f} ms, p99: {percentiles[98]:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="https://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.concurrency, args.requests))
@@ -0,0 +1,51 @@
+"""Backfills the compacted user-snapshot topic from the users table.
+
+Run once when the topic is introduced, or whenever consumers need it
+rebuilt; it is safe to repeat since compaction keeps the latest value:
+
+    python -m commands.backfill_user_snapshots
+"""
+import argparse
+import asyncio
+from time import perf_counter
+
+from infrastructure.kafka.sender import (
+    USER_SNAPSHOTS_TOPIC,
+    KafkaSender,
+    get_producer,
+    start_producer,
+    stop_producer,
+)
+from infrastructure.kafka.topics import ensure_compacted_topic
+from infrastructure.metrics.registry import metrics
+from logic.services.user_snapshots import UserSnapshotPublisher
+
+
+async def main(batch_size: int) -> None:
+    if await ensure_compacted_topic(USER_SNAPSHOTS_TOPIC):
+        print(f"created compacted topic {USER_SNAPSHOTS_TOPIC}")
+    await start_producer()
+    publisher = UserSnapshotPublisher(
+        _sender=KafkaSender(_producer=get_producer()), _batch_size=batch_size
+    )
+    started = perf_counter()
+    try:
+        published = await publisher.backfill()
+    finally:
+        # flushes whatever is still batched
+        await stop_producer()
+    elapsed = perf_counter() - started
+    counters = metrics.snapshot()
+    print(
+        f"published {published} users in {elapsed:.1f}s "
+        f"({published / max(elapsed, 1e-9):.0f}/s), "
+        f"delivered {counters.get('kafka_events_sent', 0)}, "
+        f"failed {counters.get('kafka_delivery_errors', 0)}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -1,7 +1,9 @@
 from typing import AsyncGenerator
+from sqlalchemy import event
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from infrastructure.metrics.registry import metrics
 from settings.config import settings
 # class Base(DeclarativeBase):
 #     ...
@@ -19,12 +21,23 @@ async_session = async_sessionmaker(
     expire_on_commit=False,
 )
 
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _count_checkout(*_) -> None:
+    metrics.inc("db_pool_checkouts")
+
+metrics.gauge("db_pool_checked_out", lambda: engine.pool.checkedout())
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    """Request session, lazy: a pooled connection is only borrowed by its first
+    statement, so requests rejected before touching Postgres never take one."""
     async with async_session() as session:
         try:
             yield session
         except Exception as e:
-            await session.rollback()
+            if session.in_transaction():
+                await session.rollback()
             raise e
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
@@ -1,6 +1,19 @@
 from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from settings.config import settings
 
 redis: Redis | None = None
 
 async def get_redis() -> Redis:
-    return redis
\ No newline at end of file
+    return redis
+
+async def configure_memory(client: Redis) -> None:
+    if settings.redis_maxmemory is None:
+        return
+    try:
+        await client.config_set("maxmemory", settings.redis_maxmemory)
+        await client.config_set("maxmemory-policy", settings.redis_maxmemory_policy)
+    except ResponseError:
+        # managed Redis deployments may forbid CONFIG SET
+        return
\ No newline at end of file
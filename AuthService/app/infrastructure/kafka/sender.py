@@ -1,27 +1,332 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass, field
+from enum import StrEnum
+from functools import partial
+from glob import glob
+import os
+from time import perf_counter, time_ns
+from typing import Any
+
+import msgpack
 
 from aiokafka import AIOKafkaProducer
+from aiokafka.errors import KafkaError
 
-from schemas.events import UserRegisteredEventDTO
+from infrastructure.metrics.registry import metrics
+from schemas.events import RoleEventDTO, UserEventDTO, UserRegisteredEventDTO
+from schemas.user import UserDTO
 from settings.config import settings
 
-producer = AIOKafkaProducer(
-    bootstrap_servers=settings.kafka_url,
-)
 
-def get_producer():
-    return KafkaSender(producer)
+USER_REGISTERED_TOPIC = 'user.registered'
+USER_EVENTS_TOPIC = 'user.events'
+ROLE_EVENTS_TOPIC = 'role.events'
+# compacted: the latest value per user id, a tombstone once deleted
+USER_SNAPSHOTS_TOPIC = 'user.snapshots'
+
+
+Message = tuple[str, bytes | None, bytes | None]
+
+def registered_message(event: UserRegisteredEventDTO) -> Message:
+    return USER_REGISTERED_TOPIC, event.model_dump_json().encode('utf-8'), None
+
+def user_event_message(event: UserEventDTO) -> Message:
+    # keyed by user so all events of one user stay ordered in a partition
+    return (
+        USER_EVENTS_TOPIC,
+        event.model_dump_json().encode('utf-8'),
+        str(event.user_id).encode('utf-8'),
+    )
+
+def role_event_message(event: RoleEventDTO) -> Message:
+    return (
+        ROLE_EVENTS_TOPIC,
+        event.model_dump_json().encode('utf-8'),
+        str(event.role_id).encode('utf-8'),
+    )
+
+
+def create_producer() -> AIOKafkaProducer:
+    return AIOKafkaProducer(
+        bootstrap_servers=settings.kafka_url,
+        linger_ms=settings.kafka_linger_ms,
+        max_batch_size=settings.kafka_max_batch_size,
+        compression_type=settings.kafka_compression_type,
+        acks="all" if settings.kafka_acks == "all" else int(settings.kafka_acks),
+    )
+
+
+producer: AIOKafkaProducer | None = None
+producer_ready = asyncio.Event()
+
+def get_producer() -> AIOKafkaProducer:
+    global producer
+    if producer is None:
+        producer = create_producer()
+    return producer
+
+async def start_producer(retry_delay: float = 1.0) -> None:
+    """Starts the worker's producer, retrying while the brokers are unreachable."""
+    while True:
+        try:
+            await get_producer().start()
+        except KafkaError:
+            metrics.inc("kafka_producer_start_errors")
+            await asyncio.sleep(retry_delay)
+        else:
+            producer_ready.set()
+            return
+
+async def stop_producer() -> None:
+    """Flushes whatever is still batched and closes the producer."""
+    global producer
+    producer_ready.clear()
+    if producer is not None:
+        await producer.stop()
+        producer = None
+
+
+def _delivered(started: float, delivery: asyncio.Future) -> None:
+    if delivery.cancelled() or delivery.exception() is not None:
+        metrics.inc("kafka_delivery_errors")
+        return
+    metrics.inc("kafka_events_sent")
+    metrics.observe("kafka_delivery_latency_ms", (perf_counter() - started) * 1000)
+
 
 @dataclass
 class BaseSender(ABC):
     @abstractmethod
-    async def send_on_register(self, event: UserRegisteredEventDTO) -> None:
+    async def send(
+        self, topic: str, value: bytes | None, key: bytes | None = None
+    ) -> None:
         ...
         
+    async def ready(self) -> None:
+        """Waits until ``send`` can actually deliver."""
+        
+    async def send_on_register(self, event: UserRegisteredEventDTO) -> None:
+        await self.send(*registered_message(event))
+        
+    async def send_user_event(self, event: UserEventDTO) -> None:
+        await self.send(*user_event_message(event))
+        
+    async def send_role_event(self, event: RoleEventDTO) -> None:
+        await self.send(*role_event_message(event))
+        
+    async def send_user_snapshot(self, user_id: Any, user: UserDTO | None) -> None:
+        """Publishes the current state of a user, or a tombstone for ``None``."""
+        await self.send(
+            USER_SNAPSHOTS_TOPIC,
+            user.model_dump_json().encode('utf-8') if user is not None else None,
+            str(user_id).encode('utf-8'),
+        )
+        
         
 @dataclass
 class KafkaSender(BaseSender):
     _producer: AIOKafkaProducer
-    async def send_on_register(self, event: UserRegisteredEventDTO) -> None:
-        self._producer.send('user.registered', value=event.model_dump_json().encode('utf-8'))
\ No newline at end of file
+    
+    async def ready(self) -> None:
+        await producer_ready.wait()
+    
+    async def send(
+        self, topic: str, value: bytes | None, key: bytes | None = None
+    ) -> None:
+        """Hands the message to the producer's batch; delivery is tracked
+        in the background instead of being awaited."""
+        if not producer_ready.is_set():
+            metrics.inc("kafka_events_dropped")
+            return
+        started = perf_counter()
+        delivery = await self._producer.send(topic, value=value, key=key)
+        delivery.add_done_callback(partial(_delivered, started))
+
+
+class OverflowPolicy(StrEnum):
+    # the request waits for room in the queue
+    BLOCK = "block"
+    # the oldest queued message is discarded
+    DROP_OLDEST = "drop_oldest"
+    # the message, and every one after it until the replay is done, is
+    # appended to a file; the file is replayed once the queue drains
+    SPILL = "spill"
+
+
+CLOSE = object()
+
+
+@dataclass
+class QueuedSender(BaseSender):
+    """Fire-and-forget front for another sender.
+
+    ``send`` only enqueues; ``run`` publishes in the background, so the
+    request never waits on the broker. What happens when the queue is full
+    is decided by ``_overflow``.
+    """
+    _sender: BaseSender
+    _max_size: int = settings.kafka_queue_size
+    _overflow: OverflowPolicy = OverflowPolicy(settings.kafka_overflow_policy)
+    _spill_dir: str = settings.kafka_spill_dir
+    _retry_delay: float = 1.0
+    _queue: asyncio.Queue = field(init=False)
+    _closing: bool = field(init=False, default=False)
+    _spilling: bool = field(init=False, default=False)
+    _spill_path: str | None = field(init=False, default=None)
+    _orphans: list[str] = field(init=False, default_factory=list)
+    
+    def __post_init__(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self._max_size)
+        if self._overflow == OverflowPolicy.SPILL:
+            # left over from an earlier run: replayed before anything new
+            self._orphans = self._spill_files("*")
+            self._spilling = bool(self._orphans)
+        
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+    
+    async def send(
+        self, topic: str, value: bytes | None, key: bytes | None = None
+    ) -> None:
+        message = (topic, value, key)
+        if self._overflow == OverflowPolicy.SPILL and (
+            self._spilling or self._queue.full()
+        ):
+            # keep spilling until the replay is done, or newer messages
+            # would overtake the spilled ones
+            self._spill([message])
+            return
+        if self._queue.full() and self._overflow == OverflowPolicy.DROP_OLDEST:
+            self._queue.get_nowait()
+            metrics.inc("kafka_events_dropped")
+        await self._queue.put(message)
+        metrics.inc("kafka_events_queued")
+        
+    def _spill_files(self, owner: Any) -> list[str]:
+        """Spill files of worker ``owner``, oldest first."""
+        return sorted(glob(os.path.join(self._spill_dir, f"*-{owner}.spill")))
+    
+    def _spill_file(self, sequence: int) -> str:
+        return os.path.join(self._spill_dir, f"{sequence:020d}-{os.getpid()}.spill")
+        
+    def _spill(self, messages: list[Message], older: bool = False) -> None:
+        """Appends ``messages`` to the current spill file, or, if ``older``,
+        to a new file replayed before every spill file of this worker."""
+        if not messages:
+            return
+        os.makedirs(self._spill_dir, exist_ok=True)
+        if older:
+            own = self._spill_files(os.getpid())
+            first = int(os.path.basename(own[0]).split("-")[0]) if own else time_ns()
+            path = self._spill_file(first - 1)
+        else:
+            if self._spill_path is None:
+                self._spill_path = self._spill_file(time_ns())
+            path = self._spill_path
+        with open(path, "ab") as file:
+            for message in messages:
+                file.write(msgpack.packb(message))
+        self._spilling = True
+        metrics.inc("kafka_events_spilled", len(messages))
+        
+    async def _replay_spilled(self) -> None:
+        while True:
+            if self._orphans:
+                path = self._orphans.pop(0)
+            else:
+                own = self._spill_files(os.getpid())
+                if not own:
+                    self._spilling = False
+                    return
+                path = own[0]
+            if path == self._spill_path:
+                # spills from now on start a file sorting after this one
+                self._spill_path = None
+            # the rename claims the file, other workers skip it
+            claimed = f"{path}.{os.getpid()}.replay"
+            try:
+                os.rename(path, claimed)
+            except FileNotFoundError:
+                continue
+            try:
+                with open(claimed, "rb") as file:
+                    for topic, value, key in msgpack.Unpacker(file, use_list=False):
+                        await self._publish(topic, value, key)
+            except BaseException:
+                # replayed again later, at the cost of duplicates
+                os.rename(claimed, path)
+                raise
+            os.remove(claimed)
+            
+    async def _publish(
+        self, topic: str, value: bytes | None, key: bytes | None
+    ) -> None:
+        try:
+            await self._sender.ready()
+            await self._sender.send(topic, value, key)
+        except KafkaError:
+            metrics.inc("kafka_delivery_errors")
+        # nothing may end run() for the worker's lifetime, or send() would
+        # fill the queue with nobody draining it
+        except Exception:
+            metrics.inc("kafka_events_dropped")
+            metrics.inc("kafka_send_errors")
+            
+    def _pending(self) -> list[Message]:
+        messages = []
+        while not self._queue.empty():
+            message = self._queue.get_nowait()
+            if message is not CLOSE:
+                messages.append(message)
+        return messages
+    
+    async def run(self) -> None:
+        message = CLOSE
+        try:
+            while True:
+                # while spilling nothing is queued, so the queue only
+                # holds messages older than the spilled ones
+                if self._spilling and self._queue.empty():
+                    try:
+                        await self._replay_spilled()
+                    except Exception:
+                        # the files stay in place and are replayed later
+                        metrics.inc("kafka_spill_replay_errors")
+                        await asyncio.sleep(self._retry_delay)
+                        continue
+                message = await self._queue.get()
+                if message is CLOSE:
+                    return
+                await self._publish(*message)
+                message = CLOSE
+                if self._closing and self._queue.empty():
+                    return
+        finally:
+            pending = self._pending()
+            if message is not CLOSE:
+                # cancelled while publishing it
+                pending.insert(0, message)
+            if self._overflow == OverflowPolicy.SPILL:
+                self._spill(pending, older=True)
+            elif pending:
+                metrics.inc("kafka_events_dropped", len(pending))
+                
+    def close(self) -> None:
+        """Lets ``run`` publish what is queued and return."""
+        self._closing = True
+        with suppress(asyncio.QueueFull):
+            self._queue.put_nowait(CLOSE)
+
+
+queued_sender: QueuedSender | None = None
+
+def get_queued_sender() -> QueuedSender:
+    global queued_sender
+    if queued_sender is None:
+        sender = QueuedSender(_sender=KafkaSender(_producer=get_producer()))
+        metrics.gauge("kafka_queue_depth", lambda: sender.queue_depth)
+        queued_sender = sender
+    return queued_sender
@@ -0,0 +1,28 @@
+from aiokafka.admin import AIOKafkaAdminClient, NewTopic
+from aiokafka.errors import TopicAlreadyExistsError
+
+from settings.config import settings
+
+
+async def ensure_compacted_topic(
+    name: str,
+    partitions: int = settings.user_snapshot_topic_partitions,
+    replication: int = settings.user_snapshot_topic_replication,
+) -> bool:
+    """Creates ``name`` with ``cleanup.policy=compact``; False if it already existed."""
+    admin = AIOKafkaAdminClient(bootstrap_servers=settings.kafka_url)
+    await admin.start()
+    try:
+        await admin.create_topics([
+            NewTopic(
+                name=name,
+                num_partitions=partitions,
+                replication_factor=replication,
+                topic_configs={"cleanup.policy": "compact"},
+            )
+        ])
+    except TopicAlreadyExistsError:
+        return False
+    finally:
+        await admin.close()
+    return True
@@ -0,0 +1,35 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass
+class MetricsRegistry:
+    _counters: dict[str, int] = field(default_factory=dict)
+    _gauges: dict[str, Callable[[], float]] = field(default_factory=dict)
+    _observations: dict[str, tuple[int, float, float]] = field(default_factory=dict)
+    
+    def inc(self, name: str, value: int = 1) -> None:
+        self._counters[name] = self._counters.get(name, 0) + value
+        
+    def counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+        
+    def gauge(self, name: str, callback: Callable[[], float]) -> None:
+        self._gauges[name] = callback
+        
+    def observe(self, name: str, value: float) -> None:
+        count, total, peak = self._observations.get(name, (0, 0.0, 0.0))
+        self._observations[name] = (count + 1, total + value, max(peak, value))
+        
+    def snapshot(self) -> dict[str, float]:
+        values: dict[str, float] = dict(self._counters)
+        for name, callback in self._gauges.items():
+            values[name] = callback()
+        for name, (count, total, peak) in self._observations.items():
+            values[f"{name}_count"] = count
+            values[f"{name}_sum"] = total
+            values[f"{name}_max"] = peak
+        return values
+
+
+metrics = MetricsRegistry()
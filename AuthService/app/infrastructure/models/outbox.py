@@ -0,0 +1,24 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Identity, LargeBinary, String
+
+from infrastructure.database.postgres import Base
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox"
+    
+    # monotonic id: the relay publishes in insertion order
+    id = Column(BigInteger, Identity(), primary_key=True)
+    topic = Column(String(255), nullable=False)
+    key = Column(LargeBinary, nullable=True)
+    payload = Column(LargeBinary, nullable=False)
+    created = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    
+    def __init__(self, topic, payload, key=None):
+        self.topic = topic
+        self.payload = payload
+        self.key = key
+        
+    def __repr__(self):
+        return f"<OutboxEvent {self.id} {self.topic}>"
@@ -0,0 +1,87 @@
+from dataclasses import dataclass, field
+from typing import Any, Self
+from uuid import UUID
+
+from infrastructure.models.role import Role
+from infrastructure.models.user import User
+
+
+@dataclass(frozen=True, slots=True)
+class RoleSnapshot:
+    """Immutable read model of a Role served from the cache."""
+    id: UUID
+    name: str
+    description: str | None = None
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.id, UUID):
+            object.__setattr__(self, "id", UUID(str(self.id)))
+
+    @classmethod
+    def from_model(cls, role: Role) -> Self:
+        return cls(id=role.id, name=role.name, description=role.description)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"id": self.id, "name": self.name, "description": self.description}
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """Immutable read model of a User served from the cache.
+
+    Cache hits never go through ``User.__init__``; write paths load the ORM
+    object through ``get_for_update`` instead of mutating a snapshot.
+    """
+    id: UUID
+    login: str
+    password: str = field(repr=False)
+    email: str | None = None
+    tg_id: str | None = None
+    roles: tuple[RoleSnapshot, ...] = ()
+    role_names: frozenset[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.id, UUID):
+            object.__setattr__(self, "id", UUID(str(self.id)))
+        roles = tuple(
+            role if isinstance(role, RoleSnapshot) else RoleSnapshot(**role)
+            for role in self.roles
+        )
+        object.__setattr__(self, "roles", roles)
+        object.__setattr__(self, "role_names", frozenset(role.name for role in roles))
+
+    @classmethod
+    def from_model(cls, user: User) -> Self:
+        return cls(
+            id=user.id,
+            login=user.login,
+            password=user.password,
+            email=user.email,
+            tg_id=user.tg_id,
+            roles=tuple(RoleSnapshot.from_model(role) for role in user.roles),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "login": self.login,
+            "password": self.password,
+            "email": self.email,
+            "tg_id": self.tg_id,
+            "roles": [role.to_dict() for role in self.roles],
+        }
+
+    def has_role(self, role_name: str) -> bool:
+        return role_name in self.role_names
+
+
+SNAPSHOTS: dict[type, type] = {
+    User: UserSnapshot,
+    Role: RoleSnapshot,
+}
+
+def to_snapshot(entity: Any) -> Any:
+    snapshot_class = SNAPSHOTS.get(type(entity))
+    if snapshot_class is None:
+        return entity
+    return snapshot_class.from_model(entity)
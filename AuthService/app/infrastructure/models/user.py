@@ -53,15 +53,19 @@ class User(Base):
     def __init__(
         self,
         login: str,
-        password: str, 
+        password: str | None = None,
         tg_id: str | None = None,
-        email: EmailStr | None = None
+        email: EmailStr | None = None,
+        password_hash: str | None = None,
     ) -> None:
         self.id = uuid4()
         self.login = login
-        self.password = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        if password_hash is None:
+            password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        self.password = password_hash
         self.email = email
         self.tg_id = tg_id
+        self.roles = []
         self.social_accounts = []
         
     def __repr__(self) -> str:
@@ -75,6 +79,9 @@ class User(Base):
             return False
         self.password = bcrypt.hashpw(new_password.encode(), bcrypt.gensalt()).decode()
     
+    def set_password_hash(self, password_hash: str) -> None:
+        self.password = password_hash
+    
     def update_personal(
         self,
         login: str | None = None,
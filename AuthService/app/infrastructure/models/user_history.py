@@ -7,6 +7,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     String,
     Text,
     UniqueConstraint)
@@ -26,6 +27,22 @@ class UserHistory(Base):
     user_device_type = Column(Text, primary_key=True, nullable=False)
     success = Column(Boolean, default=True, nullable=False)
     
+    __table_args__ = (
+        # per-user history, newest first; id breaks ties for keyset paging
+        Index(
+            "ix_user_history_user_id_attempted",
+            "user_id",
+            attempted.desc(),
+            id.desc(),
+        ),
+        # rows are appended in time order, so a BRIN covers time-range scans
+        Index(
+            "ix_user_history_attempted_brin",
+            "attempted",
+            postgresql_using="brin",
+        ),
+    )
+    
     # __table_args__ = (
     #     UniqueConstraint('id', 'user_device_type'),
     #     {'postgresql_partition_by': 'LIST (user_device_type)'}
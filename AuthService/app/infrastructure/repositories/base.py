@@ -17,14 +17,34 @@ class BaseRepository(ABC):
     def gets(self, *args, **kwargs):
         ...
         
+    @abstractmethod
+    def gets_after(self, *args, **kwargs):
+        ...
+        
+    @abstractmethod
+    def estimate_count(self, *args, **kwargs):
+        ...
+        
     @abstractmethod
     def get(self, *args, **kwargs):
         ...
         
+    @abstractmethod
+    def get_many(self, *args, **kwargs):
+        ...
+        
+    @abstractmethod
+    def get_for_update(self, *args, **kwargs):
+        ...
+        
     @abstractmethod
     def insert(self, *args, **kwargs):
         ...
         
     @abstractmethod
     def delete(self, *args, **kwargs):
+        ...
+        
+    @abstractmethod
+    def evict(self, *args, **kwargs):
         ...
\ No newline at end of file
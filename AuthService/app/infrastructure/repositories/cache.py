@@ -1,37 +1,135 @@
-from dataclasses import dataclass
-from typing import Any, Generic, List, Type
+from dataclasses import dataclass, replace
+from functools import partial
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Generic, List, Type
 
-from logic.services.cache import BaseCacheService
+from infrastructure.database.postgres import async_session
+from logic.services.cache import NOT_FOUND, BaseCacheService
+from logic.services.single_flight import SingleFlight
+from infrastructure.models.snapshot import to_snapshot
 from infrastructure.repositories.postgre import PostgresRepository
 from infrastructure.repositories.base import CreateSchemaType, ModelType
+from infrastructure.metrics.registry import metrics
+from settings.config import settings
 
 
-@dataclass 
+Loader = Callable[[Any], Awaitable[Any]]
+
+
+def cache_key(model_name: str, *parts: Any) -> str:
+    return "_".join([model_name, *map(str, parts)])
+
+
+@dataclass
 class PostgresCacheRepository(
     PostgresRepository[ModelType, CreateSchemaType],
     Generic[ModelType, CreateSchemaType],
 ):
-    
+
     _cache_service: BaseCacheService
-    
+    _single_flight: SingleFlight | None = None
+
+    def _key(self, *parts: Any) -> str:
+        return cache_key(self._model.__name__, *parts)
+
+    def _cache_keys(self, entity: Any) -> list[str]:
+        return [self._key(entity.id)]
+
+    async def _from_cache(
+        self, key: str, refresh: Callable[[], Awaitable[Any]] | None = None
+    ) -> Any | None:
+        if self._cache_service is None:
+            return None
+        return await self._cache_service.get(key=key, refresh=refresh)
+
+    async def _to_cache(
+        self, key: str, entity: Any | None, delta: float = 0.0
+    ) -> None:
+        if self._cache_service is None or entity is None:
+            return
+        await self._cache_service.set(
+            key=key, value=to_snapshot(entity), delta=delta
+        )
+
+    async def _missing_to_cache(self, key: str) -> None:
+        if self._cache_service is None or not settings.cache_negative_ttl_seconds:
+            return
+        await self._cache_service.set_missing(
+            key=key, ttl=settings.cache_negative_ttl_seconds
+        )
+
+    async def _load(self, key: str, loader: Loader, negative: bool) -> Any | None:
+        started = perf_counter()
+        entity = await loader(self)
+        if entity is None:
+            if negative:
+                await self._missing_to_cache(key)
+            return None
+        snapshot = to_snapshot(entity)
+        await self._to_cache(key, snapshot, delta=perf_counter() - started)
+        return snapshot
+
+    async def _refresh(self, key: str, loader: Loader) -> None:
+        # runs after the request is gone, so it cannot borrow its session
+        async with async_session() as session:
+            repository = replace(self, _session=session)
+            if await repository._load(key, loader, negative=False) is None:
+                await self._cache_service.delete(key=key)
+
+    async def _read_through(
+        self, key: str, loader: Loader, negative: bool = False
+    ) -> Any | None:
+        """Serve ``key`` from the cache, loading it with ``loader(self)`` on a miss."""
+        entity = await self._from_cache(key, partial(self._refresh, key, loader))
+        if entity is NOT_FOUND:
+            metrics.inc("cache_negative_hits")
+            return None
+        if entity:
+            return entity
+        if self._cache_service is None:
+            return await loader(self)
+        if self._single_flight is None:
+            return await self._load(key, loader, negative)
+        entity = await self._single_flight.do(
+            key,
+            partial(self._load, key, loader, negative),
+            partial(self._from_cache, key),
+        )
+        return None if entity is NOT_FOUND else entity
+
     async def gets(self, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
         return await super().gets(skip=skip, limit=limit)
-    
+
     async def get(self, *, id: Any) -> ModelType | None:
-        key = f"{self._model.__name__}_{id}"
-        entity = await self._cache_service.get(key=key)
-        if not entity:
-            entity = await super().get(id=id)
-        return entity
-    
+        return await self._read_through(
+            self._key(id),
+            lambda repository: super(PostgresCacheRepository, repository).get(id=id),
+        )
+
+    async def get_for_update(self, *, id: Any) -> ModelType | None:
+        return await super().get(id=id)
+
     async def insert(self, *, body: CreateSchemaType) -> ModelType:
         return await super().insert(body=body)
-    
+
     async def delete(self, *, id: Any) -> None:
         await super().delete(id=id)
-        
+        if self._cache_service is not None:
+            await self._cache_service.delete(key=self._key(id))
+
+    async def evict(self, *entities: Any) -> None:
+        if self._cache_service is None:
+            return
+        keys = [
+            key
+            for entity in entities
+            if entity is not None
+            for key in self._cache_keys(entity)
+        ]
+        await self._cache_service.delete_many(keys=keys)
+
     def __hash__(self):
         return hash((self._cache_service))
-        
+
     def __eq__(self, other):
-        return hash(self) == hash(other)
\ No newline at end of file
+        return hash(self) == hash(other)
@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, List
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.models.outbox import OutboxEvent
+
+
+@dataclass
+class BaseOutboxRepository(ABC):
+    @abstractmethod
+    async def add(self, *args, **kwargs):
+        ...
+        
+    @abstractmethod
+    async def claim(self, *args, **kwargs):
+        ...
+        
+    @abstractmethod
+    async def delete(self, *args, **kwargs):
+        ...
+
+
+@dataclass
+class PostgresOutboxRepository(BaseOutboxRepository):
+    _session: AsyncSession
+    
+    async def add(
+        self, *, topic: str, payload: bytes, key: bytes | None = None
+    ) -> OutboxEvent:
+        event = OutboxEvent(topic=topic, payload=payload, key=key)
+        self._session.add(event)
+        return event
+    
+    async def claim(self, *, limit: int) -> List[OutboxEvent]:
+        """Locks the oldest ``limit`` events no other relay is holding.
+
+        Keyed events are only claimed under a transaction-scoped advisory
+        lock on their key, so while one relay publishes a key's events no
+        other relay can publish later ones of the same key ahead of them.
+        """
+        key_free = func.pg_try_advisory_xact_lock(
+            func.hashtext(func.encode(OutboxEvent.key, "hex"))
+        )
+        statement = (
+            select(OutboxEvent)
+            .where(or_(OutboxEvent.key.is_(None), key_free))
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list((await self._session.scalars(statement)).all())
+    
+    async def delete(self, *, ids: List[Any]) -> None:
+        if ids:
+            await self._session.execute(
+                delete(OutboxEvent).where(OutboxEvent.id.in_(ids))
+            )
+            
+    def __hash__(self):
+        return hash((self._session))
+        
+    def __eq__(self, other):
+        return hash(self) == hash(other)
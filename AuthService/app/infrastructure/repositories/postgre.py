@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Any, Generic, List, Type
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import select, delete
+from sqlalchemy import delete, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from infrastructure.repositories.base import (
@@ -20,10 +20,37 @@ class PostgresRepository(BaseRepository, Generic[ModelType, CreateSchemaType]):
         statement = select(self._model).order_by().offset(skip).limit(limit)
         return (await self._session.execute(statement)).scalars().all()
     
+    async def gets_after(
+        self, *, after: Any | None = None, limit: int = 100
+    ) -> List[ModelType]:
+        """Keyset page: the first ``limit`` rows ordered by id past ``after``."""
+        statement = select(self._model).order_by(self._model.id).limit(limit)
+        if after is not None:
+            statement = statement.where(self._model.id > after)
+        return (await self._session.execute(statement)).scalars().all()
+    
+    async def estimate_count(self) -> int | None:
+        """Row count as last estimated by ANALYZE, instead of a count(*) scan."""
+        estimate = await self._session.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": self._model.__tablename__},
+        )
+        # -1 until the table has been analyzed
+        return estimate if estimate is not None and estimate >= 0 else None
+    
     async def get(self, *, id: Any) -> ModelType | None:
         statement = select(self._model).where(self._model.id == id)
         return (await self._session.execute(statement)).scalar_one_or_none()
     
+    async def get_many(self, *, ids: List[Any]) -> List[ModelType]:
+        if not ids:
+            return []
+        statement = select(self._model).where(self._model.id.in_(ids))
+        return (await self._session.execute(statement)).scalars().all()
+    
+    async def get_for_update(self, *, id: Any) -> ModelType | None:
+        return await self.get(id=id)
+    
     async def insert(self, *, body: CreateSchemaType) -> ModelType:
         raw_obj = jsonable_encoder(body)
         db_obj = self._model(**raw_obj)
@@ -33,6 +60,9 @@ class PostgresRepository(BaseRepository, Generic[ModelType, CreateSchemaType]):
     async def delete(self, *, id: Any) -> None:
         statement = delete(self._model).where(self._model.id == id)
         await self._session.execute(statement)
+    
+    async def evict(self, *entities: Any) -> None:
+        ...
         
     def __hash__(self):
         return hash((self._session, self._model))
@@ -1,11 +1,15 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Type
+from typing import Any, List, Type
 
 from sqlalchemy import select
 
 from logic.services.cache import BaseCacheService
-from infrastructure.repositories.cache import PostgresCacheRepository
+from logic.services.role_catalog import RoleCatalog, RoleCatalogSnapshot
+from logic.services.single_flight import SingleFlight
+from infrastructure.models.user import User
+from infrastructure.models.user_role import UserRole
+from infrastructure.repositories.cache import PostgresCacheRepository, cache_key
 from infrastructure.repositories.postgre import PostgresRepository
 from schemas.role import RoleCreateDTO
 from infrastructure.models.role import Role
@@ -38,18 +42,82 @@ class PostgresCacheRoleRepository(
     PostgresCacheRepository[Role, RoleCreateDTO], PostgresRoleRepository
 ):  
     _cache_service: BaseCacheService | None = None
+    _single_flight: SingleFlight | None = None
+    _catalog: RoleCatalog | None = None
     _model: Type[ModelType] = Role
     
+    def _cache_keys(self, entity: Role) -> list[str]:
+        return [self._key(entity.id), self._key("name", entity.name)]
+    
+    async def _load_catalog(self) -> List[Role]:
+        return (await self._session.execute(select(Role))).scalars().all()
+    
+    async def _current_catalog(self) -> RoleCatalogSnapshot:
+        return await self._catalog.current(self._load_catalog)
+    
+    async def gets(self, *, skip: int = 0, limit: int = 100) -> List[Role]:
+        if self._catalog is None:
+            return await super().gets(skip=skip, limit=limit)
+        return (await self._current_catalog()).roles()[skip:skip + limit]
+    
+    async def gets_after(
+        self, *, after: Any | None = None, limit: int = 100
+    ) -> List[Role]:
+        if self._catalog is None:
+            return await super().gets_after(after=after, limit=limit)
+        roles = sorted(
+            (await self._current_catalog()).by_id.values(), key=lambda role: role.id
+        )
+        return [role for role in roles if after is None or role.id > after][:limit]
+    
+    async def estimate_count(self) -> int | None:
+        if self._catalog is None:
+            return await super().estimate_count()
+        return len((await self._current_catalog()).by_id)
+    
+    async def get(self, *, id: Any) -> Role | None:
+        if self._catalog is None:
+            return await super().get(id=id)
+        return (await self._current_catalog()).get(id)
+    
     async def get_role_by_name(self, *, name: str) -> Role | None:
-        key = f"{self._model.__name__}_{name}"
-        if self._cache_service is not None:
-            entity = await self._cache_service.get(key=key)
-        if not entity:
-            entity = await super().get_role_by_name(name=name)
-        return entity
+        if self._catalog is not None:
+            return (await self._current_catalog()).by_name.get(name)
+        return await self._read_through(
+            self._key("name", name),
+            lambda repository: super(
+                PostgresCacheRoleRepository, repository
+            ).get_role_by_name(name=name),
+        )
+    
+    async def evict(self, *entities: Role) -> None:
+        if self._catalog is not None:
+            await self._catalog.bump()
+        if self._cache_service is None:
+            return
+        await super().evict(*entities)
+        role_ids = [entity.id for entity in entities if entity is not None]
+        if not role_ids:
+            return
+        statement = (
+            select(User.id, User.login)
+            .join(UserRole, UserRole.user_id == User.id)
+            .where(UserRole.role_id.in_(role_ids))
+        )
+        members = (await self._session.execute(statement)).all()
+        await self._cache_service.delete_many(
+            keys=[
+                key
+                for user_id, login in members
+                for key in (
+                    cache_key(User.__name__, user_id),
+                    cache_key(User.__name__, "login", login),
+                )
+            ]
+        )
     
     def __hash__(self):
-        return hash((self._model, self._cache_service))
+        return hash((self._model, self._cache_service, self._catalog))
         
     def __eq__(self, other):
         return hash(self) == hash(other)
\ No newline at end of file
@@ -1,19 +1,25 @@
 from abc import abstractmethod
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Any, List, Type
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, delete, select, tuple_
 from sqlalchemy.orm import noload, selectinload
 
-from logic.services.cache import BaseCacheService
+from infrastructure.metrics.registry import metrics
+from logic.services.cache import NOT_FOUND, BaseCacheService
+from logic.services.single_flight import SingleFlight
 from schemas.social import SocialCreateDTO
 from schemas.result import Error, GenericResult, ModelType
 from schemas.user import UserCreateDTO, UserHistoryCreateDTO
+from infrastructure.models.role import Role
+from infrastructure.models.snapshot import RoleSnapshot, UserSnapshot
 from infrastructure.models.social_account import SocialAccount, SocialNetworks
 from infrastructure.models.user_history import UserHistory
 from infrastructure.models.user import User
+from infrastructure.models.user_role import UserRole
 from infrastructure.repositories.base import BaseRepository
-from infrastructure.repositories.cache import PostgresCacheRepository
+from infrastructure.repositories.cache import PostgresCacheRepository, cache_key
 from infrastructure.repositories.postgre import PostgresRepository
 
 
@@ -23,9 +29,19 @@ class BaseUserRepository(BaseRepository):
     async def get_by_login(self, *, login: str) -> User:
         ...
         
+    @abstractmethod
+    async def get_for_login(self, *, login: str) -> UserSnapshot | None:
+        ...
+        
     @abstractmethod
     async def get_user_history(
-        self, *, user_id: Any, skip: int = 0, limit: int
+        self,
+        *,
+        user_id: Any,
+        after: tuple[datetime, Any] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int,
     ) -> List[UserHistory]:
         ...
         
@@ -41,21 +57,75 @@ class BaseUserRepository(BaseRepository):
     ) -> GenericResult[UserHistory]:
         ...
         
+    @abstractmethod
+    async def add_login(self, *, data: UserHistoryCreateDTO) -> UserHistory:
+        ...
+        
     @abstractmethod
     async def insert_user_social(
         self, *, user_id: Any, data: SocialCreateDTO
     ) -> GenericResult[SocialAccount]:
         ...
         
+    @abstractmethod
+    async def add_role(self, *, user: User, role_id: Any) -> None:
+        ...
+        
+    @abstractmethod
+    async def remove_role(self, *, user: User, role_id: Any) -> None:
+        ...
+        
 
 @dataclass
 class PostgresUserRepository(PostgresRepository[User, UserCreateDTO], BaseUserRepository):
     _model: Type[ModelType] = User
     
     async def get_by_login(self, *, login: str) -> User:
-        statement = select(self._model).where(self._model.login == login)
+        statement = (
+            select(self._model)
+            .options(selectinload(self._model.roles))
+            .where(self._model.login == login)
+        )
         return (await self._session.execute(statement)).scalar_one_or_none() 
     
+    async def get_for_login(self, *, login: str) -> UserSnapshot | None:
+        """The user and its roles in one query, one row per role."""
+        statement = (
+            select(
+                self._model.id,
+                self._model.login,
+                self._model.password,
+                self._model.email,
+                self._model.tg_id,
+                Role.id.label("role_id"),
+                Role.name.label("role_name"),
+                Role.description.label("role_description"),
+            )
+            .outerjoin(UserRole, UserRole.user_id == self._model.id)
+            .outerjoin(Role, Role.id == UserRole.role_id)
+            .where(self._model.login == login)
+        )
+        rows = (await self._session.execute(statement)).all()
+        if not rows:
+            return None
+        user = rows[0]
+        return UserSnapshot(
+            id=user.id,
+            login=user.login,
+            password=user.password,
+            email=user.email,
+            tg_id=user.tg_id,
+            roles=tuple(
+                RoleSnapshot(
+                    id=row.role_id,
+                    name=row.role_name,
+                    description=row.role_description,
+                )
+                for row in rows
+                if row.role_id is not None
+            ),
+        )
+    
     async def get(self, *, id: Any) -> ModelType | None:
         statement = (
             select(self._model)
@@ -65,16 +135,55 @@ class PostgresUserRepository(PostgresRepository[User, UserCreateDTO], BaseUserRe
         )
         return (await self._session.execute(statement)).scalar_one_or_none()
     
-    async def get_user_history(
-        self, *, user_id: Any, skip: int = 0, limit: int = 100
-    ) -> List[UserHistory]:
+    async def get_many(self, *, ids: List[Any]) -> List[User]:
+        if not ids:
+            return []
+        statement = (
+            select(self._model)
+            .options(noload(self._model.history))
+            .options(selectinload(self._model.roles))
+            .where(self._model.id.in_(ids))
+        )
+        return (await self._session.execute(statement)).scalars().all()
+    
+    def _history_statement(
+        self,
+        *,
+        user_id: Any,
+        after: tuple[datetime, Any] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 100,
+    ):
         statement = (
             select(UserHistory)
             .where(UserHistory.user_id == user_id)
-            .order_by()
-            .offset(skip)
+            .order_by(UserHistory.attempted.desc(), UserHistory.id.desc())
             .limit(limit)
         )
+        if since is not None:
+            statement = statement.where(UserHistory.attempted >= since)
+        if until is not None:
+            statement = statement.where(UserHistory.attempted < until)
+        if after is not None:
+            statement = statement.where(
+                tuple_(UserHistory.attempted, UserHistory.id) < tuple_(*after)
+            )
+        return statement
+    
+    async def get_user_history(
+        self,
+        *,
+        user_id: Any,
+        after: tuple[datetime, Any] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 100,
+    ) -> List[UserHistory]:
+        """Newest first, ``after`` being the (attempted, id) of the last row seen."""
+        statement = self._history_statement(
+            user_id=user_id, after=after, since=since, until=until, limit=limit
+        )
         return (await self._session.execute(statement)).scalars().all()
     
     async def get_user_social(
@@ -94,7 +203,7 @@ class PostgresUserRepository(PostgresRepository[User, UserCreateDTO], BaseUserRe
     async def insert_user_login(
         self, *, user_id: Any, data: UserHistoryCreateDTO
     ) -> GenericResult[UserHistory]:
-        user: User = await self.get(id=user_id)
+        user: User = await self.get_for_update(id=user_id)
         if not user:
             return GenericResult.failure(
                 error=Error(error_code="USER_NOT_FOUND", reason="User not found"),
@@ -103,10 +212,15 @@ class PostgresUserRepository(PostgresRepository[User, UserCreateDTO], BaseUserRe
         user.add_user_session(user_history)
         return GenericResult.success(user_history)
     
+    async def add_login(self, *, data: UserHistoryCreateDTO) -> UserHistory:
+        user_history = UserHistory(**data.model_dump())
+        self._session.add(user_history)
+        return user_history
+    
     async def insert_user_social(
         self, *, user_id: Any, data: SocialCreateDTO
     ) -> GenericResult[SocialAccount]:
-        user: User = await self.get(id=user_id)
+        user: User = await self.get_for_update(id=user_id)
         if not user:
             return GenericResult.failure(
                 error=Error(error_code="USER_NOT_FOUND", reason="User not found"),
@@ -115,6 +229,19 @@ class PostgresUserRepository(PostgresRepository[User, UserCreateDTO], BaseUserRe
         user.add_social_account(social)
         return GenericResult.success(social)
     
+    async def add_role(self, *, user: User, role_id: Any) -> None:
+        self._session.add(UserRole(user_id=user.id, role_id=role_id))
+        await self._session.flush()
+        self._session.expire(user, ["roles"])
+    
+    async def remove_role(self, *, user: User, role_id: Any) -> None:
+        await self._session.execute(
+            delete(UserRole).where(
+                and_(UserRole.user_id == user.id, UserRole.role_id == role_id)
+            )
+        )
+        self._session.expire(user, ["roles"])
+    
     def __hash__(self):
         return hash((self._model))
         
@@ -126,29 +253,67 @@ class PostgresCacheUserRepository(
     PostgresCacheRepository[User, UserCreateDTO], PostgresUserRepository
 ):
     _cache_service: BaseCacheService | None = None
+    _single_flight: SingleFlight | None = None
     _model: Type[ModelType] = User
     
+    def _social_key(self, social_id: str, social_name: SocialNetworks) -> str:
+        return cache_key(SocialAccount.__name__, social_name.value, social_id)
+    
+    def _cache_keys(self, entity: User) -> list[str]:
+        return [
+            self._key(entity.id),
+            self._key("login", entity.login),
+            *(
+                self._social_key(account.social_id, account.social_name)
+                for account in getattr(entity, "social_accounts", ())
+            ),
+        ]
+    
     async def get_by_login(self, *, login: str) -> User:
-        key = f"{self._model.__name__}_{login}"
-        if self._cache_service is not None:
-            entity = await self._cache_service.get(key=key)
-        if not entity:
-            entity = await super().get_by_login(login=login)
-        return entity
+        return await self._read_through(
+            self._key("login", login),
+            lambda repository: super(
+                PostgresCacheUserRepository, repository
+            ).get_by_login(login=login),
+            negative=True,
+        )
+    
+    async def get_for_login(self, *, login: str) -> UserSnapshot | None:
+        # shares the entry of get_by_login, both hold a UserSnapshot
+        return await self._read_through(
+            self._key("login", login),
+            lambda repository: super(
+                PostgresCacheUserRepository, repository
+            ).get_for_login(login=login),
+            negative=True,
+        )
     
     async def get_user_history(
-        self, *, user_id: Any, skip: int = 0, limit: int = 100
+        self,
+        *,
+        user_id: Any,
+        after: tuple[datetime, Any] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 100,
     ) -> List[UserHistory]:
         return await super().get_user_history(
-            user_id=user_id, skip=skip, limit=limit
+            user_id=user_id, after=after, since=since, until=until, limit=limit
         )
     
     async def get_user_social(
         self, *, social_id: str, social_name: SocialNetworks
     ) -> SocialAccount | None:
-        return await super().get_user_social(
+        key = self._social_key(social_id, social_name)
+        if await self._from_cache(key) is NOT_FOUND:
+            metrics.inc("cache_negative_hits")
+            return None
+        social = await super().get_user_social(
             social_id=social_id, social_name=social_name
         )
+        if social is None:
+            await self._missing_to_cache(key)
+        return social
         
     async def insert_user_login(
         self, *, user_id: Any, data: UserHistoryCreateDTO
@@ -160,9 +325,14 @@ class PostgresCacheUserRepository(
     async def insert_user_social(
         self, *, user_id: Any, data: SocialCreateDTO
     ) -> GenericResult[SocialAccount]:
-        return await super().insert_user_social(
+        result = await super().insert_user_social(
             user_id=user_id, data=data
         )
+        if result.is_success and self._cache_service is not None:
+            await self._cache_service.delete(
+                key=self._social_key(data.social_id, data.social_name)
+            )
+        return result
         
     def __hash__(self):
         return hash((self._model, self._cache_service))
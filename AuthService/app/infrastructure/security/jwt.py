@@ -0,0 +1,57 @@
+from typing import Dict, Optional, Union
+
+import jwt
+from async_fastapi_jwt_auth import AuthJWT
+from async_fastapi_jwt_auth.exceptions import InvalidHeaderError, JWTDecodeError
+
+from infrastructure.security.key_ring import get_key_ring
+
+
+class KeyRingAuthJWT(AuthJWT):
+    """AuthJWT that signs with the active key of the key ring and verifies by kid.
+
+    Falls back to the configured ``authjwt_secret_key`` when no keys are set up.
+    """
+
+    async def _create_token(self, subject, type_token, exp_time, fresh=False,
+                            algorithm=None, headers=None, issuer=None,
+                            audience=None, user_claims={}) -> str:
+        key = get_key_ring().active
+        if key is not None:
+            algorithm = key.algorithm
+            headers = {**(headers or {}), "kid": key.kid}
+        return await super()._create_token(
+            subject, type_token, exp_time, fresh, algorithm,
+            headers, issuer, audience, user_claims,
+        )
+
+    async def _get_secret_key(self, algorithm: str, process: str):
+        key = get_key_ring().active
+        if process == "encode" and key is not None:
+            return key.private_key
+        return await super()._get_secret_key(algorithm, process)
+
+    async def _verified_token(
+        self, encoded_token: str, issuer: Optional[str] = None
+    ) -> Dict[str, Union[str, int, bool]]:
+        key_ring = get_key_ring()
+        if not key_ring:
+            return await super()._verified_token(encoded_token, issuer)
+        try:
+            headers = await self.get_unverified_jwt_headers(encoded_token)
+        except Exception as err:
+            raise InvalidHeaderError(status_code=422, message=str(err))
+        key = key_ring.get(headers.get("kid"))
+        if key is None:
+            raise JWTDecodeError(status_code=422, message="Unknown signing key")
+        try:
+            return jwt.decode(
+                encoded_token,
+                key.public_key,
+                issuer=issuer,
+                audience=self._decode_audience,
+                leeway=self._decode_leeway,
+                algorithms=[key.algorithm],
+            )
+        except Exception as err:
+            raise JWTDecodeError(status_code=422, message=str(err))
@@ -0,0 +1,110 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Self
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm, RSAAlgorithm
+
+from settings.config import settings
+
+
+ALGORITHMS: dict[type, tuple[str, Any]] = {
+    rsa.RSAPublicKey: ("RS256", RSAAlgorithm),
+    ed25519.Ed25519PublicKey: ("EdDSA", OKPAlgorithm),
+    ec.EllipticCurvePublicKey: ("ES256", ECAlgorithm),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    public_key: Any
+    private_key: Any | None = field(default=None, repr=False)
+
+    @classmethod
+    def from_pem(cls, kid: str, pem: bytes) -> Self:
+        try:
+            private_key = load_pem_private_key(pem, password=None)
+        except ValueError:
+            private_key = None
+        public_key = (
+            private_key.public_key() if private_key else load_pem_public_key(pem)
+        )
+        for key_type, (algorithm, _) in ALGORITHMS.items():
+            if isinstance(public_key, key_type):
+                return cls(
+                    kid=kid,
+                    algorithm=algorithm,
+                    public_key=public_key,
+                    private_key=private_key,
+                )
+        raise ValueError(f"Unsupported signing key type for {kid}")
+
+    def to_jwk(self) -> dict[str, Any]:
+        jwk_algorithm = next(
+            jwk_algorithm
+            for key_type, (_, jwk_algorithm) in ALGORITHMS.items()
+            if isinstance(self.public_key, key_type)
+        )
+        return {
+            **jwk_algorithm.to_jwk(self.public_key, as_dict=True),
+            "kid": self.kid,
+            "alg": self.algorithm,
+            "use": "sig",
+        }
+
+
+@dataclass
+class KeyRing:
+    """Keys tokens may be verified with; the active one also signs.
+
+    Rotation: add the new key, make it active once consumers have fetched
+    the JWKS, and drop the old one after its tokens have expired.
+    """
+    _keys: dict[str, SigningKey] = field(default_factory=dict)
+    _active_kid: str | None = None
+
+    @classmethod
+    def load(cls, directory: str, active_kid: str | None = None) -> Self:
+        """Reads ``<kid>.pem`` files; a public key alone only verifies."""
+        keys = {}
+        for path in sorted(Path(directory).glob("*.pem")):
+            kid = path.name.removesuffix(".pem").removesuffix(".pub")
+            keys[kid] = SigningKey.from_pem(kid, path.read_bytes())
+        signing = [kid for kid, key in keys.items() if key.private_key is not None]
+        if active_kid is None and signing:
+            active_kid = signing[-1]
+        if active_kid is not None and active_kid not in signing:
+            raise ValueError(f"No private key for active kid {active_kid}")
+        return cls(_keys=keys, _active_kid=active_kid)
+
+    @property
+    def active(self) -> SigningKey | None:
+        return self._keys.get(self._active_kid) if self._active_kid else None
+
+    def get(self, kid: str | None) -> SigningKey | None:
+        return self._keys.get(kid) if kid else None
+
+    def jwks(self) -> dict[str, list[dict[str, Any]]]:
+        return {"keys": [key.to_jwk() for key in self._keys.values()]}
+
+    def __bool__(self) -> bool:
+        return bool(self._keys)
+
+
+key_ring: KeyRing | None = None
+
+def get_key_ring() -> KeyRing:
+    global key_ring
+    if key_ring is None:
+        key_ring = (
+            KeyRing.load(settings.jwt_keys_dir, settings.jwt_active_kid)
+            if settings.jwt_keys_dir
+            else KeyRing()
+        )
+    return key_ring
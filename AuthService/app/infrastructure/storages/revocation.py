@@ -0,0 +1,113 @@
+import asyncio
+from dataclasses import dataclass, field
+from time import monotonic, time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from infrastructure.metrics.registry import metrics
+from settings.config import settings
+
+
+@dataclass
+class RevocationFilter:
+    """Per-worker copy of the revoked jtis, tailed from a Redis stream.
+
+    Every revocation is appended to the stream, which is trimmed to the
+    lifetime of the longest-lived token. The filter is only trusted while
+    its last successful read is at most ``_max_staleness`` seconds old;
+    otherwise callers must ask Redis.
+    """
+    _client: Redis
+    _stream: str = settings.revocation_stream
+    _max_staleness: float = settings.revocation_max_staleness_seconds
+    _batch_size: int = 1000
+    _revoked: dict[str, float] = field(default_factory=dict)
+    _last_id: bytes | str = "0"
+    _synced_at: float | None = None
+    _next_prune: float = 0.0
+    
+    @property
+    def is_fresh(self) -> bool:
+        return (
+            self._synced_at is not None
+            and monotonic() - self._synced_at <= self._max_staleness
+        )
+    
+    def add(self, jti: str, expires: float) -> None:
+        if expires > time():
+            self._revoked[jti] = expires
+    
+    def __contains__(self, jti: str) -> bool:
+        expires = self._revoked.get(jti)
+        return expires is not None and expires > time()
+    
+    def __len__(self) -> int:
+        return len(self._revoked)
+    
+    def _prune(self) -> None:
+        now = time()
+        if now < self._next_prune:
+            return
+        self._revoked = {
+            jti: expires for jti, expires in self._revoked.items() if expires > now
+        }
+        self._next_prune = now + 60
+    
+    async def publish(self, revoked: dict[str, int], pipeline=None) -> None:
+        """Appends ``{jti: ttl}`` to the stream, on ``pipeline`` if given."""
+        client = pipeline if pipeline is not None else self._client
+        now = time()
+        oldest = int((now - settings.refresh_expiratioin_seconds) * 1000)
+        for jti, ttl in revoked.items():
+            await client.xadd(
+                self._stream,
+                {"jti": jti, "expires": now + ttl},
+                minid=max(oldest, 0),
+                approximate=True,
+            )
+            self.add(jti, now + ttl)
+    
+    async def poll(self, block: int | None = None) -> None:
+        """Reads the stream up to its end; only then is the filter fresh."""
+        while True:
+            response = await self._client.xread(
+                {self._stream: self._last_id}, block=block, count=self._batch_size
+            )
+            read = 0
+            for _, entries in response or ():
+                for entry_id, fields in entries:
+                    self._last_id = entry_id
+                    self.add(fields[b"jti"].decode(), float(fields[b"expires"]))
+                    read += 1
+            if read < self._batch_size:
+                break
+            # a full batch: more is waiting, read it without blocking
+            block = None
+        self._synced_at = monotonic()
+        self._prune()
+    
+    async def run(self, retry_delay: float = 1.0) -> None:
+        block = max(int(self._max_staleness * 1000 / 2), 1)
+        while True:
+            try:
+                await self.poll(block=block)
+            except (ConnectionError, RedisError):
+                metrics.inc("revocation_filter_errors")
+                await asyncio.sleep(retry_delay)
+    
+    def __hash__(self):
+        return hash((self._client, self._stream))
+    
+    def __eq__(self, other):
+        return hash(self) == hash(other)
+
+
+revocation_filter: RevocationFilter | None = None
+
+def get_revocation_filter(redis: Redis) -> RevocationFilter:
+    global revocation_filter
+    if revocation_filter is None:
+        revocation_filter = instance = RevocationFilter(_client=redis)
+        metrics.gauge("revoked_tokens", lambda: len(instance))
+    return revocation_filter
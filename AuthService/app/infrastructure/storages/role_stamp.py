@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from time import time
+from typing import Any
+
+from redis.asyncio import Redis
+
+from settings.config import settings
+
+
+@dataclass
+class RoleStampStorage(ABC):
+    @abstractmethod
+    async def touch_user(self, *args, **kwargs):
+        ...
+        
+    @abstractmethod
+    async def touch_catalog(self, *args, **kwargs):
+        ...
+        
+    @abstractmethod
+    async def changed_since(self, *args, **kwargs):
+        ...
+        
+
+@dataclass
+class RedisRoleStampStorage(RoleStampStorage):
+    """Remembers when role assignments last changed.
+
+    Access tokens issued before the stamp carry stale role claims. A stamp
+    only has to outlive the tokens it invalidates, so it expires with them.
+    """
+    _client: Redis
+    _catalog_key: str = "roles_changed"
+    
+    def _user_key(self, user_id: Any) -> str:
+        return f"roles_changed_{user_id}"
+    
+    async def touch_user(self, *, user_id: Any) -> None:
+        await self._client.set(
+            self._user_key(user_id), time(), ex=settings.authjwt_access_token_expires
+        )
+        
+    async def touch_catalog(self) -> None:
+        await self._client.set(
+            self._catalog_key, time(), ex=settings.authjwt_access_token_expires
+        )
+    
+    async def changed_since(self, *, user_id: Any, issued_at: int) -> bool:
+        stamps = await self._client.mget(self._user_key(user_id), self._catalog_key)
+        return any(
+            stamp is not None and float(stamp) >= issued_at for stamp in stamps
+        )
+    
+    def __hash__(self):
+        return hash((self._client, self._catalog_key))
+    
+    def __eq__(self, other):
+        return hash(self) == hash(other)
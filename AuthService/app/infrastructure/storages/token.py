@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from redis.asyncio import Redis
 from redis.asyncio.client import Pipeline
 
+from infrastructure.metrics.registry import metrics
+from infrastructure.storages.revocation import RevocationFilter
 from schemas.token import TokenJTI
 from settings.config import settings
 
@@ -22,33 +24,49 @@ class TokenStorage(ABC):
     async def check_expiration(self, *args, **kwargs):
         ...
         
+    @abstractmethod
+    async def get_revoked(self, *args, **kwargs):
+        ...
+        
         
         
 @dataclass
 class RedisTokenStorage(TokenStorage):
     _client: Redis
+    _filter: RevocationFilter | None = None
     
     async def store_token(self, *, token: TokenJTI) -> None:
+        revoked = {
+            jti: ttl
+            for jti, ttl in (
+                (token.access_token_jti, settings.access_expiratioin_seconds),
+                (token.refresh_token_jti, settings.refresh_expiratioin_seconds),
+            )
+            if jti
+        }
         async def _store_token(pipeline: Pipeline):
-            if token.access_token_jti:
-                await pipeline.setex(
-                    name=token.access_token_jti,
-                    time=settings.access_expiratioin_seconds,
-                    value=str(True)
-                )
-            if token.refresh_token_jti:
-                await pipeline.setex(
-                    name=token.refresh_token_jti,
-                    time=settings.refresh_expiratioin_seconds,
-                    value=str(True)
-                )
+            for jti, ttl in revoked.items():
+                await pipeline.setex(name=jti, time=ttl, value=str(True))
+            if self._filter is not None:
+                await self._filter.publish(revoked, pipeline=pipeline)
         await self._client.transaction(_store_token)
         
     async def get_token(self, *, key: str) -> bool:
         return await self._client.get(key)
     
     async def check_expiration(self, *, jti: str) -> bool:
-        return await self.get_token(key=jti) == True
+        if self._filter is not None and self._filter.is_fresh:
+            metrics.inc("revocation_filter_checks")
+            return jti in self._filter
+        return await self.get_token(key=jti) is not None
+    
+    async def get_revoked(self, *, jtis: list[str]) -> set[str]:
+        if not jtis:
+            return set()
+        if self._filter is not None and self._filter.is_fresh:
+            return {jti for jti in jtis if jti in self._filter}
+        stored = await self._client.mget(jtis)
+        return {jti for jti, value in zip(jtis, stored) if value is not None}
     
     def __hash__(self):
         return hash(self._client)
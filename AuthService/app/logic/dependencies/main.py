@@ -4,9 +4,11 @@ from fastapi import Depends, FastAPI
 from fastapi_limiter.depends import RateLimiter
 
 from async_fastapi_jwt_auth import AuthJWT
+from infrastructure.storages.role_stamp import RoleStampStorage
 from infrastructure.storages.token import TokenStorage
 from logic.dependencies.services.auth_service_factory import create_auth_service
 from logic.dependencies.services.role_service_factory import create_role_service
+from logic.dependencies.services.role_stamp_factory import create_role_stamp_storage
 from logic.dependencies.services.token_storage_factory import create_token_storage
 from logic.dependencies.services.user_role_service_factory import create_user_role_service
 from logic.services.auth import BaseAuthService
@@ -24,6 +26,7 @@ def setup_dependencies(app: FastAPI, mapper: dict[Any, Callable] | None = None)
         dependencies_container[BaseUserService] = create_user_service
         dependencies_container[BaseUserRoleService] = create_user_role_service
         dependencies_container[TokenStorage] = create_token_storage
+        dependencies_container[RoleStampStorage] = create_role_stamp_storage
         dependencies_container[RoleService] = create_role_service
         dependencies_container[BaseAuthService] = create_auth_service
         
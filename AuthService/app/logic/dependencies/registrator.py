@@ -1,9 +1,60 @@
-from typing import Callable, Type
+from enum import StrEnum
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, Callable, Type
+
+
+class Lifetime(StrEnum):
+    # built once per process, must not hold anything bound to an event loop
+    SINGLETON = "singleton"
+    # built once per worker, may hold its Redis/Kafka clients; dropped on shutdown
+    WORKER = "worker"
+    # built for every request, e.g. anything holding the request's session
+    REQUEST = "request"
+
 
 dependencies_container: dict[Type | Callable, Callable] = {}
 
-def add_factory_to_mapper(class_: Type | Callable):
+scoped_instances: dict[Lifetime, dict[Callable, Any]] = {
+    Lifetime.SINGLETON: {},
+    Lifetime.WORKER: {},
+}
+
+def scoped(lifetime: Lifetime = Lifetime.REQUEST):
+    """Wraps a dependency factory so FastAPI builds it once per ``lifetime``.
+
+    Longer-lived factories must only depend on equally long-lived ones: their
+    arguments are ignored once an instance exists.
+    """
+    def _scoped(func: Callable):
+        instances = scoped_instances.get(lifetime)
+        is_coroutine = iscoroutinefunction(func)
+
+        # always async: construction does no I/O, so there is no reason
+        # for FastAPI to hop to its threadpool for a plain factory
+        @wraps(func)
+        async def factory(*args, **kwargs):
+            if instances is not None and func in instances:
+                return instances[func]
+            instance = func(*args, **kwargs)
+            if is_coroutine:
+                instance = await instance
+            if instances is not None:
+                instances[func] = instance
+            return instance
+
+        factory.lifetime = lifetime
+        return factory
+    return _scoped
+
+def reset_scope(lifetime: Lifetime) -> None:
+    scoped_instances[lifetime].clear()
+
+def add_factory_to_mapper(
+    class_: Type | Callable, lifetime: Lifetime = Lifetime.REQUEST
+):
     def _add_factory_to_mapper(func: Callable):
-        dependencies_container[class_] = func
-        return func
-    return _add_factory_to_mapper
\ No newline at end of file
+        factory = scoped(lifetime)(func)
+        dependencies_container[class_] = factory
+        return factory
+    return _add_factory_to_mapper
@@ -1,21 +1,37 @@
-from functools import cache
 from async_fastapi_jwt_auth import AuthJWT
-from fastapi import Depends
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from infrastructure.database.postgres import get_session
+from infrastructure.security.jwt import KeyRingAuthJWT
+from infrastructure.storages.role_stamp import RoleStampStorage
+from logic.services.events import DomainEvents
+from logic.services.password import BasePasswordHasher, get_password_hasher
 from logic.services.user import BaseUserService
 from infrastructure.storages.token import TokenStorage
 from logic.services.auth import AuthService, BaseAuthService
 from logic.dependencies.registrator import add_factory_to_mapper
+from logic.dependencies.services.domain_events_factory import create_domain_events
+from logic.unit_of_work.sqlalchemy import SqlAlchemyUnitOfWork
 
 @add_factory_to_mapper(BaseAuthService)
-@cache
 def create_auth_service(
-    auth_jwt: AuthJWT = Depends(),
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    auth_jwt: AuthJWT = Depends(KeyRingAuthJWT),
     token_storage: TokenStorage = Depends(),
     user_service: BaseUserService = Depends(),
+    password_hasher: BasePasswordHasher = Depends(get_password_hasher),
+    role_stamps: RoleStampStorage = Depends(),
+    events: DomainEvents = Depends(create_domain_events),
 ) -> BaseAuthService:
     return AuthService(
         _auth_jwt_service=auth_jwt,
         _token_storage=token_storage,
         _user_service=user_service,
+        _password_hasher=password_hasher,
+        _role_stamps=role_stamps,
+        _uow=SqlAlchemyUnitOfWork(_session=session),
+        _events=events,
+        _state=request.state,
     )
\ No newline at end of file
@@ -0,0 +1,51 @@
+from fastapi import Depends
+from redis.asyncio import Redis
+
+from infrastructure.database.redis import get_redis
+
+from infrastructure.models.snapshot import RoleSnapshot, UserSnapshot
+from logic.dependencies.registrator import Lifetime, scoped
+from logic.services.cache import (
+    BaseCacheService,
+    CacheInvalidationBus,
+    RedisCacheService,
+    TieredCacheService,
+    get_local_cache,
+)
+from settings.config import settings
+
+
+@scoped(Lifetime.WORKER)
+def create_user_cache_service(redis: Redis = Depends(get_redis)) -> BaseCacheService:
+    return TieredCacheService(
+        _local=get_local_cache(
+            UserSnapshot.__name__,
+            max_size=settings.cache_local_user_max_size,
+            ttl=settings.cache_local_user_ttl_seconds,
+        ),
+        _remote=RedisCacheService(
+            _client=redis,
+            _model=UserSnapshot,
+            _ttl=settings.cache_user_ttl_seconds,
+            _beta=settings.cache_user_xfetch_beta,
+        ),
+        _bus=CacheInvalidationBus(_client=redis),
+    )
+
+
+@scoped(Lifetime.WORKER)
+def create_role_cache_service(redis: Redis = Depends(get_redis)) -> BaseCacheService:
+    return TieredCacheService(
+        _local=get_local_cache(
+            RoleSnapshot.__name__,
+            max_size=settings.cache_local_role_max_size,
+            ttl=settings.cache_local_role_ttl_seconds,
+        ),
+        _remote=RedisCacheService(
+            _client=redis,
+            _model=RoleSnapshot,
+            _ttl=settings.cache_role_ttl_seconds,
+            _beta=settings.cache_role_xfetch_beta,
+        ),
+        _bus=CacheInvalidationBus(_client=redis),
+    )
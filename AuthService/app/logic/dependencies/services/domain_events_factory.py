@@ -0,0 +1,25 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.postgres import get_session
+from infrastructure.kafka.sender import BaseSender
+from infrastructure.repositories.outbox import PostgresOutboxRepository
+from logic.dependencies.registrator import add_factory_to_mapper
+from logic.dependencies.services.sender_factory import create_sender
+from logic.services.events import DomainEvents
+from logic.services.outbox_relay import get_outbox_relay
+from settings.config import settings
+
+
+@add_factory_to_mapper(DomainEvents)
+def create_domain_events(
+    session: AsyncSession = Depends(get_session),
+    sender: BaseSender = Depends(create_sender),
+) -> DomainEvents:
+    if not settings.outbox_enabled:
+        return DomainEvents(_sender=sender)
+    return DomainEvents(
+        _sender=sender,
+        _outbox=PostgresOutboxRepository(_session=session),
+        _outbox_relay=get_outbox_relay(),
+    )
@@ -1,5 +1,3 @@
-from functools import cache
-
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from redis.asyncio import Redis
@@ -7,23 +5,43 @@ from redis.asyncio import Redis
 from infrastructure.database.postgres import get_session
 from infrastructure.database.redis import get_redis
 from infrastructure.models.role import Role
+from infrastructure.storages.role_stamp import RoleStampStorage
 from infrastructure.repositories.role import PostgresCacheRoleRepository, PostgresRoleRepository
+from logic.dependencies.services.cache_service_factory import create_role_cache_service
+from logic.dependencies.services.domain_events_factory import create_domain_events
+from logic.dependencies.services.user_snapshot_factory import create_user_snapshot_publisher
+from logic.services.cache import BaseCacheService
+from logic.services.events import DomainEvents
 from logic.dependencies.registrator import add_factory_to_mapper
-from logic.services.cache import RedisCacheService
 from logic.services.role import BaseRoleService, RoleService
+from logic.services.role_catalog import get_role_catalog
+from logic.services.single_flight import get_single_flight
+from logic.services.user_snapshots import UserSnapshotPublisher
 from logic.unit_of_work.sqlalchemy import SqlAlchemyUnitOfWork
+from settings.config import settings
 
 
 @add_factory_to_mapper(BaseRoleService)
-@cache
 def create_role_service(
-    session: AsyncSession = Depends(get_session), redis: Redis = Depends(get_redis)
+    session: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis),
+    cache_service: BaseCacheService = Depends(create_role_cache_service),
+    role_stamps: RoleStampStorage = Depends(),
+    events: DomainEvents = Depends(create_domain_events),
+    snapshots: UserSnapshotPublisher = Depends(create_user_snapshot_publisher),
 ) -> BaseRoleService:
-    cache_service = RedisCacheService(_client=redis, _model=Role)
     cached_repository = PostgresCacheRoleRepository(
         _session=session,
         _model=Role,
-        _cache_service=cache_service
+        _cache_service=cache_service,
+        _single_flight=get_single_flight(redis),
+        _catalog=get_role_catalog(redis),
     )
     unit_of_work = SqlAlchemyUnitOfWork(_session=session)
-    return RoleService(_repository=cached_repository, _uow=unit_of_work)
\ No newline at end of file
+    return RoleService(
+        _repository=cached_repository,
+        _uow=unit_of_work,
+        _role_stamps=role_stamps,
+        _events=events,
+        _snapshots=snapshots if settings.user_snapshots_enabled else None,
+    )
\ No newline at end of file
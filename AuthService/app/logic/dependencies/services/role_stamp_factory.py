@@ -0,0 +1,11 @@
+from fastapi import Depends
+from redis.asyncio import Redis
+
+from infrastructure.database.redis import get_redis
+from infrastructure.storages.role_stamp import RedisRoleStampStorage, RoleStampStorage
+from logic.dependencies.registrator import Lifetime, add_factory_to_mapper
+
+
+@add_factory_to_mapper(RoleStampStorage, Lifetime.WORKER)
+def create_role_stamp_storage(redis: Redis = Depends(get_redis)) -> RoleStampStorage:
+    return RedisRoleStampStorage(_client=redis)
@@ -1,17 +1,15 @@
-
-
-from functools import cache
-
-from aiokafka import AIOKafkaProducer
-from fastapi import Depends
-from infrastructure.kafka.sender import BaseSender, KafkaSender, get_producer
-from logic.dependencies.registrator import add_factory_to_mapper
-
-
-@add_factory_to_mapper(KafkaSender)
-@cache
-def create_sender(
-    producer: AIOKafkaProducer = Depends(get_producer()),
-) -> BaseSender:
-    return KafkaSender(_producer=producer)
-    
\ No newline at end of file
+from infrastructure.kafka.sender import (
+    BaseSender,
+    KafkaSender,
+    get_producer,
+    get_queued_sender,
+)
+from logic.dependencies.registrator import Lifetime, add_factory_to_mapper
+from settings.config import settings
+
+
+@add_factory_to_mapper(BaseSender, Lifetime.WORKER)
+def create_sender() -> BaseSender:
+    if settings.kafka_send_queued:
+        return get_queued_sender()
+    return KafkaSender(_producer=get_producer())
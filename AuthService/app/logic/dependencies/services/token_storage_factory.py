@@ -1,15 +1,15 @@
-from functools import cache
-
 from fastapi import Depends
 from redis.asyncio import Redis
 
 
 from infrastructure.database.redis import get_redis
+from infrastructure.storages.revocation import get_revocation_filter
 from infrastructure.storages.token import RedisTokenStorage, TokenStorage
-from logic.dependencies.registrator import add_factory_to_mapper
+from logic.dependencies.registrator import Lifetime, add_factory_to_mapper
 
 
-@add_factory_to_mapper(TokenStorage)
-@cache
+@add_factory_to_mapper(TokenStorage, Lifetime.WORKER)
 def create_token_storage(redis_client: Redis = Depends(get_redis)) -> TokenStorage:
-    return RedisTokenStorage(_client=redis_client)
\ No newline at end of file
+    return RedisTokenStorage(
+        _client=redis_client, _filter=get_revocation_filter(redis_client)
+    )
\ No newline at end of file
@@ -1,5 +1,3 @@
-from functools import cache
-
 from fastapi import Depends
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,34 +6,55 @@ from infrastructure.database.redis import get_redis
 from infrastructure.models.role import Role
 from infrastructure.database.postgres import get_session
 from infrastructure.models.user import User
+from infrastructure.storages.role_stamp import RoleStampStorage
 from infrastructure.repositories.role import PostgresCacheRoleRepository, PostgresRoleRepository
 from infrastructure.repositories.user import PostgresCacheUserRepository, PostgresUserRepository
+from logic.dependencies.services.cache_service_factory import (
+    create_role_cache_service,
+    create_user_cache_service,
+)
 from logic.dependencies.registrator import add_factory_to_mapper
-from logic.services.cache import RedisCacheService
+from logic.dependencies.services.domain_events_factory import create_domain_events
+from logic.dependencies.services.user_snapshot_factory import create_user_snapshot_publisher
+from logic.services.cache import BaseCacheService
+from logic.services.events import DomainEvents
 from logic.services.user_role import BaseUserRoleService, UserRoleService
+from logic.services.role_catalog import get_role_catalog
+from logic.services.single_flight import get_single_flight
+from logic.services.user_snapshots import UserSnapshotPublisher
 from logic.unit_of_work.sqlalchemy import SqlAlchemyUnitOfWork
+from settings.config import settings
 
 
 @add_factory_to_mapper(BaseUserRoleService)
-@cache
 def create_user_role_service(
-    session: AsyncSession = Depends(get_session), redis: Redis = Depends(get_redis)
+    session: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis),
+    user_cache_service: BaseCacheService = Depends(create_user_cache_service),
+    role_cache_service: BaseCacheService = Depends(create_role_cache_service),
+    role_stamps: RoleStampStorage = Depends(),
+    events: DomainEvents = Depends(create_domain_events),
+    snapshots: UserSnapshotPublisher = Depends(create_user_snapshot_publisher),
 ) -> BaseUserRoleService:
-    user_cache_service = RedisCacheService(_client=redis, _model=User)
     cached_user_repository = PostgresCacheUserRepository(
         _session=session,
         _model=User,
-        _cache_service=user_cache_service
+        _cache_service=user_cache_service,
+        _single_flight=get_single_flight(redis),
     )
-    role_cache_service = RedisCacheService(_client=redis, _model=Role)
     cached_role_repository = PostgresCacheRoleRepository(
         _session=session,
         _model=Role,
-        _cache_service=role_cache_service
+        _cache_service=role_cache_service,
+        _single_flight=get_single_flight(redis),
+        _catalog=get_role_catalog(redis),
     )
     unit_of_work = SqlAlchemyUnitOfWork(_session=session)
     return UserRoleService(
         _user_repository=cached_user_repository,
         _role_repository=cached_role_repository,
         _uow=unit_of_work,
+        _role_stamps=role_stamps,
+        _events=events,
+        _snapshots=snapshots if settings.user_snapshots_enabled else None,
     )
\ No newline at end of file
@@ -1,5 +1,3 @@
-from functools import cache
-
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from redis.asyncio import Redis
@@ -8,22 +6,44 @@ from infrastructure.database.postgres import get_session
 from infrastructure.database.redis import get_redis
 from infrastructure.models.user import User
 from infrastructure.repositories.user import PostgresCacheUserRepository
+from logic.dependencies.services.cache_service_factory import create_user_cache_service
+from logic.dependencies.services.domain_events_factory import create_domain_events
+from logic.dependencies.services.user_snapshot_factory import create_user_snapshot_publisher
+from logic.services.cache import BaseCacheService
 from logic.dependencies.registrator import add_factory_to_mapper
-from logic.services.cache import RedisCacheService
+from logic.services.events import DomainEvents
+from logic.services.login_history import get_login_history_writer
+from logic.services.password import BasePasswordHasher, get_password_hasher
 from logic.services.user import BaseUserService, UserService
+from logic.services.single_flight import get_single_flight
+from logic.services.user_snapshots import UserSnapshotPublisher
 from logic.unit_of_work.sqlalchemy import SqlAlchemyUnitOfWork
+from settings.config import settings
 
 
 @add_factory_to_mapper(BaseUserService)
-@cache
 def create_user_service(
-    session: AsyncSession = Depends(get_session), redis: Redis = Depends(get_redis)
+    session: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis),
+    password_hasher: BasePasswordHasher = Depends(get_password_hasher),
+    cache_service: BaseCacheService = Depends(create_user_cache_service),
+    events: DomainEvents = Depends(create_domain_events),
+    snapshots: UserSnapshotPublisher = Depends(create_user_snapshot_publisher),
 ) -> BaseUserService:
-    cache_service = RedisCacheService(_client=redis, _model=User)
     unit_of_work = SqlAlchemyUnitOfWork(_session=session)
     cached_repository = PostgresCacheUserRepository(
         _session=session,
         _model=User,
-        _cache_service=cache_service,    
+        _cache_service=cache_service,
+        _single_flight=get_single_flight(redis),
     )
-    return UserService(_repository=cached_repository, _uow=unit_of_work)
\ No newline at end of file
+    return UserService(
+        _repository=cached_repository,
+        _uow=unit_of_work,
+        _password_hasher=password_hasher,
+        _events=events,
+        _snapshots=snapshots if settings.user_snapshots_enabled else None,
+        _history_writer=(
+            get_login_history_writer() if settings.login_history_buffered else None
+        ),
+    )
\ No newline at end of file
@@ -0,0 +1,13 @@
+from fastapi import Depends
+
+from infrastructure.kafka.sender import BaseSender
+from logic.dependencies.registrator import Lifetime, add_factory_to_mapper
+from logic.dependencies.services.sender_factory import create_sender
+from logic.services.user_snapshots import UserSnapshotPublisher
+
+
+@add_factory_to_mapper(UserSnapshotPublisher, Lifetime.WORKER)
+def create_user_snapshot_publisher(
+    sender: BaseSender = Depends(create_sender),
+) -> UserSnapshotPublisher:
+    return UserSnapshotPublisher(_sender=sender)
@@ -1,21 +1,32 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from functools import wraps
+from dataclasses import dataclass, field
 from typing import Any
 from datetime import UTC, datetime
 from time import time
+from types import SimpleNamespace
 
-import async_fastapi_jwt_auth
 from async_fastapi_jwt_auth import AuthJWT
-from async_fastapi_jwt_auth.exceptions import JWTDecodeError, MissingTokenError
-from fastapi import HTTPException, status
+from async_fastapi_jwt_auth.exceptions import (
+    InvalidHeaderError,
+    JWTDecodeError,
+    MissingTokenError,
+)
+from fastapi import Depends, HTTPException, status
 
 from schemas.user import UserHistoryCreateDTO
+from logic.services.events import DomainEvents
+from logic.services.password import BasePasswordHasher, get_password_hasher
 from logic.services.user import BaseUserService
+from logic.unit_of_work.base import BaseUnitOfWork
+from infrastructure.kafka.sender import user_event_message
+from infrastructure.storages.role_stamp import RoleStampStorage
 from infrastructure.storages.token import TokenStorage
 from infrastructure.models.user import User
+from schemas.events import UserLoggedOutEventDTO
 from schemas.result import Error, GenericResult
-from schemas.token import Token, TokenJTI
+from schemas.token import Token, TokenIntrospection, TokenJTI
+from schemas.user import UserDTO
+from settings.config import settings
 
 
 @dataclass
@@ -50,21 +61,47 @@ class BaseAuthService(ABC):
     async def get_user(self) -> User | None:
         ...
         
+    @abstractmethod
+    async def get_role_names(self) -> frozenset[str] | None:
+        ...
+        
     @abstractmethod
     async def get_auth_user(self, token: str) -> User | None:
         ...
         
+    @abstractmethod
+    async def introspect_tokens(
+        self, access_tokens: list[str]
+    ) -> list[TokenIntrospection]:
+        ...
+        
         
+@dataclass
+class Principal:
+    """The authenticated caller, resolved once per request."""
+    claims: dict[str, Any]
+    user: User | None = None
+    role_names: frozenset[str] | None = None
+
+
 @dataclass 
 class AuthService(BaseAuthService):
     _auth_jwt_service: AuthJWT
     _token_storage: TokenStorage
     _user_service: BaseUserService
+    _password_hasher: BasePasswordHasher = field(default_factory=get_password_hasher)
+    _role_stamps: RoleStampStorage | None = None
+    _uow: BaseUnitOfWork | None = None
+    _events: DomainEvents = field(default_factory=DomainEvents)
+    _roles_strategy: str = settings.auth_roles_strategy
+    _state: Any = field(default_factory=SimpleNamespace)
     
-    async def _generate_token(self, user_id: Any) -> Token:
+    async def _generate_token(self, user: User) -> Token:
+        user_id = str(user.id)
+        claims = {"roles": sorted(role.name for role in user.roles)}
         return Token(
             access_token = await self._auth_jwt_service.
-                create_access_token(subject=user_id),
+                create_access_token(subject=user_id, user_claims=claims),
             refresh_token= await self._auth_jwt_service.
                 create_refresh_token(subject=user_id)
         )
@@ -103,8 +140,10 @@ class AuthService(BaseAuthService):
     async def login(
         self, login: str, password: str, user_agent: str
     ) -> GenericResult[Token]:
-        user = await self._user_service.get_user_by_login(login=login)
-        if not user or not user.check_password(password=password):
+        user = await self._user_service.get_user_for_login(login=login)
+        if not user or not await self._password_hasher.verify(
+            password, user.password
+        ):
             return GenericResult.failure(
                 Error(
                     error_code="WRONG_LOGIN_OR_PASSWORD",
@@ -118,16 +157,14 @@ class AuthService(BaseAuthService):
             user_device_type="web",
             success=True
         )
-        await self._user_service.insert_user_login(
-            user_id=user.id, history_row=user_history
-        )
-        tokens = await self._generate_token(user_id=str(user.id))
+        await self._user_service.record_login(history_row=user_history)
+        tokens = await self._generate_token(user)
         await self._auth_jwt_service.set_access_cookies(tokens.access_token)
         await self._auth_jwt_service.set_refresh_cookies(tokens.refresh_token)
         return GenericResult.success(tokens)
     
     async def login_by_oauth(self, *, login: str) -> GenericResult[Token]:
-        user = await self._user_service.get_user_by_login(login=login)
+        user = await self._user_service.get_user_for_login(login=login)
         if not user:
             return GenericResult.failure(
                 error=Error(
@@ -142,18 +179,16 @@ class AuthService(BaseAuthService):
             user_device_type="web",
             success=True
         )
-        await self._user_service.insert_user_login(
-            user_id=user.id, history_row=user_history
-        )    
+        await self._user_service.record_login(history_row=user_history)
         
-        tokens = await self._generate_token(user_id=str(user.id))
+        tokens = await self._generate_token(user)
         await self._auth_jwt_service.set_access_cookies(tokens.access_token)
         await self._auth_jwt_service.set_refresh_cookies(tokens.refresh_token)
         return GenericResult.success(tokens)    
     
     async def logout(self) -> None:
-        await self.require_auth()
-        access_jti = (await self._auth_jwt_service.get_raw_jwt())["jti"]
+        claims = (await self.require_auth()).claims
+        access_jti = claims["jti"]
         # await self._auth_jwt_service.unset_jwt_cookies()
         await self._auth_jwt_service.unset_access_cookies()
         await self._auth_jwt_service.unset_refresh_cookies()
@@ -161,7 +196,13 @@ class AuthService(BaseAuthService):
             access_token_jti=access_jti,
             refresh_token_jti=None
         )
-        return await self._token_storage.store_token(token=token_jti)
+        await self._token_storage.store_token(token=token_jti)
+        await self._events.stage(
+            user_event_message(UserLoggedOutEventDTO(user_id=claims["sub"]))
+        )
+        if self._uow is not None:
+            await self._uow.commit()
+        await self._events.committed()
     
     async def refresh(self, access_jti: str) -> Token:
         await self._refresh_token_required()
@@ -172,15 +213,26 @@ class AuthService(BaseAuthService):
         )
         await self._token_storage.store_token(token_jti=token_jti)
         user_subject = await self._auth_jwt_service.get_jwt_subject()
-        tokens = await self._generate_token(user_id=user_subject)
+        user: GenericResult[User] = await self._user_service.get_user(
+            user_id=user_subject
+        )
+        if not user.is_success:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Unathorized"
+            )
+        tokens = await self._generate_token(user.response)
         await self._auth_jwt_service.set_access_cookies(tokens.access_token)
         await self._auth_jwt_service.set_refresh_cookies(tokens.refresh_token)
         return tokens
     
-    async def require_auth(self):
+    async def require_auth(self) -> Principal:
+        principal: Principal | None = getattr(self._state, "principal", None)
+        if principal is not None:
+            return principal
         try: 
             await self._auth_jwt_service.jwt_required()
-            if await self._check_token_expiracy():
+            claims = await self._auth_jwt_service.get_raw_jwt()
+            if await self._token_storage.check_expiration(jti=claims["jti"]):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED, detail="Unathorized"
                 )
@@ -192,17 +244,47 @@ class AuthService(BaseAuthService):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail=e.message
             )
+        principal = self._state.principal = Principal(claims=claims)
+        return principal
         
     async def optional_auth(self):
         return await self._auth_jwt_service.jwt_optional()
     
     async def get_user(self) -> User | None:
-        await self.require_auth()
-        user_subject = await self._auth_jwt_service.get_jwt_subject()
-        user: GenericResult[User] = await self._user_service.get_user(
-            user_id=user_subject
-        )
-        return user.response
+        principal = await self.require_auth()
+        if principal.user is None:
+            user: GenericResult[User] = await self._user_service.get_user(
+                user_id=principal.claims["sub"]
+            )
+            principal.user = user.response
+        return principal.user
+    
+    async def get_role_names(self) -> frozenset[str] | None:
+        """Role names of the caller, from the token claims when they can be trusted.
+
+        ``token`` trusts the claims until the token expires, ``stamp`` also
+        checks that the roles have not changed since the token was issued and
+        ``database`` always loads the user.
+        """
+        principal = await self.require_auth()
+        if principal.role_names is not None:
+            return principal.role_names
+        claims = principal.claims
+        roles = claims.get("roles")
+        if self._roles_strategy != "database" and roles is not None and (
+            self._roles_strategy == "token"
+            or self._role_stamps is None
+            or not await self._role_stamps.changed_since(
+                user_id=claims["sub"], issued_at=claims["iat"]
+            )
+        ):
+            principal.role_names = frozenset(roles)
+            return principal.role_names
+        user = await self.get_user()
+        if not user:
+            return None
+        principal.role_names = frozenset(role.name for role in user.roles)
+        return principal.role_names
     
     async def get_auth_user(self, access_token: str) -> User | None:
         decoded = await self._decode_token(access_token)
@@ -214,24 +296,79 @@ class AuthService(BaseAuthService):
         user = await self._user_service.get_user(id=user_id)
         return user.response
     
+    async def introspect_tokens(
+        self, access_tokens: list[str]
+    ) -> list[TokenIntrospection]:
+        """Validates many access tokens with one revocation lookup and one user query."""
+        claims: list[dict | None] = []
+        results: list[TokenIntrospection | None] = []
+        for access_token in access_tokens:
+            try:
+                decoded = await self._auth_jwt_service.get_raw_jwt(access_token)
+            except (JWTDecodeError, InvalidHeaderError):
+                decoded = None
+            if decoded is None or decoded.get("type") != "access":
+                claims.append(None)
+                results.append(
+                    TokenIntrospection(active=False, error_code="INVALID_TOKEN")
+                )
+            else:
+                claims.append(decoded)
+                results.append(None)
         
-def require_roles(roles: list[str]):
-    def auth_decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            auth_service = kwargs["auth_service"]
-            current_user: User = await auth_service.get_user()
-            if not current_user:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized"
+        decoded_claims = [decoded for decoded in claims if decoded is not None]
+        revoked = await self._token_storage.get_revoked(
+            jtis=[decoded["jti"] for decoded in decoded_claims]
+        )
+        user_ids = {
+            decoded["sub"] for decoded in decoded_claims if decoded["jti"] not in revoked
+        }
+        users = {
+            str(user.id): user
+            for user in await self._user_service.get_users_by_ids(
+                user_ids=list(user_ids)
+            )
+        }
+        
+        for index, decoded in enumerate(claims):
+            if decoded is None:
+                continue
+            user = users.get(decoded["sub"])
+            if decoded["jti"] in revoked:
+                results[index] = TokenIntrospection(
+                    active=False, error_code="TOKEN_REVOKED"
                 )
-            for role in current_user.roles:
-                if role.name in roles:
-                    return await func(*args, **kwargs)
+            elif user is None:
+                results[index] = TokenIntrospection(
+                    active=False, error_code="USER_NOT_FOUND"
+                )
+            else:
+                results[index] = TokenIntrospection(
+                    active=True,
+                    user=UserDTO.model_validate(user, from_attributes=True),
+                )
+        return results
+    
+        
+async def authenticate(auth_service: BaseAuthService = Depends()) -> Principal:
+    return await auth_service.require_auth()
+
+
+def require_roles(roles: list[str]) -> Any:
+    """Route dependency rejecting the caller before the handler's own
+    dependencies resolve, e.g. ``dependencies=[require_roles([...])]``."""
+    allowed = frozenset(roles)
+
+    async def authorize(auth_service: BaseAuthService = Depends()) -> Principal:
+        role_names = await auth_service.get_role_names()
+        if role_names is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized"
+            )
+        if role_names.isdisjoint(allowed):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="User have not access"
             )
+        return await auth_service.require_auth()
 
-        return wrapper
-
-    return auth_decorator 
\ No newline at end of file
+    return Depends(authorize)
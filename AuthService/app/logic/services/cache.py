@@ -1,12 +1,52 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-import json
-from typing import Generic, Type
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import partial
+from math import log
+from random import random
+from time import monotonic, time
+from typing import Any, Awaitable, Callable, Generic, Type
 
+import orjson
+from pydantic import BaseModel
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
+from infrastructure.metrics.registry import metrics
 from infrastructure.repositories.base import CreateSchemaType
+from logic.services.codecs import CacheSerializer, get_cache_serializer
 from schemas.result import ModelType
+from settings.config import settings
+
+
+class _NotFound:
+    """Cached answer "this entity does not exist"."""
+    __slots__ = ()
+    
+    def __repr__(self) -> str:
+        return "NOT_FOUND"
+
+
+NOT_FOUND = _NotFound()
+NOT_FOUND_DOCUMENT = b"\x00"
+
+Refresh = Callable[[], Awaitable[Any]]
+
+refresh_tasks: dict[str, asyncio.Task] = {}
+
+def schedule_refresh(key: str, refresh: Refresh) -> None:
+    if key in refresh_tasks:
+        return
+    metrics.inc("cache_early_refreshes")
+    task = asyncio.create_task(refresh())
+    refresh_tasks[key] = task
+    task.add_done_callback(partial(_refresh_done, key))
+
+def _refresh_done(key: str, task: asyncio.Task) -> None:
+    refresh_tasks.pop(key, None)
+    if not task.cancelled() and task.exception() is not None:
+        metrics.inc("cache_early_refresh_errors")
 
 
 @dataclass
@@ -18,31 +58,208 @@ class BaseCacheService(ABC):
     @abstractmethod
     async def set(self, *args, **kwargs):
         ...
-        
+
+    @abstractmethod
+    async def set_missing(self, *args, **kwargs):
+        ...
+
     @abstractmethod
     async def delete(self, *args, **kwargs):
         ...
-        
+
+    @abstractmethod
+    async def delete_many(self, *args, **kwargs):
+        ...
+
 @dataclass
 class RedisCacheService(BaseCacheService, Generic[ModelType, CreateSchemaType]):
     _client: Redis
     _model: Type[ModelType]
-    
-    async def get(self, *, key: str) -> ModelType | None:
+    _ttl: int | None = None
+    _beta: float = 0.0
+    _serializer: CacheSerializer = field(default_factory=get_cache_serializer)
+
+    def _expires_early(self, delta: float, expires: float | None) -> bool:
+        """XFetch: refresh ahead of expiry, the sooner the costlier the load."""
+        if not self._beta or expires is None:
+            return False
+        return time() - delta * self._beta * log(random() or 1e-12) >= expires
+
+    async def get(
+        self, *, key: str, refresh: Refresh | None = None
+    ) -> ModelType | _NotFound | None:
         document = await self._client.get(key)
         if not document:
             return None
-        return self._model(**json.loads(document))
+        if document == NOT_FOUND_DOCUMENT:
+            return NOT_FOUND
+        envelope = self._serializer.loads(document)
+        if envelope is None:
+            return None
+        data, delta, expires = envelope
+        if refresh is not None and self._expires_early(delta, expires):
+            schedule_refresh(key, refresh)
+        return self._model(**data)
+
+    async def set(
+        self,
+        *,
+        key: str,
+        value: CreateSchemaType,
+        ttl: int | None = None,
+        delta: float = 0.0,
+    ) -> None:
+        data = value.model_dump() if isinstance(value, BaseModel) else value.to_dict()
+        ttl = ttl or self._ttl
+        expires = time() + ttl if ttl else None
+        await self._client.set(
+            key, self._serializer.dumps([data, delta, expires]), ex=ttl
+        )
+
+    async def set_missing(self, *, key: str, ttl: int) -> None:
+        await self._client.set(key, NOT_FOUND_DOCUMENT, ex=ttl)
+
+    async def delete(self, *, key: str) -> None:
+        await self._client.delete(key)
+
+    async def delete_many(self, *, keys: list[str]) -> None:
+        if keys:
+            await self._client.delete(*keys)
+
+    def __hash__(self):
+        return hash((self._client, self._model))
+
+    def __eq__(self, other):
+        return hash(self) == hash(other)
+
+
+@dataclass
+class LocalCache:
+    """Bounded LRU with a per-entry TTL, shared by all requests of a worker."""
+    _max_size: int
+    _ttl: float
+    _entries: OrderedDict = field(default_factory=OrderedDict)
+    
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+            
+    def clear(self) -> None:
+        self._entries.clear()
+        
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+local_caches: dict[str, LocalCache] = {}
+
+def get_local_cache(name: str, max_size: int, ttl: float) -> LocalCache:
+    if name not in local_caches:
+        local_caches[name] = LocalCache(_max_size=max_size, _ttl=ttl)
+    return local_caches[name]
+
+def drop_local(keys: list[str]) -> None:
+    for local_cache in local_caches.values():
+        local_cache.delete(*keys)
+        
+def clear_local() -> None:
+    for local_cache in local_caches.values():
+        local_cache.clear()
+
+
+@dataclass
+class CacheInvalidationBus:
+    """Fans evicted keys out to the local caches of every worker over pub/sub."""
+    _client: Redis
+    _channel: str = settings.cache_invalidation_channel
     
-    async def set(self, *, key: str, value: CreateSchemaType) -> None:
-        await self._client.set(key, json.dumps(value.model_dump()))
+    async def publish(self, keys: list[str]) -> None:
+        await self._client.publish(self._channel, orjson.dumps(keys))
+        
+    async def listen(self) -> None:
+        async with self._client.pubsub() as pubsub:
+            await pubsub.subscribe(self._channel)
+            # anything published before the subscription was missed
+            clear_local()
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                drop_local(orjson.loads(message["data"]))
+                metrics.inc("cache_invalidations_received")
+    
+    async def run(self, retry_delay: float = 1.0) -> None:
+        while True:
+            try:
+                await self.listen()
+            except (ConnectionError, RedisError):
+                clear_local()
+                await asyncio.sleep(retry_delay)
+                
+    def __hash__(self):
+        return hash((self._client, self._channel))
+        
+    def __eq__(self, other):
+        return hash(self) == hash(other)
+
+
+@dataclass
+class TieredCacheService(BaseCacheService):
+    """In-process LocalCache (L1) in front of a shared Redis cache (L2)."""
+    _local: LocalCache
+    _remote: BaseCacheService
+    _bus: CacheInvalidationBus
+    
+    async def get(self, *, key: str, refresh: Refresh | None = None) -> Any | None:
+        value = self._local.get(key)
+        if value is not None:
+            metrics.inc("cache_local_hits")
+            return value
+        metrics.inc("cache_local_misses")
+        value = await self._remote.get(key=key, refresh=refresh)
+        if value is not None:
+            self._local.set(key, value)
+        return value
+    
+    async def set(
+        self, *, key: str, value: Any, ttl: int | None = None, delta: float = 0.0
+    ) -> None:
+        await self._remote.set(key=key, value=value, ttl=ttl, delta=delta)
+        self._local.set(key, value)
+        
+    async def set_missing(self, *, key: str, ttl: int) -> None:
+        await self._remote.set_missing(key=key, ttl=ttl)
+        self._local.set(key, NOT_FOUND)
         
     async def delete(self, *, key: str) -> None:
-        if await self._client.exists(key):
-            await self._client.delete(key)
-            
+        await self.delete_many(keys=[key])
+        
+    async def delete_many(self, *, keys: list[str]) -> None:
+        if not keys:
+            return
+        drop_local(keys)
+        await self._remote.delete_many(keys=keys)
+        await self._bus.publish(keys)
+        
     def __hash__(self):
-        return hash((self._client, self._model))
+        return hash((id(self._local), self._remote, self._bus))
         
     def __eq__(self, other):
         return hash(self) == hash(other)
+
@@ -0,0 +1,96 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, ClassVar
+from uuid import UUID
+
+import msgpack
+import orjson
+
+from infrastructure.metrics.registry import metrics
+from settings.config import settings
+
+
+@dataclass
+class BaseCodec(ABC):
+    tag: ClassVar[bytes]
+
+    @abstractmethod
+    def encode(self, data: Any) -> bytes:
+        ...
+
+    @abstractmethod
+    def decode(self, payload: bytes) -> Any:
+        ...
+
+
+@dataclass
+class OrjsonCodec(BaseCodec):
+    tag: ClassVar[bytes] = b"j"
+
+    def encode(self, data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    def decode(self, payload: bytes) -> Any:
+        return orjson.loads(payload)
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, (UUID, datetime, date)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+@dataclass
+class MsgpackCodec(BaseCodec):
+    tag: ClassVar[bytes] = b"m"
+
+    def encode(self, data: Any) -> bytes:
+        return msgpack.packb(data, default=_msgpack_default)
+
+    def decode(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload)
+
+
+CODECS: dict[str, BaseCodec] = {
+    "orjson": OrjsonCodec(),
+    "msgpack": MsgpackCodec(),
+}
+CODECS_BY_TAG: dict[bytes, BaseCodec] = {
+    codec.tag: codec for codec in CODECS.values()
+}
+
+
+@dataclass
+class CacheSerializer:
+    """Prefixes every cache document with a codec tag and a schema version.
+
+    Documents are read back with whatever codec wrote them, so switching the
+    codec is safe. Documents from an unknown schema version are treated as
+    misses and get rewritten on the next load.
+    """
+    _codec: BaseCodec
+    _schema_version: int
+
+    def dumps(self, data: Any) -> bytes:
+        header = self._codec.tag + bytes((self._schema_version,))
+        return header + self._codec.encode(data)
+
+    def loads(self, document: bytes) -> Any | None:
+        codec = CODECS_BY_TAG.get(document[:1])
+        if codec is None or len(document) < 2 or document[1] != self._schema_version:
+            metrics.inc("cache_schema_mismatches")
+            return None
+        return codec.decode(document[2:])
+
+
+def get_cache_serializer() -> CacheSerializer:
+    codec = CODECS.get(settings.cache_codec)
+    if codec is None:
+        raise ValueError(f"Unknown cache codec: {settings.cache_codec}")
+    return CacheSerializer(
+        _codec=codec, _schema_version=settings.cache_schema_version
+    )
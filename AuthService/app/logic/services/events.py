@@ -0,0 +1,43 @@
+from dataclasses import dataclass, field
+
+from infrastructure.kafka.sender import BaseSender, Message
+from infrastructure.repositories.outbox import BaseOutboxRepository
+from logic.services.outbox_relay import OutboxRelay
+
+
+@dataclass
+class DomainEvents:
+    """Publishes a request's domain events once its transaction commits.
+
+    With an outbox, ``stage`` writes the events into the transaction itself
+    and the relay publishes them after the commit. Without one they are
+    held until ``committed`` and handed to the sender, so they are lost if
+    the process dies in between. With neither, events are discarded.
+    """
+    _sender: BaseSender | None = None
+    _outbox: BaseOutboxRepository | None = None
+    _outbox_relay: OutboxRelay | None = None
+    _pending: list[Message] = field(default_factory=list)
+    
+    async def stage(self, message: Message) -> None:
+        """Call before the commit that makes the change."""
+        if self._outbox is not None:
+            topic, value, key = message
+            await self._outbox.add(topic=topic, payload=value, key=key)
+        elif self._sender is not None:
+            self._pending.append(message)
+            
+    async def committed(self) -> None:
+        if self._outbox is not None:
+            if self._outbox_relay is not None:
+                self._outbox_relay.notify()
+            return
+        pending, self._pending = self._pending, []
+        for message in pending:
+            await self._sender.send(*message)
+            
+    def __hash__(self):
+        return hash((id(self._sender), self._outbox))
+    
+    def __eq__(self, other):
+        return hash(self) == hash(other)
@@ -0,0 +1,130 @@
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Callable
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.postgres import async_session
+from infrastructure.metrics.registry import metrics
+from infrastructure.models.user_history import UserHistory
+from schemas.user import UserHistoryCreateDTO
+from settings.config import settings
+
+
+CLOSE = object()
+
+
+@dataclass
+class LoginHistoryWriter:
+    """Takes login-history rows off the request path and inserts them in batches.
+
+    A batch is written once it holds ``_batch_size`` rows or ``_flush_interval``
+    seconds after its first row. Rows arriving while the queue is full are
+    dropped and counted.
+    """
+    _session_factory: Callable[[], AsyncSession] = async_session
+    _max_size: int = settings.login_history_queue_size
+    _batch_size: int = settings.login_history_batch_size
+    _flush_interval: float = settings.login_history_flush_seconds
+    _retry_delay: float = 1.0
+    _queue: asyncio.Queue = field(init=False)
+    _closing: bool = field(init=False, default=False)
+
+    def __post_init__(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self._max_size)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, record: UserHistoryCreateDTO) -> bool:
+        try:
+            self._queue.put_nowait(record.model_dump())
+        except asyncio.QueueFull:
+            metrics.inc("login_history_dropped")
+            return False
+        return True
+
+    async def _collect(self) -> tuple[list[dict[str, Any]], bool]:
+        record = await self._queue.get()
+        batch: list[dict[str, Any]] = []
+        deadline = monotonic() + self._flush_interval
+        while record is not CLOSE:
+            batch.append(record)
+            if len(batch) >= self._batch_size:
+                return batch, False
+            try:
+                record = await asyncio.wait_for(
+                    self._queue.get(), deadline - monotonic()
+                )
+            except TimeoutError:
+                return batch, False
+        return batch, True
+
+    async def _write_rows(
+        self, session: AsyncSession, batch: list[dict[str, Any]]
+    ) -> tuple[int, int]:
+        written = rejected = 0
+        for row in batch:
+            try:
+                await session.execute(insert(UserHistory), [row])
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                rejected += 1
+            else:
+                written += 1
+        return written, rejected
+
+    async def _write(self, batch: list[dict[str, Any]]) -> bool:
+        written = rejected = 0
+        try:
+            async with self._session_factory() as session:
+                try:
+                    # executemany, sent as multi-row INSERTs by the dialect
+                    await session.execute(insert(UserHistory), batch)
+                    await session.commit()
+                    written = len(batch)
+                except IntegrityError:
+                    # typically a user deleted since the login: keep the others
+                    await session.rollback()
+                    written, rejected = await self._write_rows(session, batch)
+        # not only SQLAlchemyError: a refused connect surfaces as a bare
+        # OSError, and nothing may end the writer for the worker's lifetime
+        except Exception:
+            metrics.inc("login_history_dropped", len(batch) - written)
+            metrics.inc("login_history_written", written)
+            metrics.inc("login_history_write_errors")
+            return False
+        metrics.inc("login_history_dropped", rejected)
+        metrics.inc("login_history_written", written)
+        return True
+
+    async def run(self) -> None:
+        while True:
+            batch, closed = await self._collect()
+            if batch and not await self._write(batch) and not self._closing:
+                await asyncio.sleep(self._retry_delay)
+            if closed or (self._closing and self._queue.empty()):
+                return
+
+    def close(self) -> None:
+        """Lets ``run`` write everything queued so far and return."""
+        self._closing = True
+        with suppress(asyncio.QueueFull):
+            self._queue.put_nowait(CLOSE)
+
+
+login_history_writer: LoginHistoryWriter | None = None
+
+def get_login_history_writer() -> LoginHistoryWriter:
+    global login_history_writer
+    if login_history_writer is None:
+        writer = LoginHistoryWriter()
+        metrics.gauge("login_history_queue_depth", lambda: writer.queue_depth)
+        login_history_writer = writer
+    return login_history_writer
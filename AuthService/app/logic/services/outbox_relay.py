@@ -0,0 +1,78 @@
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Callable
+
+from aiokafka import AIOKafkaProducer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.postgres import async_session
+from infrastructure.kafka.sender import get_producer, producer_ready
+from infrastructure.metrics.registry import metrics
+from infrastructure.repositories.outbox import PostgresOutboxRepository
+from settings.config import settings
+
+
+@dataclass
+class OutboxRelay:
+    """Publishes outbox rows to Kafka in batches and deletes them once acked.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED``, so every replica can
+    run a relay without publishing the same row twice, and under an
+    advisory lock per key, so events of one key are published in order.
+    The locks are held until the batch is acknowledged: a failure rolls
+    back and the rows are picked up again (at-least-once).
+    """
+    _session_factory: Callable[[], AsyncSession] = async_session
+    _get_producer: Callable[[], AIOKafkaProducer] = get_producer
+    _batch_size: int = settings.outbox_batch_size
+    _poll_interval: float = settings.outbox_poll_seconds
+    _wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    
+    def notify(self) -> None:
+        """Wakes the relay up now instead of at its next poll."""
+        self._wakeup.set()
+        
+    async def relay_batch(self) -> int:
+        async with self._session_factory() as session:
+            repository = PostgresOutboxRepository(_session=session)
+            events = await repository.claim(limit=self._batch_size)
+            if not events:
+                return 0
+            producer = self._get_producer()
+            # queue the whole batch before waiting so it leaves in few requests
+            deliveries = [
+                await producer.send(event.topic, value=event.payload, key=event.key)
+                for event in events
+            ]
+            await asyncio.gather(*deliveries)
+            await repository.delete(ids=[event.id for event in events])
+            await session.commit()
+        metrics.inc("outbox_published", len(events))
+        return len(events)
+    
+    async def run(self, retry_delay: float = 1.0) -> None:
+        await producer_ready.wait()
+        while True:
+            self._wakeup.clear()
+            try:
+                relayed = await self.relay_batch()
+            # not only Kafka/SQLAlchemy errors: a refused connect surfaces as
+            # a bare OSError, and the relay must outlive any of them
+            except Exception:
+                metrics.inc("outbox_relay_errors")
+                await asyncio.sleep(retry_delay)
+                continue
+            if relayed >= self._batch_size:
+                continue
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+
+
+outbox_relay: OutboxRelay | None = None
+
+def get_outbox_relay() -> OutboxRelay:
+    global outbox_relay
+    if outbox_relay is None:
+        outbox_relay = OutboxRelay()
+    return outbox_relay
@@ -0,0 +1,36 @@
+from uuid import UUID
+
+from infrastructure.repositories.base import BaseRepository
+from schemas.pagination import Page, decode_cursor, encode_cursor
+from schemas.result import Error, GenericResult
+from settings.config import settings
+
+
+async def get_page(
+    repository: BaseRepository,
+    *,
+    cursor: str | None,
+    limit: int,
+    with_total: bool = False,
+) -> GenericResult[Page]:
+    """A keyset page of ``repository`` ordered by id, resumed from ``cursor``."""
+    try:
+        after = None
+        if cursor:
+            (key,) = decode_cursor(cursor)
+            after = UUID(key)
+    except ValueError:
+        return GenericResult.failure(
+            Error(error_code="INVALID_CURSOR", reason="Invalid cursor")
+        )
+    limit = max(1, min(limit, settings.max_page_size))
+    # one extra row tells whether there is a next page
+    items = list(await repository.gets_after(after=after, limit=limit + 1))
+    next_cursor = encode_cursor(items[limit - 1].id) if len(items) > limit else None
+    return GenericResult.success(
+        Page(
+            items=items[:limit],
+            next_cursor=next_cursor,
+            estimated_total=await repository.estimate_count() if with_total else None,
+        )
+    )
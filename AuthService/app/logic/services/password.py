@@ -0,0 +1,108 @@
+from abc import ABC, abstractmethod
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import bcrypt
+
+from infrastructure.metrics.registry import metrics
+from settings.config import settings
+
+
+def hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+
+
+def check_password(password: str, password_hash: str) -> bool:
+    return bcrypt.checkpw(password.encode(), password_hash.encode())
+
+
+@dataclass
+class BasePasswordHasher(ABC):
+    @abstractmethod
+    async def hash(self, password: str) -> str:
+        ...
+
+    @abstractmethod
+    async def verify(self, password: str, password_hash: str) -> bool:
+        ...
+
+    @abstractmethod
+    def shutdown(self) -> None:
+        ...
+
+
+@dataclass
+class PoolPasswordHasher(BasePasswordHasher):
+    """Runs bcrypt in a bounded executor so the event loop never blocks on it."""
+    _executor: Executor
+    _max_workers: int
+    _in_flight: int = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self._in_flight - self._max_workers, 0)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        self._in_flight += 1
+        try:
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(check_password, password, password_hash)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __hash__(self):
+        return hash((self._executor))
+
+    def __eq__(self, other):
+        return hash(self) == hash(other)
+
+
+def create_password_hasher(
+    backend: str = settings.password_hasher_backend,
+    max_workers: int = settings.password_hasher_workers,
+) -> PoolPasswordHasher:
+    executors = {
+        "thread": ThreadPoolExecutor,
+        "process": ProcessPoolExecutor,
+    }
+    executor_class = executors.get(backend)
+    if executor_class is None:
+        raise ValueError(f"Unknown password hasher backend: {backend}")
+    return PoolPasswordHasher(
+        _executor=executor_class(max_workers=max_workers),
+        _max_workers=max_workers,
+    )
+
+
+password_hasher: PoolPasswordHasher | None = None
+
+def get_password_hasher() -> BasePasswordHasher:
+    global password_hasher
+    if password_hasher is None:
+        hasher = create_password_hasher()
+        metrics.gauge("password_hasher_in_flight", lambda: hasher.in_flight)
+        metrics.gauge("password_hasher_queue_depth", lambda: hasher.queue_depth)
+        password_hasher = hasher
+    return password_hasher
+
+
+def shutdown_password_hasher() -> None:
+    global password_hasher
+    if password_hasher is not None:
+        password_hasher.shutdown()
+        password_hasher = None
@@ -1,9 +1,16 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
+from infrastructure.kafka.sender import role_event_message
 from infrastructure.repositories.role import BaseRoleRepository
+from infrastructure.storages.role_stamp import RoleStampStorage
+from logic.services.events import DomainEvents
+from logic.services.pagination import get_page
+from logic.services.user_snapshots import UserSnapshotPublisher
 from logic.unit_of_work.base import BaseUnitOfWork
+from schemas.events import RoleDeletedEventDTO, RoleEventDTO, RoleUpdatedEventDTO
+from schemas.pagination import Page
 from schemas.result import Error, GenericResult
 from schemas.role import RoleCreateDTO, RoleUpdateDTO
 from infrastructure.models.role import Role
@@ -13,7 +20,9 @@ from infrastructure.models.role import Role
 class BaseRoleService(ABC):
     
     @abstractmethod
-    async def get_roles(self, *, skip: int, limit: int) -> list[Role]:
+    async def get_roles(
+        self, *, cursor: str | None, limit: int, with_total: bool = False
+    ) -> GenericResult[Page]:
         ...
         
     @abstractmethod
@@ -38,9 +47,25 @@ class BaseRoleService(ABC):
 class RoleService(BaseRoleService):
     _repository: BaseRoleRepository
     _uow: BaseUnitOfWork
+    _role_stamps: RoleStampStorage | None = None
+    _events: DomainEvents = field(default_factory=DomainEvents)
+    _snapshots: UserSnapshotPublisher | None = None
     
-    async def get_roles(self, *, skip: int, limit: int) -> list[Role]:
-        return await self._repository.gets(skip=skip, limit=limit)
+    async def _stage_event(self, event: RoleEventDTO) -> None:
+        await self._events.stage(role_event_message(event))
+    
+    async def _roles_changed(self, role: Role | None) -> None:
+        await self._repository.evict(role)
+        if self._role_stamps is not None:
+            await self._role_stamps.touch_catalog()
+        await self._events.committed()
+    
+    async def get_roles(
+        self, *, cursor: str | None = None, limit: int = 100, with_total: bool = False
+    ) -> GenericResult[Page]:
+        return await get_page(
+            self._repository, cursor=cursor, limit=limit, with_total=with_total
+        )
     
     async def create_role(self, role: RoleCreateDTO) -> GenericResult[Role]:
         role_db = await self._repository.get_role_by_name(name=role.name)
@@ -50,6 +75,7 @@ class RoleService(BaseRoleService):
         if not role_db:
             role_db = await self._repository.insert(body=role)
             await self._uow.commit()
+            await self._repository.evict(role_db)
             response = GenericResult.success(role_db)
         return response
     
@@ -64,16 +90,36 @@ class RoleService(BaseRoleService):
     async def update_role(
         self, role_id: Any, role_dto: RoleUpdateDTO
     )-> GenericResult[Role]:
-        role = await self._repository.get(id=role_id)
+        role = await self._repository.get_for_update(id=role_id)
         response = GenericResult.failure(
             Error(error_code="ROLE_NOT_FOUND", reason="Role not found")
         )
         if role:
+            await self._repository.evict(role)
             role.update_role(**role_dto.model_dump())
+            await self._stage_event(
+                RoleUpdatedEventDTO(
+                    role_id=role.id, name=role.name, description=role.description
+                )
+            )
             await self._uow.commit()
+            await self._roles_changed(role)
+            if self._snapshots is not None:
+                self._snapshots.republish_in_background(role_id=role.id)
             response = GenericResult.success(role)
         return response
     
     async def delete_role(self, role_id: Any) -> None:
+        role = await self._repository.get(id=role_id)
+        # the memberships are gone with the role, collect them first
+        member_ids = []
+        if self._snapshots is not None and role is not None:
+            member_ids = await self._snapshots.member_ids(role.id)
+        await self._repository.evict(role)
+        if role is not None:
+            await self._stage_event(RoleDeletedEventDTO(role_id=role.id))
         await self._repository.delete(id=role_id)
-        return await self._uow.commit()
\ No newline at end of file
+        await self._uow.commit()
+        await self._roles_changed(role)
+        if member_ids:
+            self._snapshots.republish_in_background(user_ids=member_ids)
\ No newline at end of file
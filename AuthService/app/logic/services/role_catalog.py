@@ -0,0 +1,125 @@
+import asyncio
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Self
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from infrastructure.metrics.registry import metrics
+from infrastructure.models.snapshot import RoleSnapshot
+from settings.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class RoleCatalogSnapshot:
+    """Every role of the system as of ``version``."""
+    version: int
+    by_id: Mapping[UUID, RoleSnapshot]
+    by_name: Mapping[str, RoleSnapshot]
+
+    @classmethod
+    def build(cls, version: int, roles: Iterable[Any]) -> Self:
+        snapshots = [RoleSnapshot.from_model(role) for role in roles]
+        return cls(
+            version=version,
+            by_id=MappingProxyType({role.id: role for role in snapshots}),
+            by_name=MappingProxyType({role.name: role for role in snapshots}),
+        )
+
+    def get(self, id: Any) -> RoleSnapshot | None:
+        try:
+            return self.by_id.get(id if isinstance(id, UUID) else UUID(str(id)))
+        except ValueError:
+            return None
+
+    def roles(self) -> list[RoleSnapshot]:
+        return sorted(self.by_id.values(), key=lambda role: role.name)
+
+
+@dataclass
+class RoleCatalog:
+    """Per-worker copy of the role catalog, reloaded when the version moves.
+
+    Writers bump a counter in Redis and publish it; every worker drops its
+    snapshot once it hears of a newer version and lazily reloads it.
+    """
+    _client: Redis
+    _version_key: str = settings.role_catalog_version_key
+    _channel: str = settings.role_catalog_channel
+    _snapshot: RoleCatalogSnapshot | None = None
+    _seen_version: int = 0
+    _unversioned: int = 0  # invalidations whose version is unknown
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    async def current(
+        self, loader: Callable[[], Awaitable[Iterable[Any]]]
+    ) -> RoleCatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        async with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            # read the version first: a bump racing the load only
+            # makes the snapshot look older than it is
+            unversioned = self._unversioned
+            version = int(await self._client.get(self._version_key) or 0)
+            snapshot = RoleCatalogSnapshot.build(version, await loader())
+            metrics.inc("role_catalog_reloads")
+            if self._seen_version > version or self._unversioned != unversioned:
+                # invalidated mid-load, the rows may predate the bump:
+                # serve them this once but do not keep them
+                metrics.inc("role_catalog_stale_loads")
+                return snapshot
+            self._snapshot = snapshot
+            return snapshot
+
+    def invalidate(self, version: int | None = None) -> None:
+        if version is None:
+            self._unversioned += 1
+        else:
+            self._seen_version = max(self._seen_version, version)
+        snapshot = self._snapshot
+        if snapshot is not None and (version is None or snapshot.version < version):
+            self._snapshot = None
+
+    async def bump(self) -> int:
+        version = await self._client.incr(self._version_key)
+        self.invalidate(version)
+        await self._client.publish(self._channel, version)
+        return version
+
+    async def listen(self) -> None:
+        async with self._client.pubsub() as pubsub:
+            await pubsub.subscribe(self._channel)
+            # a bump may have been missed while unsubscribed
+            self.invalidate()
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                self.invalidate(int(message["data"]))
+
+    async def run(self, retry_delay: float = 1.0) -> None:
+        while True:
+            try:
+                await self.listen()
+            except (ConnectionError, RedisError):
+                self.invalidate()
+                await asyncio.sleep(retry_delay)
+
+    def __hash__(self):
+        return hash((self._client, self._version_key))
+
+    def __eq__(self, other):
+        return hash(self) == hash(other)
+
+
+role_catalog: RoleCatalog | None = None
+
+def get_role_catalog(redis: Redis) -> RoleCatalog:
+    global role_catalog
+    if role_catalog is None:
+        role_catalog = RoleCatalog(_client=redis)
+    return role_catalog
@@ -0,0 +1,113 @@
+import asyncio
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from infrastructure.metrics.registry import metrics
+from settings.config import settings
+
+Loader = Callable[[], Awaitable[Any]]
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class SingleFlight:
+    """Runs one loader per key at a time; concurrent callers await its result."""
+    _calls: dict[str, asyncio.Future] = field(default_factory=dict)
+
+    async def do(self, key: str, loader: Loader, lookup: Loader) -> Any:
+        future = self._calls.get(key)
+        if future is not None:
+            metrics.inc("single_flight_coalesced")
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # the leader was cancelled, not us: load on our own
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.do(key, loader, lookup)
+                raise
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+        self._calls[key] = future
+        metrics.inc("single_flight_leaders")
+        try:
+            result = await self._lead(key, loader, lookup)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._calls.pop(key, None)
+
+    async def _lead(self, key: str, loader: Loader, lookup: Loader) -> Any:
+        return await loader()
+
+
+@dataclass
+class RedisSingleFlight(SingleFlight):
+    """Extends the per-worker coalescing across workers with a Redis lock.
+
+    The lock holder loads and populates the cache; everybody else polls the
+    cache through ``lookup`` until the value shows up or the lock is gone.
+    """
+    _client: Redis | None = None
+    _lock_ttl: float = 5.0
+    _wait_timeout: float = 2.0
+    _poll_interval: float = 0.05
+
+    async def _lead(self, key: str, loader: Loader, lookup: Loader) -> Any:
+        lock_key = f"lock_{key}"
+        token = uuid4().hex
+        if await self._client.set(
+            lock_key, token, nx=True, px=int(self._lock_ttl * 1000)
+        ):
+            try:
+                return await loader()
+            finally:
+                await self._client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        metrics.inc("single_flight_lock_waits")
+        deadline = monotonic() + self._wait_timeout
+        while monotonic() < deadline:
+            await asyncio.sleep(self._poll_interval)
+            value = await lookup()
+            if value is not None:
+                metrics.inc("single_flight_lock_hits")
+                return value
+            if not await self._client.exists(lock_key):
+                break
+        return await loader()
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+single_flight: SingleFlight | None = None
+
+def get_single_flight(redis: Redis) -> SingleFlight:
+    global single_flight
+    if single_flight is None:
+        if settings.cache_single_flight_distributed:
+            single_flight = RedisSingleFlight(
+                _client=redis,
+                _lock_ttl=settings.cache_single_flight_lock_ttl_seconds,
+                _wait_timeout=settings.cache_single_flight_wait_seconds,
+            )
+        else:
+            single_flight = SingleFlight()
+    return single_flight
@@ -1,32 +1,60 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Any, List
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
 
-from aiokafka import AIOKafkaProducer
 from faker import Faker
 
 from settings.config import settings
-from schemas.events import UserRegisteredEventDTO
+from schemas.events import (
+    UserDeletedEventDTO,
+    UserEventDTO,
+    UserRegisteredEventDTO,
+    UserUpdatedEventDTO,
+)
+from infrastructure.kafka.sender import registered_message, user_event_message
 from infrastructure.models.social_account import SocialAccount
+from logic.services.login_history import LoginHistoryWriter
+from logic.services.events import DomainEvents
+from logic.services.pagination import get_page
+from logic.services.user_snapshots import UserSnapshotPublisher
+from logic.services.password import BasePasswordHasher, get_password_hasher
 from logic.unit_of_work.base import BaseUnitOfWork
 from infrastructure.repositories.user import BaseUserRepository
+from infrastructure.models.snapshot import UserSnapshot
 from infrastructure.models.user import User
 from infrastructure.models.user_history import UserHistory
+from schemas.pagination import Page, decode_cursor, encode_cursor
 from schemas.result import Error, GenericResult
 from schemas.social import SocialUser
-from schemas.user import UserCreateDTO, UserHistoryCreateDTO, UserUpdateDTO, UserUpdatePasswordDTO
+from schemas.user import (
+    UserCreateDTO,
+    UserCreateHashedDTO,
+    UserHistoryCreateDTO,
+    UserUpdateDTO,
+    UserUpdatePasswordDTO,
+)
 
 
 @dataclass
 class BaseUserService(ABC):
     @abstractmethod
     async def get_user_history(
-        self, *, user_id: Any, skip: int, limit: int
-    ) -> list[UserHistory]:
+        self,
+        *,
+        user_id: Any,
+        cursor: str | None,
+        limit: int,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> GenericResult[Page]:
         ...
 
     @abstractmethod
-    async def get_users(self, *, skip: int, limit: int) -> list[User]:
+    async def get_users(
+        self, *, cursor: str | None, limit: int, with_total: bool = False
+    ) -> GenericResult[Page]:
         ...
 
     @abstractmethod
@@ -45,14 +73,26 @@ class BaseUserService(ABC):
     ):
         ...
 
+    @abstractmethod
+    async def record_login(self, *, history_row: UserHistoryCreateDTO) -> None:
+        ...
+
     @abstractmethod
     async def get_user(self, *, user_id: Any) -> GenericResult[User]:
         ...
 
+    @abstractmethod
+    async def get_users_by_ids(self, *, user_ids: list[Any]) -> list[User]:
+        ...
+
     @abstractmethod
     async def get_user_by_login(self, *, login: str) -> User | None:
         ...
 
+    @abstractmethod
+    async def get_user_for_login(self, *, login: str) -> UserSnapshot | None:
+        ...
+
     @abstractmethod
     async def get_or_create_user(self, *, social: SocialUser) -> GenericResult[User]:
         ...
@@ -68,33 +108,96 @@ class BaseUserService(ABC):
         ...
         
 
+def _as_utc(moment: datetime | None) -> datetime | None:
+    if moment is None or moment.tzinfo is not None:
+        return moment
+    return moment.replace(tzinfo=UTC)
+
+
 @dataclass
 class UserService(BaseUserService):
     _repository: BaseUserRepository
     _uow: BaseUnitOfWork
+    _password_hasher: BasePasswordHasher = field(default_factory=get_password_hasher)
+    _history_writer: LoginHistoryWriter | None = None
+    _events: DomainEvents = field(default_factory=DomainEvents)
+    _snapshots: UserSnapshotPublisher | None = None
+    
+    async def _stage_registered(self, user_dto: UserCreateDTO) -> None:
+        await self._events.stage(
+            registered_message(
+                UserRegisteredEventDTO(
+                    user_login=user_dto.login,
+                    user_email=user_dto.email,
+                    event="User registered"
+                )
+            )
+        )
     
-    async def get_user_history(self, *, user_id: Any, skip: int = 0, limit: int = 100) -> List[UserHistory]:
-        return await self._repository.get_user_history(
-            user_id=user_id, skip=skip, limit=limit
+    async def _stage_event(self, event: UserEventDTO) -> None:
+        await self._events.stage(user_event_message(event))
+            
+    async def _publish_snapshot(self, user: Any) -> None:
+        if self._snapshots is not None:
+            await self._snapshots.publish(user)
+    
+    async def get_user_history(
+        self,
+        *,
+        user_id: Any,
+        cursor: str | None = None,
+        limit: int = 100,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> GenericResult[Page]:
+        try:
+            after = None
+            if cursor:
+                attempted, history_id = decode_cursor(cursor)
+                after = (datetime.fromisoformat(attempted), UUID(history_id))
+        except ValueError:
+            return GenericResult.failure(
+                Error(error_code="INVALID_CURSOR", reason="Invalid cursor")
+            )
+        limit = max(1, min(limit, settings.max_page_size))
+        items = list(
+            await self._repository.get_user_history(
+                user_id=user_id,
+                after=after,
+                since=_as_utc(since),
+                until=_as_utc(until),
+                limit=limit + 1,
+            )
         )
+        next_cursor = None
+        if len(items) > limit:
+            last = items[limit - 1]
+            next_cursor = encode_cursor(last.attempted.isoformat(), last.id)
+        return GenericResult.success(Page(items=items[:limit], next_cursor=next_cursor))
         
-    async def get_users(self, *, skip : int = 0, limit: int=100) -> List[User]:
-        return await self._repository.gets(skip=skip, limit=limit)
+    async def get_users(
+        self, *, cursor: str | None = None, limit: int = 100, with_total: bool = False
+    ) -> GenericResult[Page]:
+        return await get_page(
+            self._repository, cursor=cursor, limit=limit, with_total=with_total
+        )
     
     async def update_password(
         self, *, user_id: Any, password_user: UserUpdatePasswordDTO
     ) -> GenericResult[User]:
-        user: User = await self._repository.get(id=user_id)
+        user: User = await self._repository.get_for_update(id=user_id)
         if not user:
             return GenericResult.failure(
                 Error(error_code="USER_NOT_FOUND", reason="User not found"),
             )
-        status= user.change_password(
-            old_password=password_user.old_password,
-            new_password=password_user.new_password
-        )
-        if status:
+        if await self._password_hasher.verify(
+            password_user.old_password, user.password
+        ):
+            user.set_password_hash(
+                await self._password_hasher.hash(password_user.new_password)
+            )
             await self._uow.commit()
+            await self._repository.evict(user)
         return GenericResult.success(user)
     
     async def create_user(self, user_dto: UserCreateDTO) -> GenericResult[User]:
@@ -103,26 +206,19 @@ class UserService(BaseUserService):
             Error(error_code="USER_ALREADY_EXISTS", reason="User already exists")
         )
         if not user:
-            user = await self._repository.insert(body=user_dto)
+            password_hash = await self._password_hasher.hash(user_dto.password)
+            user = await self._repository.insert(
+                body=UserCreateHashedDTO(
+                    password_hash=password_hash,
+                    **user_dto.model_dump(exclude={"password"}),
+                )
+            )
+            await self._stage_registered(user_dto)
             await self._uow.commit()
+            await self._repository.evict(user)
             response = GenericResult.success(user)
-            
-            producer = AIOKafkaProducer(
-                bootstrap_servers=settings.kafka_url,
-            )
-            event = UserRegisteredEventDTO(
-                    user_login=user_dto.login,
-                    user_email=user_dto.email,
-                    event="User registered"
-                )
-            await producer.start()
-            try:
-                await producer.send(
-                    'user.registered', 
-                    value=event.model_dump_json().encode('utf-8')
-                )
-            finally:
-                await producer.stop()
+            await self._events.committed()
+            await self._publish_snapshot(user)
             
         return response
     
@@ -136,6 +232,13 @@ class UserService(BaseUserService):
             await self._uow.commit()
         return result
     
+    async def record_login(self, *, history_row: UserHistoryCreateDTO) -> None:
+        if self._history_writer is not None:
+            self._history_writer.submit(history_row)
+            return
+        await self._repository.add_login(data=history_row)
+        await self._uow.commit()
+    
     async def get_user(self, *, user_id: Any) -> GenericResult[User]:
         user = await self._repository.get(id=user_id)
         if not user:
@@ -144,9 +247,15 @@ class UserService(BaseUserService):
             )
         return GenericResult.success(user)
     
+    async def get_users_by_ids(self, *, user_ids: list[Any]) -> list[User]:
+        return await self._repository.get_many(ids=user_ids)
+    
     async def get_user_by_login(self, *, login: str) -> User | None:
         return await self._repository.get_by_login(login=login)
     
+    async def get_user_for_login(self, *, login: str) -> UserSnapshot | None:
+        return await self._repository.get_for_login(login=login)
+    
     async def get_or_create_user(self, *, social: SocialUser) -> GenericResult[User]:
         social_user = await self._repository.get_user_social(
             social_id=social.id, social_name=social.social_name
@@ -163,7 +272,13 @@ class UserService(BaseUserService):
                 password=auto_password,
                 email=social.email
             )
-            user = await self._repository.insert(body=user_dto)
+            password_hash = await self._password_hasher.hash(auto_password)
+            user = await self._repository.insert(
+                body=UserCreateHashedDTO(
+                    password_hash=password_hash,
+                    **user_dto.model_dump(exclude={"password"}),
+                )
+            )
             user.add_social_account(
                 social_account=SocialAccount(
                     user_id=user.id,
@@ -171,25 +286,11 @@ class UserService(BaseUserService):
                     social_name=social.social_name
                 )
             )
+            await self._stage_registered(user_dto)
             await self._uow.commit()
-            
-            
-            producer = AIOKafkaProducer(
-                bootstrap_servers=settings.kafka_url,
-            )
-            event = UserRegisteredEventDTO(
-                    user_login=user_dto.login,
-                    user_email=user_dto.email,
-                    event="User registered"
-                )
-            await producer.start()
-            try:
-                await producer.send(
-                    'user.registered', 
-                    value=event.model_dump_json().encode('utf-8')
-                )
-            finally:
-                await producer.stop()
+            await self._repository.evict(user)
+            await self._events.committed()
+            await self._publish_snapshot(user)
             
             return GenericResult.success(user)
         return await self.get_user(user_id=social_user.user_id)
@@ -197,7 +298,7 @@ class UserService(BaseUserService):
     async def update_user(
         self, user_id: Any, user_dto: UserUpdateDTO
     ) -> GenericResult[User]:
-        user = await self._repository.get(id=user_id)
+        user = await self._repository.get_for_update(id=user_id)
         if not user:
             return GenericResult.failure(
                 Error(
@@ -205,16 +306,33 @@ class UserService(BaseUserService):
                     reason="User not found"
                 )
             )
+        await self._repository.evict(user)
         user.update_personal(**user_dto.model_dump())
+        await self._stage_event(
+            UserUpdatedEventDTO(
+                user_id=user.id, login=user.login, email=user.email, tg_id=user.tg_id
+            )
+        )
         await self._uow.commit()
+        await self._repository.evict(user)
+        await self._events.committed()
+        await self._publish_snapshot(user)
         return GenericResult.success(user)
     
     async def delete_user(self, *, user_id) -> None:
-       await self._repository.delete(id=user_id)
-       return await self._uow.commit()
+        user = await self._repository.get(id=user_id)
+        await self._repository.delete(id=user_id)
+        if user is not None:
+            await self._stage_event(UserDeletedEventDTO(user_id=user.id))
+        await self._uow.commit()
+        await self._repository.evict(user)
+        await self._events.committed()
+        if user is not None:
+            if self._snapshots is not None:
+                await self._snapshots.publish_deleted(user.id)
    
     def __hash__(self):
-        return hash((self._repository, self._uow))
+        return hash((self._repository, self._uow, self._password_hasher))
         
     def __eq__(self, other):
         return hash(self) == hash(other)
\ No newline at end of file
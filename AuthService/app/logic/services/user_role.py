@@ -1,10 +1,19 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
+from infrastructure.kafka.sender import user_event_message
 from infrastructure.repositories.role import BaseRoleRepository
+from infrastructure.storages.role_stamp import RoleStampStorage
+from logic.services.events import DomainEvents
+from logic.services.user_snapshots import UserSnapshotPublisher
 from logic.unit_of_work.base import BaseUnitOfWork
 from infrastructure.repositories.user import BaseUserRepository
+from schemas.events import (
+    UserEventDTO,
+    UserRoleAssignedEventDTO,
+    UserRoleRemovedEventDTO,
+)
 from schemas.result import Error, Result
 
 
@@ -24,9 +33,25 @@ class UserRoleService(BaseUserRoleService):
     _user_repository: BaseUserRepository
     _role_repository: BaseRoleRepository
     _uow: BaseUnitOfWork
+    _role_stamps: RoleStampStorage | None = None
+    _events: DomainEvents = field(default_factory=DomainEvents)
+    _snapshots: UserSnapshotPublisher | None = None
+    
+    async def _roles_changed(self, user: Any, event: UserEventDTO | None) -> None:
+        await self._user_repository.evict(user)
+        if self._role_stamps is not None:
+            await self._role_stamps.touch_user(user_id=user.id)
+        if event is None:
+            return
+        await self._events.committed()
+        if self._snapshots is not None:
+            # the role change expired user.roles, read them back
+            await self._snapshots.publish(
+                await self._user_repository.get_for_update(id=user.id)
+            )
     
     async def assign_role_to_user(self, user_id: Any, role_id: Any) -> Result:
-        user = await self._user_repository.get(id=user_id)
+        user = await self._user_repository.get_for_update(id=user_id)
         role = await self._role_repository.get(id=role_id)
         if not user:
             return Result.failure(
@@ -36,12 +61,19 @@ class UserRoleService(BaseUserRoleService):
             return Result.failure(
                 Error(error_code="ROLE_NOT_FOUND", reason="Role not found")
             )
-        user.assign_role(role)
+        event = None
+        if not user.has_role(role.name):
+            await self._user_repository.add_role(user=user, role_id=role.id)
+            event = UserRoleAssignedEventDTO(
+                user_id=user.id, role_id=role.id, role_name=role.name
+            )
+            await self._events.stage(user_event_message(event))
         await self._uow.commit()
+        await self._roles_changed(user, event)
         return Result.success()
         
     async def remove_role_from_user(self, user_id: Any, role_id: Any) -> Result:
-        user = await self._user_repository.get(id=user_id)
+        user = await self._user_repository.get_for_update(id=user_id)
         role = await self._role_repository.get(id=role_id)
         if not user:
             return Result.failure(
@@ -51,6 +83,13 @@ class UserRoleService(BaseUserRoleService):
             return Result.failure(
                 Error(error_code="ROLE_NOT_FOUND", reason="Role not found")
             )
-        user.remove_role(role)
+        event = None
+        if user.has_role(role.name):
+            await self._user_repository.remove_role(user=user, role_id=role.id)
+            event = UserRoleRemovedEventDTO(
+                user_id=user.id, role_id=role.id, role_name=role.name
+            )
+            await self._events.stage(user_event_message(event))
         await self._uow.commit()
+        await self._roles_changed(user, event)
         return Result.success()
\ No newline at end of file
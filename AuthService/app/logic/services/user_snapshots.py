@@ -0,0 +1,103 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from infrastructure.database.postgres import async_session
+from infrastructure.kafka.sender import BaseSender
+from infrastructure.metrics.registry import metrics
+from infrastructure.models.role import Role
+from infrastructure.models.user import User
+from infrastructure.models.user_role import UserRole
+from schemas.user import UserDTO
+from settings.config import settings
+
+
+republish_tasks: set[asyncio.Task] = set()
+
+def _republish_done(task: asyncio.Task) -> None:
+    republish_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        metrics.inc("user_snapshot_republish_errors")
+
+
+@dataclass
+class UserSnapshotPublisher:
+    """Keeps the compacted user-snapshot topic in step with the users table.
+
+    Every change to a user publishes its full ``UserDTO``; a deletion
+    publishes a tombstone. ``backfill`` walks the table in id order and
+    publishes every user, which is how the topic is bootstrapped.
+    """
+    _sender: BaseSender
+    _session_factory: Callable[[], AsyncSession] = async_session
+    _batch_size: int = settings.user_snapshot_batch_size
+    
+    async def publish(self, user: Any) -> None:
+        await self._sender.send_user_snapshot(
+            user.id, UserDTO.model_validate(user, from_attributes=True)
+        )
+        
+    async def publish_deleted(self, user_id: Any) -> None:
+        await self._sender.send_user_snapshot(user_id, None)
+        
+    async def member_ids(self, role_id: Any) -> list[Any]:
+        async with self._session_factory() as session:
+            statement = select(UserRole.user_id).where(UserRole.role_id == role_id)
+            return list((await session.scalars(statement)).all())
+        
+    async def _users(self, statement) -> list[User]:
+        # a short session per batch: no connection is held while publishing
+        async with self._session_factory() as session:
+            return list(
+                (await session.scalars(statement.options(selectinload(User.roles)))).all()
+            )
+        
+    async def _publish_batch(self, users: list[User]) -> int:
+        for user in users:
+            await self.publish(user)
+        metrics.inc("user_snapshots_published", len(users))
+        return len(users)
+        
+    async def backfill(
+        self, *, role_id: Any | None = None, user_ids: list[Any] | None = None
+    ) -> int:
+        """Publishes every user, or only the members of ``role_id`` / ``user_ids``."""
+        published = 0
+        if user_ids is not None:
+            # one chunk per query keeps the bind parameters bounded
+            for start in range(0, len(user_ids), self._batch_size):
+                chunk = user_ids[start:start + self._batch_size]
+                published += await self._publish_batch(
+                    await self._users(select(User).where(User.id.in_(chunk)))
+                )
+            return published
+        after = None
+        while True:
+            statement = select(User).order_by(User.id).limit(self._batch_size)
+            if after is not None:
+                statement = statement.where(User.id > after)
+            if role_id is not None:
+                statement = statement.where(User.roles.any(Role.id == role_id))
+            users = await self._users(statement)
+            published += await self._publish_batch(users)
+            if len(users) < self._batch_size:
+                return published
+            after = users[-1].id
+            
+    def republish_in_background(
+        self, *, role_id: Any | None = None, user_ids: list[Any] | None = None
+    ) -> None:
+        """Republishes the users a role change touched, off the request path."""
+        task = asyncio.create_task(self.backfill(role_id=role_id, user_ids=user_ids))
+        republish_tasks.add(task)
+        task.add_done_callback(_republish_done)
+        
+    def __hash__(self):
+        return hash((id(self._sender), self._batch_size))
+    
+    def __eq__(self, other):
+        return hash(self) == hash(other)
@@ -1,7 +1,62 @@
-from pydantic import BaseModel, EmailStr
+from datetime import UTC, datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, EmailStr, Field
 
 
 class UserRegisteredEventDTO(BaseModel):
     user_login: str
     user_email: EmailStr | None = None
-    event: str = "User registered"
\ No newline at end of file
+    event: str = "User registered"
+    
+    
+class UserEventDTO(BaseModel):
+    """A change to one user, published keyed by ``user_id``."""
+    event: str
+    user_id: UUID
+    occurred: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    
+    
+class UserUpdatedEventDTO(UserEventDTO):
+    event: Literal["user.updated"] = "user.updated"
+    login: str
+    email: EmailStr | None = None
+    tg_id: str | None = None
+    
+    
+class UserDeletedEventDTO(UserEventDTO):
+    event: Literal["user.deleted"] = "user.deleted"
+    
+    
+class UserRoleAssignedEventDTO(UserEventDTO):
+    event: Literal["user.role_assigned"] = "user.role_assigned"
+    role_id: UUID
+    role_name: str
+    
+    
+class UserRoleRemovedEventDTO(UserEventDTO):
+    event: Literal["user.role_removed"] = "user.role_removed"
+    role_id: UUID
+    role_name: str
+    
+    
+class UserLoggedOutEventDTO(UserEventDTO):
+    event: Literal["user.logged_out"] = "user.logged_out"
+    
+    
+class RoleEventDTO(BaseModel):
+    """A change to one role, published keyed by ``role_id``."""
+    event: str
+    role_id: UUID
+    occurred: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    
+    
+class RoleUpdatedEventDTO(RoleEventDTO):
+    event: Literal["role.updated"] = "role.updated"
+    name: str
+    description: str | None = None
+    
+    
+class RoleDeletedEventDTO(RoleEventDTO):
+    event: Literal["role.deleted"] = "role.deleted"
@@ -0,0 +1,33 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from typing import Any, Generic, TypeVar
+
+import orjson
+from pydantic import BaseModel
+
+ItemType = TypeVar("ItemType")
+
+
+def encode_cursor(*keys: Any) -> str:
+    return urlsafe_b64encode(orjson.dumps([str(key) for key in keys])).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> list[str]:
+    """The keys encoded in ``cursor``, ValueError when it was not issued by us."""
+    try:
+        payload = orjson.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (Base64Error, orjson.JSONDecodeError, UnicodeEncodeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if (
+        not isinstance(payload, list)
+        or not payload
+        or not all(isinstance(key, str) for key in payload)
+    ):
+        raise ValueError("Malformed cursor")
+    return payload
+
+
+class Page(BaseModel, Generic[ItemType]):
+    items: list[ItemType]
+    next_cursor: str | None = None
+    estimated_total: int | None = None
@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from schemas.user import UserDTO
+from settings.config import settings
 
 class Token(BaseModel):
     access_token: str | None
@@ -9,4 +12,14 @@ class TokenJTI(BaseModel):
     refresh_token_jti: str | None
     
 class TokenValidation(BaseModel):
-    access_token: str
\ No newline at end of file
+    access_token: str
+    
+class TokenBatchValidation(BaseModel):
+    access_tokens: list[str] = Field(
+        min_length=1, max_length=settings.introspection_max_batch_size
+    )
+    
+class TokenIntrospection(BaseModel):
+    active: bool
+    error_code: str | None = None
+    user: UserDTO | None = None
\ No newline at end of file
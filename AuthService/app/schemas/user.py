@@ -19,6 +19,12 @@ class UserCreateDTO(BaseModel):
     email: EmailStr | None = None
     tg_id: str | None = None
 
+class UserCreateHashedDTO(BaseModel):
+    login: str
+    password_hash: str
+    email: EmailStr | None = None
+    tg_id: str | None = None
+
 class UserUpdateDTO(BaseModel):
     login: str | None = None
     email: EmailStr | None = None
@@ -18,6 +18,26 @@ class Settings(BaseSettings):
         alias="BASE_DIR",
         json_schema_extra={"env": "BASE_DIR"},
     )
+    login_history_buffered: bool = Field(
+        True,
+        alias="LOGIN_HISTORY_BUFFERED",
+        json_schema_extra={"env": "LOGIN_HISTORY_BUFFERED"},
+    )
+    login_history_queue_size: int = Field(
+        10000,
+        alias="LOGIN_HISTORY_QUEUE_SIZE",
+        json_schema_extra={"env": "LOGIN_HISTORY_QUEUE_SIZE"},
+    )
+    login_history_batch_size: int = Field(
+        500,
+        alias="LOGIN_HISTORY_BATCH_SIZE",
+        json_schema_extra={"env": "LOGIN_HISTORY_BATCH_SIZE"},
+    )
+    login_history_flush_seconds: float = Field(
+        1.0,
+        alias="LOGIN_HISTORY_FLUSH_SECONDS",
+        json_schema_extra={"env": "LOGIN_HISTORY_FLUSH_SECONDS"},
+    )
     authjwt_secret_key: str = Field(
         "secret",
         alias="AUTHJWT_SECRET_KEY",
@@ -50,6 +70,41 @@ class Settings(BaseSettings):
         alias="REFRESH_EXPIRATION_SECONDS",
         json_schema_extra={"env": "REFRESH_EXPIRATION_SECONDS"},
     )
+    revocation_stream: str = Field(
+        "token_revocations",
+        alias="REVOCATION_STREAM",
+        json_schema_extra={"env": "REVOCATION_STREAM"},
+    )
+    revocation_max_staleness_seconds: float = Field(
+        2.0,
+        alias="REVOCATION_MAX_STALENESS_SECONDS",
+        json_schema_extra={"env": "REVOCATION_MAX_STALENESS_SECONDS"},
+    )  # older filters fall back to a Redis GET per check
+    jwt_keys_dir: str | None = Field(
+        None,
+        alias="JWT_KEYS_DIR",
+        json_schema_extra={"env": "JWT_KEYS_DIR"},
+    )  # <kid>.pem files, RSA/Ed25519/EC; HS256 with the secret key if unset
+    jwt_active_kid: str | None = Field(
+        None,
+        alias="JWT_ACTIVE_KID",
+        json_schema_extra={"env": "JWT_ACTIVE_KID"},
+    )  # defaults to the last private key by name
+    jwks_max_age_seconds: int = Field(
+        300,
+        alias="JWKS_MAX_AGE_SECONDS",
+        json_schema_extra={"env": "JWKS_MAX_AGE_SECONDS"},
+    )
+    auth_roles_strategy: str = Field(
+        "stamp",
+        alias="AUTH_ROLES_STRATEGY",
+        json_schema_extra={"env": "AUTH_ROLES_STRATEGY"},
+    )  # token | stamp | database
+    introspection_max_batch_size: int = Field(
+        500,
+        alias="INTROSPECTION_MAX_BATCH_SIZE",
+        json_schema_extra={"env": "INTROSPECTION_MAX_BATCH_SIZE"},
+    )
     
     social_auth_redirect_url: str = Field(
         "http://localhost:8000/auth/redirect",
@@ -66,6 +121,101 @@ class Settings(BaseSettings):
         alias="REDIS_PASSWORD",
         json_schema_extra={"env": "REDIS_PASSWORD"},
     )
+    redis_maxmemory: str | None = Field(
+        None,
+        alias="REDIS_MAXMEMORY",
+        json_schema_extra={"env": "REDIS_MAXMEMORY"},
+    )  # e.g. 256mb, unset keeps the server configuration
+    redis_maxmemory_policy: str = Field(
+        "volatile-lru",
+        alias="REDIS_MAXMEMORY_POLICY",
+        json_schema_extra={"env": "REDIS_MAXMEMORY_POLICY"},
+    )  # revoked token jtis are volatile keys too, size maxmemory accordingly
+    cache_user_ttl_seconds: int = Field(
+        300,
+        alias="CACHE_USER_TTL_SECONDS",
+        json_schema_extra={"env": "CACHE_USER_TTL_SECONDS"},
+    )
+    cache_role_ttl_seconds: int = Field(
+        3600,
+        alias="CACHE_ROLE_TTL_SECONDS",
+        json_schema_extra={"env": "CACHE_ROLE_TTL_SECONDS"},
+    )
+    cache_user_xfetch_beta: float = Field(
+        1.0,
+        alias="CACHE_USER_XFETCH_BETA",
+        json_schema_extra={"env": "CACHE_USER_XFETCH_BETA"},
+    )  # early refresh eagerness, 0 disables
+    cache_role_xfetch_beta: float = Field(
+        1.0,
+        alias="CACHE_ROLE_XFETCH_BETA",
+        json_schema_extra={"env": "CACHE_ROLE_XFETCH_BETA"},
+    )
+    cache_codec: str = Field(
+        "orjson",
+        alias="CACHE_CODEC",
+        json_schema_extra={"env": "CACHE_CODEC"},
+    )  # orjson | msgpack
+    cache_schema_version: int = Field(
+        2,
+        alias="CACHE_SCHEMA_VERSION",
+        json_schema_extra={"env": "CACHE_SCHEMA_VERSION"},
+    )  # bump when cached snapshots change shape, 0-255
+    cache_negative_ttl_seconds: int = Field(
+        30,
+        alias="CACHE_NEGATIVE_TTL_SECONDS",
+        json_schema_extra={"env": "CACHE_NEGATIVE_TTL_SECONDS"},
+    )  # 0 disables caching of lookups that found nothing
+    cache_local_user_max_size: int = Field(
+        10000,
+        alias="CACHE_LOCAL_USER_MAX_SIZE",
+        json_schema_extra={"env": "CACHE_LOCAL_USER_MAX_SIZE"},
+    )
+    cache_local_user_ttl_seconds: float = Field(
+        5,
+        alias="CACHE_LOCAL_USER_TTL_SECONDS",
+        json_schema_extra={"env": "CACHE_LOCAL_USER_TTL_SECONDS"},
+    )
+    cache_local_role_max_size: int = Field(
+        1000,
+        alias="CACHE_LOCAL_ROLE_MAX_SIZE",
+        json_schema_extra={"env": "CACHE_LOCAL_ROLE_MAX_SIZE"},
+    )
+    cache_local_role_ttl_seconds: float = Field(
+        60,
+        alias="CACHE_LOCAL_ROLE_TTL_SECONDS",
+        json_schema_extra={"env": "CACHE_LOCAL_ROLE_TTL_SECONDS"},
+    )
+    cache_single_flight_distributed: bool = Field(
+        False,
+        alias="CACHE_SINGLE_FLIGHT_DISTRIBUTED",
+        json_schema_extra={"env": "CACHE_SINGLE_FLIGHT_DISTRIBUTED"},
+    )
+    cache_single_flight_lock_ttl_seconds: float = Field(
+        5,
+        alias="CACHE_SINGLE_FLIGHT_LOCK_TTL_SECONDS",
+        json_schema_extra={"env": "CACHE_SINGLE_FLIGHT_LOCK_TTL_SECONDS"},
+    )
+    cache_single_flight_wait_seconds: float = Field(
+        2,
+        alias="CACHE_SINGLE_FLIGHT_WAIT_SECONDS",
+        json_schema_extra={"env": "CACHE_SINGLE_FLIGHT_WAIT_SECONDS"},
+    )
+    cache_invalidation_channel: str = Field(
+        "cache.invalidate",
+        alias="CACHE_INVALIDATION_CHANNEL",
+        json_schema_extra={"env": "CACHE_INVALIDATION_CHANNEL"},
+    )
+    role_catalog_version_key: str = Field(
+        "role_catalog_version",
+        alias="ROLE_CATALOG_VERSION_KEY",
+        json_schema_extra={"env": "ROLE_CATALOG_VERSION_KEY"},
+    )
+    role_catalog_channel: str = Field(
+        "role_catalog.version",
+        alias="ROLE_CATALOG_CHANNEL",
+        json_schema_extra={"env": "ROLE_CATALOG_CHANNEL"},
+    )
     rate_limit_requests_per_interval: int = Field(
         1,
         alias="RATE_LIMIT_REQUESTS_PER_INTERVAL",
@@ -76,11 +226,107 @@ class Settings(BaseSettings):
         alias="REQUESTS_INTERVAL",
         json_schema_extra={"env": "REQUESTS_INTERVAL"},
     )
+    max_page_size: int = Field(
+        100,
+        alias="MAX_PAGE_SIZE",
+        json_schema_extra={"env": "MAX_PAGE_SIZE"},
+    )
+    password_hasher_backend: str = Field(
+        "thread",
+        alias="PASSWORD_HASHER_BACKEND",
+        json_schema_extra={"env": "PASSWORD_HASHER_BACKEND"},
+    )  # thread | process
+    password_hasher_workers: int = Field(
+        4,
+        alias="PASSWORD_HASHER_WORKERS",
+        json_schema_extra={"env": "PASSWORD_HASHER_WORKERS"},
+    )
     kafka_url: str = Field(
         "kafka:29092",
         alias="KAFKA_URL",
         json_schema_extra={"env": "KAFKA_URL"},
     )
+    kafka_linger_ms: int = Field(
+        5,
+        alias="KAFKA_LINGER_MS",
+        json_schema_extra={"env": "KAFKA_LINGER_MS"},
+    )
+    kafka_max_batch_size: int = Field(
+        16384,
+        alias="KAFKA_MAX_BATCH_SIZE",
+        json_schema_extra={"env": "KAFKA_MAX_BATCH_SIZE"},
+    )
+    kafka_compression_type: str | None = Field(
+        None,
+        alias="KAFKA_COMPRESSION_TYPE",
+        json_schema_extra={"env": "KAFKA_COMPRESSION_TYPE"},
+    )
+    kafka_acks: str = Field(
+        "1",
+        alias="KAFKA_ACKS",
+        json_schema_extra={"env": "KAFKA_ACKS"},
+    )
+    user_snapshots_enabled: bool = Field(
+        True,
+        alias="USER_SNAPSHOTS_ENABLED",
+        json_schema_extra={"env": "USER_SNAPSHOTS_ENABLED"},
+    )
+    user_snapshot_batch_size: int = Field(
+        1000,
+        alias="USER_SNAPSHOT_BATCH_SIZE",
+        json_schema_extra={"env": "USER_SNAPSHOT_BATCH_SIZE"},
+    )
+    user_snapshot_topic_partitions: int = Field(
+        6,
+        alias="USER_SNAPSHOT_TOPIC_PARTITIONS",
+        json_schema_extra={"env": "USER_SNAPSHOT_TOPIC_PARTITIONS"},
+    )
+    user_snapshot_topic_replication: int = Field(
+        1,
+        alias="USER_SNAPSHOT_TOPIC_REPLICATION",
+        json_schema_extra={"env": "USER_SNAPSHOT_TOPIC_REPLICATION"},
+    )
+    kafka_send_queued: bool = Field(
+        False,
+        alias="KAFKA_SEND_QUEUED",
+        json_schema_extra={"env": "KAFKA_SEND_QUEUED"},
+    )
+    kafka_queue_size: int = Field(
+        10000,
+        alias="KAFKA_QUEUE_SIZE",
+        json_schema_extra={"env": "KAFKA_QUEUE_SIZE"},
+    )
+    # block | drop_oldest | spill
+    kafka_overflow_policy: str = Field(
+        "drop_oldest",
+        alias="KAFKA_OVERFLOW_POLICY",
+        json_schema_extra={"env": "KAFKA_OVERFLOW_POLICY"},
+    )
+    kafka_spill_dir: str = Field(
+        "/tmp/auth_kafka_spill",
+        alias="KAFKA_SPILL_DIR",
+        json_schema_extra={"env": "KAFKA_SPILL_DIR"},
+    )
+    kafka_drain_seconds: float = Field(
+        5.0,
+        alias="KAFKA_DRAIN_SECONDS",
+        json_schema_extra={"env": "KAFKA_DRAIN_SECONDS"},
+    )
+    outbox_enabled: bool = Field(
+        True,
+        alias="OUTBOX_ENABLED",
+        json_schema_extra={"env": "OUTBOX_ENABLED"},
+    )
+    outbox_batch_size: int = Field(
+        500,
+        alias="OUTBOX_BATCH_SIZE",
+        json_schema_extra={"env": "OUTBOX_BATCH_SIZE"},
+    )
+    outbox_poll_seconds: float = Field(
+        1.0,
+        alias="OUTBOX_POLL_SECONDS",
+        json_schema_extra={"env": "OUTBOX_POLL_SECONDS"},
+    )
     
     yandex_client_id: str = Field(
         "<client_id>",
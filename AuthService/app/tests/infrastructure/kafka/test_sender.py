@@ -0,0 +1,234 @@
+import asyncio
+
+import pytest
+
+from infrastructure.kafka import sender as kafka_sender
+from infrastructure.kafka.sender import (
+    BaseSender,
+    KafkaSender,
+    OverflowPolicy,
+    QueuedSender,
+)
+from infrastructure.metrics.registry import metrics
+from schemas.events import UserRegisteredEventDTO
+
+
+class FakeProducer:
+    def __init__(self):
+        self.sent = []
+        self.deliveries = []
+        
+    async def send(self, topic, value=None, key=None):
+        self.sent.append((topic, value, key))
+        delivery = asyncio.get_running_loop().create_future()
+        self.deliveries.append(delivery)
+        return delivery
+
+
+class RecordingSender(BaseSender):
+    def __init__(self):
+        self.sent = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        
+    async def ready(self):
+        await self.gate.wait()
+        
+    async def send(self, topic, value, key=None):
+        self.sent.append(value)
+
+
+def registered() -> UserRegisteredEventDTO:
+    return UserRegisteredEventDTO(
+        user_login="kafka", user_email=None, event="User registered"
+    )
+
+
+@pytest.mark.asyncio
+async def test_send_does_not_wait_for_delivery():
+    producer = FakeProducer()
+    kafka_sender.producer_ready.set()
+    try:
+        before = metrics.snapshot()
+        await KafkaSender(_producer=producer).send_on_register(registered())
+        
+        assert producer.sent[0][0] == "user.registered"
+        assert not producer.deliveries[0].done()
+        
+        producer.deliveries[0].set_result(None)
+        await asyncio.sleep(0)
+        after = metrics.snapshot()
+        assert after["kafka_events_sent"] == before.get("kafka_events_sent", 0) + 1
+        assert after["kafka_delivery_latency_ms_count"] >= 1
+    finally:
+        kafka_sender.producer_ready.clear()
+
+
+@pytest.mark.asyncio
+async def test_send_drops_until_producer_started():
+    producer = FakeProducer()
+    before = metrics.snapshot().get("kafka_events_dropped", 0)
+    
+    await KafkaSender(_producer=producer).send_on_register(registered())
+    
+    assert producer.sent == []
+    assert metrics.snapshot()["kafka_events_dropped"] == before + 1
+
+
+@pytest.mark.asyncio
+async def test_queued_send_returns_before_publishing():
+    inner = RecordingSender()
+    sender = QueuedSender(_sender=inner, _max_size=10)
+    
+    await sender.send("topic", b"0")
+    assert inner.sent == []
+    
+    sender.close()
+    await sender.run()
+    assert inner.sent == [b"0"]
+
+
+class FailingOnceSender(RecordingSender):
+    async def send(self, topic, value, key=None):
+        if not self.sent:
+            self.sent.append(None)
+            raise RuntimeError("serializer bug")
+        await super().send(topic, value, key)
+
+
+@pytest.mark.asyncio
+async def test_queued_sender_survives_send_errors():
+    inner = FailingOnceSender()
+    sender = QueuedSender(_sender=inner, _max_size=10)
+    errors = metrics.counter("kafka_send_errors")
+    await sender.send("topic", b"0")
+    await sender.send("topic", b"1")
+    
+    sender.close()
+    await sender.run()
+    assert inner.sent == [None, b"1"]
+    assert metrics.counter("kafka_send_errors") == errors + 1
+
+
+@pytest.mark.asyncio
+async def test_queued_send_drops_oldest_when_full():
+    inner = RecordingSender()
+    sender = QueuedSender(
+        _sender=inner, _max_size=2, _overflow=OverflowPolicy.DROP_OLDEST
+    )
+    before = metrics.snapshot().get("kafka_events_dropped", 0)
+    for number in range(3):
+        await sender.send("topic", b"%d" % number)
+        
+    sender.close()
+    await sender.run()
+    assert inner.sent == [b"1", b"2"]
+    assert metrics.snapshot()["kafka_events_dropped"] == before + 1
+
+
+@pytest.mark.asyncio
+async def test_queued_send_blocks_when_full():
+    inner = RecordingSender()
+    sender = QueuedSender(_sender=inner, _max_size=1, _overflow=OverflowPolicy.BLOCK)
+    await sender.send("topic", b"0")
+    
+    blocked = asyncio.create_task(sender.send("topic", b"1"))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+    
+    publisher = asyncio.create_task(sender.run())
+    await blocked
+    sender.close()
+    await publisher
+    assert inner.sent == [b"0", b"1"]
+
+
+@pytest.mark.asyncio
+async def test_queued_send_spills_and_replays(tmp_path):
+    inner = RecordingSender()
+    inner.gate.clear()
+    sender = QueuedSender(
+        _sender=inner,
+        _max_size=1,
+        _overflow=OverflowPolicy.SPILL,
+        _spill_dir=str(tmp_path),
+    )
+    for number in range(3):
+        await sender.send("topic", b"%d" % number)
+    assert len(list(tmp_path.iterdir())) == 1
+    
+    publisher = asyncio.create_task(sender.run())
+    inner.gate.set()
+    while len(inner.sent) < 3:
+        await asyncio.sleep(0)
+    sender.close()
+    await publisher
+    assert inner.sent == [b"0", b"1", b"2"]
+    assert list(tmp_path.iterdir()) == []
+
+
+class SteppingSender(RecordingSender):
+    """Publishes one message each time the gate is opened."""
+    async def send(self, topic, value, key=None):
+        await super().send(topic, value, key)
+        self.gate.clear()
+
+
+@pytest.mark.asyncio
+async def test_queued_send_keeps_order_after_spilling(tmp_path):
+    inner = SteppingSender()
+    inner.gate.clear()
+    sender = QueuedSender(
+        _sender=inner,
+        _max_size=1,
+        _overflow=OverflowPolicy.SPILL,
+        _spill_dir=str(tmp_path),
+    )
+    publisher = asyncio.create_task(sender.run())
+    await sender.send("topic", b"v0", b"user")
+    await asyncio.sleep(0)
+    await sender.send("topic", b"v1", b"user")
+    await sender.send("topic", b"v1-update", b"user")
+    
+    inner.gate.set()
+    while sender.queue_depth:
+        await asyncio.sleep(0)
+    # v1 is being published and the queue has room again, but the
+    # tombstone must not overtake the spilled v1-update
+    await sender.send("topic", None, b"user")
+    
+    while len(inner.sent) < 4:
+        inner.gate.set()
+        await asyncio.sleep(0)
+    sender.close()
+    inner.gate.set()
+    await publisher
+    assert inner.sent == [b"v0", b"v1", b"v1-update", None]
+
+
+@pytest.mark.asyncio
+async def test_queued_send_spills_what_is_left_on_shutdown(tmp_path):
+    inner = RecordingSender()
+    inner.gate.clear()
+    sender = QueuedSender(
+        _sender=inner, _max_size=1, _overflow=OverflowPolicy.SPILL, _spill_dir=str(tmp_path)
+    )
+    publisher = asyncio.create_task(sender.run())
+    await sender.send("topic", b"0")
+    await asyncio.sleep(0)
+    # 0 is being published, 1 is queued, 2 and 3 are spilled
+    for number in range(1, 4):
+        await sender.send("topic", b"%d" % number)
+    sender.close()
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(publisher, 0.05)
+    
+    replayer = QueuedSender(
+        _sender=RecordingSender(), _overflow=OverflowPolicy.SPILL, _spill_dir=str(tmp_path)
+    )
+    publisher = asyncio.create_task(replayer.run())
+    await asyncio.sleep(0.01)
+    replayer.close()
+    await publisher
+    # what was in flight or queued is older than what was spilled
+    assert replayer._sender.sent == [b"0", b"1", b"2", b"3"]
@@ -0,0 +1,44 @@
+from dataclasses import FrozenInstanceError
+from uuid import UUID, uuid4
+
+import pytest
+
+from infrastructure.models.role import Role
+from infrastructure.models.snapshot import RoleSnapshot, UserSnapshot, to_snapshot
+from infrastructure.models.user import User
+
+
+def test_user_snapshot_from_model():
+    user = User(login="johndoe", password_hash="hash", email="john@example.com")
+    role = Role(name="admin", description="Admin role")
+    role.id = uuid4()
+    user.roles.append(role)
+    
+    snapshot = to_snapshot(user)
+    assert isinstance(snapshot, UserSnapshot)
+    assert snapshot.id == user.id
+    assert snapshot.password == "hash"
+    assert snapshot.roles == (RoleSnapshot(id=role.id, name="admin", description="Admin role"),)
+    assert snapshot.has_role("admin")
+    assert not snapshot.has_role("user")
+    
+    
+def test_user_snapshot_from_dict():
+    user_id, role_id = uuid4(), uuid4()
+    snapshot = UserSnapshot(
+        id=str(user_id),
+        login="johndoe",
+        password="hash",
+        roles=[{"id": str(role_id), "name": "admin", "description": None}],
+    )
+    assert snapshot.id == user_id
+    assert isinstance(snapshot.roles[0].id, UUID)
+    assert snapshot.role_names == frozenset({"admin"})
+    assert UserSnapshot(**snapshot.to_dict()) == snapshot
+    
+    
+def test_snapshot_is_frozen():
+    snapshot = RoleSnapshot(id=uuid4(), name="admin")
+    with pytest.raises(FrozenInstanceError):
+        snapshot.name = "user"
+    assert not hasattr(snapshot, "__dict__")
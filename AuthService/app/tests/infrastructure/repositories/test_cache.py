@@ -4,8 +4,10 @@ from redis.asyncio import Redis
 
 from schemas.user import UserCreateDTO
 from logic.services.cache import RedisCacheService
+from infrastructure.models.snapshot import UserSnapshot
 from infrastructure.models.user import User
 from infrastructure.repositories.cache import PostgresCacheRepository
+from infrastructure.repositories.user import PostgresCacheUserRepository
 
 
 @pytest.mark.asyncio
@@ -17,7 +19,7 @@ async def test_user_insert_get(db_session: AsyncSession, redis_client: Redis):
                 _model=User,
                 _cache_service=RedisCacheService(
                     _client=client,
-                    _model=User
+                    _model=UserSnapshot
                 )
             )
             user = await repository.insert(body=UserCreateDTO(login="johndoe", password="password", email="john@example.com"))     
@@ -38,7 +40,7 @@ async def test_user_insert_get(db_session: AsyncSession, redis_client: Redis):
                 _model=User,
                 _cache_service=RedisCacheService(
                     _client=client,
-                    _model=User
+                    _model=UserSnapshot
                 )
             )
             user = await repository.insert(body=UserCreateDTO(login="johndoe", password="password", email="john@example.com"))     
@@ -58,7 +60,7 @@ async def test_user_insert_delete_get(db_session: AsyncSession, redis_client: Re
                 _model=User,
                 _cache_service=RedisCacheService(
                     _client=client,
-                    _model=User
+                    _model=UserSnapshot
                 )
             )
             user = await repository.insert(body=UserCreateDTO(login="johndoe", password="password", email="john@example.com"))     
@@ -82,7 +84,7 @@ async def test_user_insert_gets(db_session: AsyncSession, redis_client: Redis):
                 _model=User,
                 _cache_service=RedisCacheService(
                     _client=client,
-                    _model=User
+                    _model=UserSnapshot
                 )
             )
         
@@ -96,4 +98,56 @@ async def test_user_insert_gets(db_session: AsyncSession, redis_client: Redis):
             u = await repository.gets(skip = 0)
             assert len(u) == 3
             
-            assert u[2].id == user3.id
\ No newline at end of file
+            assert u[2].id == user3.id
+
+
+@pytest.mark.asyncio
+async def test_user_read_through_evict(db_session: AsyncSession, redis_client: Redis):
+    async with db_session as session:
+        async with redis_client as client:
+            repository = PostgresCacheUserRepository(
+                _session=session,
+                _cache_service=RedisCacheService(
+                    _client=client,
+                    _model=UserSnapshot,
+                    _ttl=60,
+                )
+            )
+            user = await repository.insert(body=UserCreateDTO(login="cached", password="password"))
+            await session.flush()
+            
+            u = await repository.get_by_login(login="cached")
+            assert u.id == user.id
+            assert await client.exists(f"User_{user.id}") == 0
+            assert await client.ttl("User_login_cached") > 0
+            
+            u = await repository.get_by_login(login="cached")
+            assert isinstance(u, UserSnapshot)
+            assert u.id == user.id
+            
+            u = await repository.get(id=user.id)
+            u = await repository.get(id=user.id)
+            assert isinstance(u, UserSnapshot)
+            
+            await repository.evict(u)
+            assert await client.exists(f"User_{user.id}", "User_login_cached") == 0
+
+
+@pytest.mark.asyncio
+async def test_user_negative_cache(db_session: AsyncSession, redis_client: Redis):
+    async with db_session as session:
+        async with redis_client as client:
+            repository = PostgresCacheUserRepository(
+                _session=session,
+                _cache_service=RedisCacheService(_client=client, _model=UserSnapshot)
+            )
+            assert await repository.get_by_login(login="ghost") is None
+            assert await client.ttl("User_login_ghost") > 0
+            assert await repository.get_by_login(login="ghost") is None
+            
+            user = await repository.insert(body=UserCreateDTO(login="ghost", password="password"))
+            await session.flush()
+            await repository.evict(user)
+            u = await repository.get_by_login(login="ghost")
+            assert u is not None
+            assert u.id == user.id
@@ -1,8 +1,14 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
 import pytest
 from redis.asyncio import Redis
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from infrastructure.models.role import Role
 from infrastructure.models.user import User
+from infrastructure.models.user_history import UserHistory
 from logic.services.cache import RedisCacheService
 from schemas.social import SocialCreateDTO, SocialNetworks
 from schemas.user import UserCreateDTO, UserHistoryCreateDTO
@@ -119,4 +125,153 @@ async def test_get_user_with_roles(db_session: AsyncSession, redis_client: Redis
             assert history[0].success
             
             social = await repository.get_user_social(social_id="3819", social_name=SocialNetworks.YANDEX)
-            assert social.user_id == user.id
\ No newline at end of file
+            assert social.user_id == user.id
+
+@pytest.mark.asyncio
+async def test_get_many(db_session: AsyncSession):
+    async with db_session as session:
+        repository = PostgresUserRepository(_session=session)
+        
+        john = await repository.insert(body=UserCreateDTO(login="johndoe", password="password"))
+        jane = await repository.insert(body=UserCreateDTO(login="janedoe", password="password"))
+        await session.flush()
+        
+        users = await repository.get_many(ids=[john.id, jane.id, john.id])
+        assert {user.login for user in users} == {"johndoe", "janedoe"}
+        assert await repository.get_many(ids=[]) == []
+
+
+@pytest.mark.asyncio
+async def test_login_is_one_read_and_one_write(db_session: AsyncSession):
+    async with db_session as session:
+        repository = PostgresUserRepository(_session=session)
+        
+        user = await repository.insert(body=UserCreateDTO(login="johndoe", password="password"))
+        role = Role(name="reader", description="Reader")
+        session.add(role)
+        await session.flush()
+        await repository.add_role(user=user, role_id=role.id)
+        
+        statements = []
+        def count_statement(conn, cursor, statement, *args):
+            statements.append(statement.lstrip().split()[0])
+        event.listen(session.bind.sync_engine, "before_cursor_execute", count_statement)
+        try:
+            snapshot = await repository.get_for_login(login="johndoe")
+            await repository.add_login(
+                data=UserHistoryCreateDTO(
+                    user_id=snapshot.id,
+                    user_agent="Chrome",
+                    user_device_type="web",
+                    success=True
+                )
+            )
+            await session.flush()
+        finally:
+            event.remove(session.bind.sync_engine, "before_cursor_execute", count_statement)
+        
+        assert statements == ["SELECT", "INSERT"]
+        assert snapshot.password == user.password
+        assert snapshot.role_names == frozenset({"reader"})
+        assert await repository.get_for_login(login="nobody") is None
+
+
+@pytest.mark.asyncio
+async def test_gets_after(db_session: AsyncSession):
+    async with db_session as session:
+        repository = PostgresUserRepository(_session=session)
+        
+        for index in range(5):
+            await repository.insert(body=UserCreateDTO(login=f"page{index}", password="password"))
+        await session.flush()
+        
+        first = await repository.gets_after(limit=3)
+        rest = await repository.gets_after(after=first[-1].id, limit=3)
+        ids = [user.id for user in [*first, *rest]]
+        assert len(first) == 3
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+        assert await repository.gets_after(after=ids[-1], limit=3) == []
+
+
+async def add_history(repository: PostgresUserRepository, user_id, count: int) -> datetime:
+    started = datetime(2025, 1, 1, tzinfo=UTC)
+    for minute in range(count):
+        await repository.add_login(
+            data=UserHistoryCreateDTO(
+                user_id=user_id,
+                attempted=started + timedelta(minutes=minute),
+                user_agent="Chrome",
+                user_device_type="web",
+                success=True
+            )
+        )
+    await repository._session.flush()
+    return started
+
+
+async def explain(session: AsyncSession, statement) -> str:
+    compiled = statement.compile(
+        dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    connection = await session.connection()
+    # the test tables are tiny, make the planner show what it would do at scale
+    await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    rows = await connection.exec_driver_sql(f"EXPLAIN {compiled}")
+    return "\n".join(row[0] for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_user_history_newest_first(db_session: AsyncSession):
+    async with db_session as session:
+        repository = PostgresUserRepository(_session=session)
+        user = await repository.insert(body=UserCreateDTO(login="history", password="password"))
+        await session.flush()
+        started = await add_history(repository, user.id, 5)
+        
+        first = await repository.get_user_history(user_id=user.id, limit=2)
+        rest = await repository.get_user_history(
+            user_id=user.id, after=(first[-1].attempted, first[-1].id), limit=10
+        )
+        attempted = [row.attempted for row in [*first, *rest]]
+        assert len(attempted) == 5
+        assert attempted == sorted(attempted, reverse=True)
+        
+        ranged = await repository.get_user_history(
+            user_id=user.id,
+            since=started + timedelta(minutes=1),
+            until=started + timedelta(minutes=3),
+        )
+        assert [row.attempted for row in ranged] == [
+            started + timedelta(minutes=2), started + timedelta(minutes=1)
+        ]
+
+
+@pytest.mark.asyncio
+async def test_user_history_plans_use_indexes(db_session: AsyncSession):
+    async with db_session as session:
+        repository = PostgresUserRepository(_session=session)
+        user = await repository.insert(body=UserCreateDTO(login="history", password="password"))
+        await session.flush()
+        started = await add_history(repository, user.id, 5)
+        
+        page_plan = await explain(
+            session,
+            repository._history_statement(
+                user_id=user.id,
+                after=(started + timedelta(minutes=4), uuid4()),
+                since=started,
+                limit=10,
+            ),
+        )
+        assert "ix_user_history_user_id_attempted" in page_plan
+        assert "Sort" not in page_plan
+        
+        range_plan = await explain(
+            session,
+            select(UserHistory).where(
+                UserHistory.attempted >= started,
+                UserHistory.attempted < started + timedelta(days=1),
+            ),
+        )
+        assert "ix_user_history_attempted_brin" in range_plan
@@ -0,0 +1,55 @@
+import pytest
+from async_fastapi_jwt_auth.exceptions import JWTDecodeError
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+from infrastructure.security import key_ring as key_ring_module
+from infrastructure.security.jwt import KeyRingAuthJWT
+from infrastructure.security.key_ring import KeyRing
+
+
+def write_private_key(path, key) -> None:
+    path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_key_ring_sign_verify_rotate(tmp_path, monkeypatch):
+    old_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    write_private_key(tmp_path / "2024-01.pem", old_key)
+    monkeypatch.setattr(key_ring_module, "key_ring", KeyRing.load(str(tmp_path)))
+    auth_jwt = KeyRingAuthJWT()
+    old_token = await auth_jwt.create_access_token(subject="user")
+    assert (await auth_jwt.get_unverified_jwt_headers(old_token))["kid"] == "2024-01"
+    
+    # rotate: the old key keeps only its public half
+    (tmp_path / "2024-01.pem").unlink()
+    (tmp_path / "2024-01.pub.pem").write_bytes(
+        old_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    write_private_key(tmp_path / "2025-01.pem", ed25519.Ed25519PrivateKey.generate())
+    key_ring = KeyRing.load(str(tmp_path))
+    monkeypatch.setattr(key_ring_module, "key_ring", key_ring)
+    
+    jwks = key_ring.jwks()["keys"]
+    assert {(key["kid"], key["alg"]) for key in jwks} == {
+        ("2024-01", "RS256"), ("2025-01", "EdDSA")
+    }
+    assert all("d" not in key for key in jwks)
+    
+    new_token = await auth_jwt.create_access_token(subject="user")
+    assert (await auth_jwt.get_raw_jwt(new_token))["sub"] == "user"
+    assert (await auth_jwt.get_raw_jwt(old_token))["sub"] == "user"
+    
+    (tmp_path / "2025-01.pem").unlink()
+    monkeypatch.setattr(key_ring_module, "key_ring", KeyRing.load(str(tmp_path)))
+    with pytest.raises(JWTDecodeError):
+        await auth_jwt.get_raw_jwt(new_token)
@@ -0,0 +1,45 @@
+import pytest
+from redis.asyncio import Redis
+
+from infrastructure.storages.revocation import RevocationFilter
+from infrastructure.storages.token import RedisTokenStorage
+from schemas.token import TokenJTI
+
+
+@pytest.mark.asyncio
+async def test_revocation_filter_follows_stream(redis_client: Redis):
+    async with redis_client as client:
+        writer = RedisTokenStorage(
+            _client=client, _filter=RevocationFilter(_client=client, _stream="test_revocations")
+        )
+        revocation_filter = RevocationFilter(_client=client, _stream="test_revocations")
+        reader = RedisTokenStorage(_client=client, _filter=revocation_filter)
+        
+        await writer.store_token(
+            token=TokenJTI(access_token_jti="access", refresh_token_jti="refresh")
+        )
+        assert not revocation_filter.is_fresh
+        assert await reader.check_expiration(jti="access")
+        
+        await revocation_filter.poll()
+        assert revocation_filter.is_fresh
+        assert "access" in revocation_filter
+        assert "refresh" in revocation_filter
+        assert not await reader.check_expiration(jti="unknown")
+        await client.delete("test_revocations", "access", "refresh")
+
+
+@pytest.mark.asyncio
+async def test_revocation_filter_fresh_only_after_backlog(redis_client: Redis):
+    async with redis_client as client:
+        writer = RevocationFilter(_client=client, _stream="test_revocation_backlog")
+        await writer.publish({f"jti{number}": 600 for number in range(2500)})
+        
+        revocation_filter = RevocationFilter(
+            _client=client, _stream="test_revocation_backlog"
+        )
+        await revocation_filter.poll()
+        assert revocation_filter.is_fresh
+        assert len(revocation_filter) == 2500
+        assert "jti2499" in revocation_filter
+        await client.delete("test_revocation_backlog")
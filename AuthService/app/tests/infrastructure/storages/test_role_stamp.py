@@ -0,0 +1,25 @@
+from time import time
+from uuid import uuid4
+
+import pytest
+from redis.asyncio import Redis
+
+from infrastructure.storages.role_stamp import RedisRoleStampStorage
+
+
+@pytest.mark.asyncio
+async def test_role_stamps(redis_client: Redis):
+    async with redis_client as client:
+        storage = RedisRoleStampStorage(_client=client, _catalog_key="test_roles_changed")
+        user_id, other_id = uuid4(), uuid4()
+        issued_at = int(time())
+        assert not await storage.changed_since(user_id=user_id, issued_at=issued_at)
+        
+        await storage.touch_user(user_id=user_id)
+        assert await storage.changed_since(user_id=user_id, issued_at=issued_at)
+        assert not await storage.changed_since(user_id=other_id, issued_at=issued_at)
+        assert not await storage.changed_since(user_id=user_id, issued_at=issued_at + 60)
+        
+        await storage.touch_catalog()
+        assert await storage.changed_since(user_id=other_id, issued_at=issued_at)
+        await client.delete("test_roles_changed", f"roles_changed_{user_id}")
@@ -0,0 +1,67 @@
+import gc
+import tracemalloc
+
+import pytest
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from logic.dependencies.registrator import Lifetime, reset_scope, scoped
+from logic.dependencies.services.cache_service_factory import create_user_cache_service
+from logic.dependencies.services.token_storage_factory import create_token_storage
+from logic.dependencies.services.user_service_factory import create_user_service
+from logic.services.password import get_password_hasher
+
+
+@pytest.mark.asyncio
+async def test_scoped_lifetimes():
+    calls = []
+
+    @scoped(Lifetime.WORKER)
+    def create_worker_scoped():
+        calls.append("worker")
+        return object()
+
+    @scoped(Lifetime.REQUEST)
+    async def create_request_scoped():
+        calls.append("request")
+        return object()
+
+    assert await create_worker_scoped() is await create_worker_scoped()
+    assert await create_request_scoped() is not await create_request_scoped()
+    reset_scope(Lifetime.WORKER)
+    await create_worker_scoped()
+    assert calls == ["worker", "request", "request", "worker"]
+
+
+@pytest.mark.asyncio
+async def test_request_scoped_services_do_not_accumulate():
+    reset_scope(Lifetime.WORKER)
+    redis = Redis()
+    password_hasher = get_password_hasher()
+
+    async def handle_request():
+        cache_service = await create_user_cache_service(redis=redis)
+        token_storage = await create_token_storage(redis_client=redis)
+        user_service = await create_user_service(
+            session=AsyncSession(),
+            redis=redis,
+            password_hasher=password_hasher,
+            cache_service=cache_service,
+        )
+        return cache_service, token_storage, user_service
+
+    first = await handle_request()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        for _ in range(100_000):
+            cache_service, token_storage, _ = await handle_request()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert cache_service is first[0] and token_storage is first[1]
+    assert current - baseline < 1024 * 1024
+    reset_scope(Lifetime.WORKER)
@@ -0,0 +1,90 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, status
+from redis.asyncio import Redis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.repositories.user import PostgresUserRepository
+from infrastructure.security.jwt import KeyRingAuthJWT
+from infrastructure.storages.token import RedisTokenStorage
+from logic.services.auth import AuthService, require_roles
+from logic.services.user import UserService
+from logic.unit_of_work.sqlalchemy import SqlAlchemyUnitOfWork
+from schemas.user import UserCreateDTO
+
+
+@pytest.mark.asyncio
+async def test_principal_resolved_once_per_request(
+    db_session: AsyncSession, redis_client: Redis
+):
+    async with db_session as session:
+        repository = PostgresUserRepository(_session=session)
+        user = await repository.insert(body=UserCreateDTO(login="principal", password="password"))
+        await session.flush()
+        
+        auth_jwt = KeyRingAuthJWT()
+        auth_jwt._token = await auth_jwt.create_access_token(
+            subject=str(user.id), user_claims={"roles": []}
+        )
+        auth_service = AuthService(
+            _auth_jwt_service=auth_jwt,
+            _token_storage=RedisTokenStorage(_client=redis_client),
+            _user_service=UserService(
+                _repository=repository, _uow=SqlAlchemyUnitOfWork(_session=session)
+            ),
+            _roles_strategy="database",
+        )
+        
+        statements = []
+        def count_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(session.bind.sync_engine, "before_cursor_execute", count_statement)
+        redis_calls = []
+        execute_command = redis_client.execute_command
+        async def count_command(*args, **kwargs):
+            redis_calls.append(args[0])
+            return await execute_command(*args, **kwargs)
+        redis_client.execute_command = count_command
+        try:
+            assert await auth_service.get_role_names() == frozenset()
+            user_load = len(statements)
+            assert (await auth_service.get_user()).id == user.id
+            assert (await auth_service.get_user()).id == user.id
+            await auth_service.require_auth()
+        finally:
+            redis_client.execute_command = execute_command
+            event.remove(session.bind.sync_engine, "before_cursor_execute", count_statement)
+        
+        assert redis_calls == ["GET"]
+        assert len(statements) == user_load
+        assert sum(statement.lstrip().startswith("SELECT users.") for statement in statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_require_roles_rejects_without_database(
+    db_session: AsyncSession, redis_client: Redis
+):
+    async with db_session as session:
+        auth_jwt = KeyRingAuthJWT()
+        auth_jwt._token = await auth_jwt.create_access_token(
+            subject=str(uuid4()), user_claims={"roles": ["user"]}
+        )
+        repository = PostgresUserRepository(_session=session)
+        auth_service = AuthService(
+            _auth_jwt_service=auth_jwt,
+            _token_storage=RedisTokenStorage(_client=redis_client),
+            _user_service=UserService(
+                _repository=repository, _uow=SqlAlchemyUnitOfWork(_session=session)
+            ),
+            _roles_strategy="token",
+        )
+        
+        with pytest.raises(HTTPException) as error:
+            await require_roles(["admin"]).dependency(auth_service=auth_service)
+        
+        assert error.value.status_code == status.HTTP_403_FORBIDDEN
+        assert not session.in_transaction()
+        principal = await require_roles(["user"]).dependency(auth_service=auth_service)
+        assert principal.role_names == frozenset({"user"})
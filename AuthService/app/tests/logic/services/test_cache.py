@@ -1,8 +1,17 @@
+import asyncio
+
 import pytest
 from redis.asyncio import Redis
 
 from schemas.user import UserCreateDTO
-from logic.services.cache import RedisCacheService
+from logic.services.cache import (
+    CacheInvalidationBus,
+    LocalCache,
+    RedisCacheService,
+    TieredCacheService,
+    get_local_cache,
+    refresh_tasks,
+)
 from infrastructure.models.user import User
 
 
@@ -19,4 +28,62 @@ async def test_cache_insert_get_delete(redis_client: Redis):
         assert u.tg_id is None
         await cache_service.delete(key=user.login)
         u = await cache_service.get(key=user.login)
-        assert u is None
\ No newline at end of file
+        assert u is None
+
+def test_local_cache_lru_ttl():
+    local_cache = LocalCache(_max_size=2, _ttl=60)
+    local_cache.set("a", 1)
+    local_cache.set("b", 2)
+    assert local_cache.get("a") == 1
+    local_cache.set("c", 3)
+    assert local_cache.get("b") is None
+    assert local_cache.get("a") == 1
+    assert len(local_cache) == 2
+    
+    expired_cache = LocalCache(_max_size=2, _ttl=0)
+    expired_cache.set("a", 1)
+    assert expired_cache.get("a") is None
+    
+
+@pytest.mark.asyncio
+async def test_tiered_cache_invalidation(redis_client: Redis):
+    async with redis_client as client:
+        local_cache = get_local_cache("test_tiered", max_size=10, ttl=60)
+        cache_service = TieredCacheService(
+            _local=local_cache,
+            _remote=RedisCacheService(_client=client, _model=User),
+            _bus=CacheInvalidationBus(_client=client),
+        )
+        user = UserCreateDTO(login="johndoe", password="password")
+        await cache_service.set(key=user.login, value=user)
+        assert local_cache.get(user.login) is not None
+        
+        await client.delete(user.login)
+        u = await cache_service.get(key=user.login)
+        assert u.login == user.login
+        
+        await cache_service.delete_many(keys=[user.login])
+        assert local_cache.get(user.login) is None
+        assert await cache_service.get(key=user.login) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_early_refresh_once_per_key(redis_client: Redis):
+    async with redis_client as client:
+        cache_service = RedisCacheService(
+            _client=client, _model=User, _ttl=60, _beta=1e9
+        )
+        user = UserCreateDTO(login="johndoe", password="password")
+        await cache_service.set(key=user.login, value=user, delta=1.0)
+        
+        refreshes = []
+        async def refresh():
+            await asyncio.sleep(0.01)
+            refreshes.append(user.login)
+        
+        for _ in range(3):
+            u = await cache_service.get(key=user.login, refresh=refresh)
+            assert u.login == user.login
+        await asyncio.gather(*refresh_tasks.values())
+        assert refreshes == [user.login]
+        await cache_service.delete(key=user.login)
@@ -0,0 +1,28 @@
+from uuid import uuid4
+
+import pytest
+
+from infrastructure.models.snapshot import RoleSnapshot, UserSnapshot
+from logic.services.codecs import CODECS, CacheSerializer
+
+
+@pytest.mark.parametrize("codec", CODECS.values(), ids=CODECS.keys())
+def test_serializer_round_trip(codec):
+    user = UserSnapshot(
+        id=uuid4(),
+        login="johndoe",
+        password="hash",
+        roles=(RoleSnapshot(id=uuid4(), name="user"),),
+    )
+    serializer = CacheSerializer(_codec=codec, _schema_version=1)
+    document = serializer.dumps(user.to_dict())
+    assert document[:2] == codec.tag + b"\x01"
+    assert UserSnapshot(**serializer.loads(document)) == user
+
+
+def test_serializer_reads_other_codec_rejects_other_version():
+    data = {"login": "johndoe"}
+    document = CacheSerializer(_codec=CODECS["msgpack"], _schema_version=1).dumps(data)
+    assert CacheSerializer(_codec=CODECS["orjson"], _schema_version=1).loads(document) == data
+    assert CacheSerializer(_codec=CODECS["orjson"], _schema_version=2).loads(document) is None
+    assert CacheSerializer(_codec=CODECS["orjson"], _schema_version=1).loads(b'{"login":"johndoe"}') is None
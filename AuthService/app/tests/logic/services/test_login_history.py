@@ -0,0 +1,118 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from infrastructure.metrics.registry import metrics
+from infrastructure.models.user_history import UserHistory
+from infrastructure.repositories.user import PostgresUserRepository
+from logic.services.login_history import LoginHistoryWriter
+from schemas.user import UserCreateDTO, UserHistoryCreateDTO
+
+
+def history_row(user_id) -> UserHistoryCreateDTO:
+    return UserHistoryCreateDTO(
+        user_id=user_id, user_agent="Chrome", user_device_type="web", success=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_login_history_written_in_batches(db_session: AsyncSession):
+    async with db_session as session:
+        user = await PostgresUserRepository(_session=session).insert(
+            body=UserCreateDTO(login="history", password="password")
+        )
+        await session.commit()
+        
+        writer = LoginHistoryWriter(
+            _session_factory=async_sessionmaker(bind=session.bind),
+            _batch_size=2,
+            _flush_interval=60,
+        )
+        for _ in range(5):
+            assert writer.submit(history_row(user.id))
+        
+        inserts = []
+        def count_insert(conn, cursor, statement, *args):
+            if statement.lstrip().startswith("INSERT"):
+                inserts.append(statement)
+        event.listen(session.bind.sync_engine, "before_cursor_execute", count_insert)
+        try:
+            writer.close()
+            await asyncio.wait_for(writer.run(), timeout=5)
+        finally:
+            event.remove(session.bind.sync_engine, "before_cursor_execute", count_insert)
+        
+        assert len(inserts) == 3
+        assert writer.queue_depth == 0
+        count = await session.scalar(
+            select(func.count()).select_from(UserHistory).where(UserHistory.user_id == user.id)
+        )
+        assert count == 5
+
+
+@pytest.mark.asyncio
+async def test_login_history_keeps_valid_rows_of_rejected_batch(db_session: AsyncSession):
+    async with db_session as session:
+        user = await PostgresUserRepository(_session=session).insert(
+            body=UserCreateDTO(login="history_fk", password="password")
+        )
+        await session.commit()
+        
+        writer = LoginHistoryWriter(
+            _session_factory=async_sessionmaker(bind=session.bind),
+            _batch_size=3,
+            _flush_interval=60,
+        )
+        dropped = metrics.counter("login_history_dropped")
+        writer.submit(history_row(user.id))
+        # no such user, violates the foreign key
+        writer.submit(history_row(uuid4()))
+        writer.submit(history_row(user.id))
+        writer.close()
+        await asyncio.wait_for(writer.run(), timeout=5)
+        
+        count = await session.scalar(
+            select(func.count()).select_from(UserHistory).where(UserHistory.user_id == user.id)
+        )
+        assert count == 2
+        assert metrics.counter("login_history_dropped") == dropped + 1
+
+
+@pytest.mark.asyncio
+async def test_login_history_dropped_when_full():
+    writer = LoginHistoryWriter(_max_size=1)
+    dropped = metrics.counter("login_history_dropped")
+    
+    assert writer.submit(history_row("00000000-0000-0000-0000-000000000001"))
+    assert not writer.submit(history_row("00000000-0000-0000-0000-000000000001"))
+    assert metrics.counter("login_history_dropped") == dropped + 1
+    assert writer.queue_depth == 1
+
+
+@pytest.mark.asyncio
+async def test_login_history_writer_survives_connect_errors():
+    attempts = []
+    def refuse():
+        attempts.append(1)
+        raise ConnectionRefusedError()
+    
+    writer = LoginHistoryWriter(
+        _session_factory=refuse, _max_size=2, _batch_size=1, _retry_delay=0
+    )
+    errors = metrics.counter("login_history_write_errors")
+    runner = asyncio.create_task(writer.run())
+    for _ in range(2):
+        assert writer.submit(history_row("00000000-0000-0000-0000-000000000001"))
+        await asyncio.sleep(0.01)
+    assert not runner.done()
+    
+    writer.submit(history_row("00000000-0000-0000-0000-000000000001"))
+    writer.submit(history_row("00000000-0000-0000-0000-000000000001"))
+    # returns at once even with a full queue
+    writer.close()
+    await asyncio.wait_for(runner, timeout=5)
+    assert metrics.counter("login_history_write_errors") - errors == len(attempts)
+    assert len(attempts) >= 3
@@ -0,0 +1,194 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from infrastructure.kafka import sender as kafka_sender
+from infrastructure.metrics.registry import metrics
+from infrastructure.models.outbox import OutboxEvent
+from infrastructure.repositories.outbox import PostgresOutboxRepository
+from infrastructure.repositories.user import PostgresUserRepository
+from logic.services.events import DomainEvents
+from logic.services.outbox_relay import OutboxRelay
+from logic.services.user import UserService
+from logic.unit_of_work.sqlalchemy import SqlAlchemyUnitOfWork
+from schemas.user import UserCreateDTO, UserUpdateDTO
+
+
+class FakeProducer:
+    def __init__(self, fail: bool = False):
+        self.sent = []
+        self.fail = fail
+        
+    async def send(self, topic, value=None, key=None):
+        self.sent.append((topic, value))
+        delivery = asyncio.get_running_loop().create_future()
+        if self.fail:
+            from aiokafka.errors import KafkaError
+            delivery.set_exception(KafkaError())
+        else:
+            delivery.set_result(None)
+        return delivery
+
+
+async def outbox_size(session: AsyncSession) -> int:
+    return await session.scalar(select(func.count()).select_from(OutboxEvent))
+
+
+@pytest.mark.asyncio
+async def test_registration_writes_outbox_in_same_transaction(db_session: AsyncSession):
+    async with db_session as session:
+        user_service = UserService(
+            _repository=PostgresUserRepository(_session=session),
+            _uow=SqlAlchemyUnitOfWork(_session=session),
+            _events=DomainEvents(_outbox=PostgresOutboxRepository(_session=session)),
+        )
+        result = await user_service.create_user(
+            UserCreateDTO(login="outbox", password="password")
+        )
+        assert result.is_success
+        events = (await session.scalars(select(OutboxEvent))).all()
+        assert [event.topic for event in events] == ["user.registered"]
+        assert b'"outbox"' in events[0].payload
+
+
+@pytest.mark.asyncio
+async def test_user_events_are_staged_in_outbox(db_session: AsyncSession):
+    async with db_session as session:
+        sender = kafka_sender.KafkaSender(_producer=FakeProducer())
+        user_service = UserService(
+            _repository=PostgresUserRepository(_session=session),
+            _uow=SqlAlchemyUnitOfWork(_session=session),
+            _events=DomainEvents(
+                _sender=sender, _outbox=PostgresOutboxRepository(_session=session)
+            ),
+        )
+        user = (await user_service.create_user(
+            UserCreateDTO(login="outbox_events", password="password")
+        )).response
+        await user_service.update_user(user.id, UserUpdateDTO(email="a@example.com"))
+        await user_service.delete_user(user_id=user.id)
+        
+        events = (await session.scalars(select(OutboxEvent).order_by(OutboxEvent.id))).all()
+        assert [event.topic for event in events] == [
+            "user.registered", "user.events", "user.events"
+        ]
+        assert [event.key for event in events[1:]] == [str(user.id).encode()] * 2
+        assert sender._producer.sent == []
+
+
+@pytest.mark.asyncio
+async def test_relay_publishes_and_deletes_batches(db_session: AsyncSession):
+    async with db_session as session:
+        repository = PostgresOutboxRepository(_session=session)
+        for number in range(5):
+            await repository.add(topic="user.registered", payload=b"%d" % number)
+        await session.commit()
+        
+        producer = FakeProducer()
+        relay = OutboxRelay(
+            _session_factory=async_sessionmaker(bind=session.bind),
+            _get_producer=lambda: producer,
+            _batch_size=2,
+        )
+        assert await relay.relay_batch() == 2
+        assert await relay.relay_batch() == 2
+        assert await relay.relay_batch() == 1
+        assert await relay.relay_batch() == 0
+        
+        assert [value for _, value in producer.sent] == [b"0", b"1", b"2", b"3", b"4"]
+        assert await outbox_size(session) == 0
+
+
+@pytest.mark.asyncio
+async def test_relay_keeps_events_when_kafka_fails(db_session: AsyncSession):
+    async with db_session as session:
+        await PostgresOutboxRepository(_session=session).add(
+            topic="user.registered", payload=b"kept"
+        )
+        await session.commit()
+        
+        relay = OutboxRelay(
+            _session_factory=async_sessionmaker(bind=session.bind),
+            _get_producer=lambda: FakeProducer(fail=True),
+        )
+        with pytest.raises(Exception):
+            await relay.relay_batch()
+        assert await outbox_size(session) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_relays_skip_locked_rows(db_session: AsyncSession):
+    async with db_session as session:
+        repository = PostgresOutboxRepository(_session=session)
+        for number in range(4):
+            await repository.add(topic="user.registered", payload=b"%d" % number)
+        await session.commit()
+        
+        factory = async_sessionmaker(bind=session.bind)
+        async with factory() as first, factory() as second:
+            claimed = await PostgresOutboxRepository(_session=first).claim(limit=2)
+            others = await PostgresOutboxRepository(_session=second).claim(limit=10)
+            assert {event.id for event in claimed}.isdisjoint(
+                {event.id for event in others}
+            )
+            assert len(claimed) + len(others) == 4
+
+
+class GatedProducer(FakeProducer):
+    """Holds every delivery until ``gate`` is set."""
+    def __init__(self):
+        super().__init__()
+        self.gate = asyncio.Event()
+        
+    async def send(self, topic, value=None, key=None):
+        self.sent.append((topic, value))
+        return asyncio.ensure_future(self.gate.wait())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_relays_keep_key_order(db_session: AsyncSession):
+    async with db_session as session:
+        repository = PostgresOutboxRepository(_session=session)
+        for number in range(4):
+            await repository.add(topic="user.events", payload=b"%d" % number, key=b"user")
+        await session.commit()
+        
+        factory = async_sessionmaker(bind=session.bind)
+        producer = GatedProducer()
+        first = OutboxRelay(
+            _session_factory=factory, _get_producer=lambda: producer, _batch_size=2
+        )
+        second = OutboxRelay(
+            _session_factory=factory, _get_producer=lambda: producer, _batch_size=10
+        )
+        publishing = asyncio.create_task(first.relay_batch())
+        while len(producer.sent) < 2:
+            await asyncio.sleep(0.01)
+        # the rest of the key waits until the first batch is acknowledged
+        assert await second.relay_batch() == 0
+        
+        producer.gate.set()
+        assert await publishing == 2
+        assert await second.relay_batch() == 2
+        assert [value for _, value in producer.sent] == [b"0", b"1", b"2", b"3"]
+        assert await outbox_size(session) == 0
+
+
+@pytest.mark.asyncio
+async def test_relay_survives_connect_errors():
+    def refuse():
+        raise ConnectionRefusedError()
+    
+    errors = metrics.counter("outbox_relay_errors")
+    relay = OutboxRelay(_session_factory=refuse)
+    kafka_sender.producer_ready.set()
+    runner = asyncio.create_task(relay.run(retry_delay=0))
+    try:
+        await asyncio.sleep(0.05)
+        assert not runner.done()
+        assert metrics.counter("outbox_relay_errors") - errors >= 2
+    finally:
+        runner.cancel()
+        kafka_sender.producer_ready.clear()
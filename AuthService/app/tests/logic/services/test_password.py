@@ -0,0 +1,36 @@
+import asyncio
+import pytest
+
+from logic.services.password import create_password_hasher
+
+
+@pytest.mark.asyncio
+async def test_hash_verify():
+    hasher = create_password_hasher(backend="thread", max_workers=2)
+    try:
+        password_hash = await hasher.hash("password")
+        assert password_hash != "password"
+        assert await hasher.verify("password", password_hash) is True
+        assert await hasher.verify("wrong_password", password_hash) is False
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_depth():
+    hasher = create_password_hasher(backend="thread", max_workers=1)
+    try:
+        tasks = [asyncio.create_task(hasher.hash("password")) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert hasher.in_flight == 3
+        assert hasher.queue_depth == 2
+        await asyncio.gather(*tasks)
+        assert hasher.in_flight == 0
+        assert hasher.queue_depth == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_password_hasher(backend="unknown", max_workers=1)
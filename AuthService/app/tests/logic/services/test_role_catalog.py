@@ -0,0 +1,60 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from redis.asyncio import Redis
+
+from infrastructure.models.snapshot import RoleSnapshot
+from logic.services.role_catalog import RoleCatalog
+
+
+@pytest.mark.asyncio
+async def test_role_catalog_reloads_on_version_bump(redis_client: Redis):
+    async with redis_client as client:
+        roles = [RoleSnapshot(id=uuid4(), name="user")]
+        loads = []
+        async def loader():
+            loads.append(len(roles))
+            return list(roles)
+        
+        catalog = RoleCatalog(_client=client, _version_key="test_role_catalog")
+        snapshot = await catalog.current(loader)
+        assert snapshot.get(str(roles[0].id)).name == "user"
+        assert snapshot.get("not-a-uuid") is None
+        assert await catalog.current(loader) is snapshot
+        
+        roles.append(RoleSnapshot(id=uuid4(), name="admin"))
+        version = await catalog.bump()
+        snapshot = await catalog.current(loader)
+        assert snapshot.version == version
+        assert [role.name for role in snapshot.roles()] == ["admin", "user"]
+        assert len(loads) == 2
+        await client.delete("test_role_catalog")
+
+
+@pytest.mark.asyncio
+async def test_role_catalog_drops_load_raced_by_bump(redis_client: Redis):
+    async with redis_client as client:
+        catalog = RoleCatalog(_client=client, _version_key="test_role_catalog_race")
+        loading, release = asyncio.Event(), asyncio.Event()
+        roles = [RoleSnapshot(id=uuid4(), name="user")]
+        async def slow_loader():
+            rows = list(roles)
+            loading.set()
+            await release.wait()
+            return rows
+        
+        load = asyncio.create_task(catalog.current(slow_loader))
+        await loading.wait()
+        # the bump commits after the loader read its rows
+        roles.append(RoleSnapshot(id=uuid4(), name="admin"))
+        version = await catalog.bump()
+        release.set()
+        assert [role.name for role in (await load).roles()] == ["user"]
+        
+        async def loader():
+            return list(roles)
+        snapshot = await catalog.current(loader)
+        assert snapshot.version == version
+        assert [role.name for role in snapshot.roles()] == ["admin", "user"]
+        await client.delete("test_role_catalog_race")
@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+
+from infrastructure.metrics.registry import metrics
+from logic.services.single_flight import SingleFlight
+
+
+async def _lookup():
+    return None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_are_coalesced():
+    single_flight = SingleFlight()
+    calls = 0
+    
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "user"
+    
+    coalesced = metrics.counter("single_flight_coalesced")
+    results = await asyncio.gather(
+        *(single_flight.do("User_1", loader, _lookup) for _ in range(10))
+    )
+    assert results == ["user"] * 10
+    assert calls == 1
+    assert metrics.counter("single_flight_coalesced") - coalesced == 9
+    
+    await single_flight.do("User_1", loader, _lookup)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_loader_error_reaches_every_waiter():
+    single_flight = SingleFlight()
+    
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database is down")
+    
+    results = await asyncio.gather(
+        *(single_flight.do("User_1", loader, _lookup) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_waiter_loads_when_leader_is_cancelled():
+    single_flight = SingleFlight()
+    started = asyncio.Event()
+    
+    async def slow_loader():
+        started.set()
+        await asyncio.sleep(10)
+        
+    async def loader():
+        return "user"
+    
+    leader = asyncio.create_task(single_flight.do("User_1", slow_loader, _lookup))
+    await started.wait()
+    waiter = asyncio.create_task(single_flight.do("User_1", loader, _lookup))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await waiter == "user"
@@ -1,8 +1,11 @@
+import orjson
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from schemas.role import RoleCreateDTO
+from infrastructure.kafka.sender import BaseSender
+from schemas.role import RoleCreateDTO, RoleUpdateDTO
 from schemas.user import UserCreateDTO
+from logic.services.events import DomainEvents
 from logic.services.role import RoleService
 from logic.services.user import UserService
 from infrastructure.repositories.role import PostgresRoleRepository
@@ -61,4 +64,57 @@ async def test_create_delete_update_get_role(db_session: AsyncSession):
         
         
         
-        
\ No newline at end of file
+        
+
+class RecordingSender(BaseSender):
+    def __init__(self):
+        self.sent = []
+        
+    async def send(self, topic, value, key=None):
+        self.sent.append((topic, key, orjson.loads(value)))
+
+
+@pytest.mark.asyncio
+async def test_role_changes_emit_user_events(db_session: AsyncSession):
+    async with db_session as session:
+        sender = RecordingSender()
+        user_service = UserService(
+            _repository=PostgresUserRepository(_session=session),
+            _uow=SqlAlchemyUnitOfWork(_session=session),
+            _events=DomainEvents(_sender=sender),
+        )
+        role_service = RoleService(
+            _repository=PostgresRoleRepository(_session=session),
+            _uow=SqlAlchemyUnitOfWork(_session=session),
+            _events=DomainEvents(_sender=sender),
+        )
+        user_role_service = UserRoleService(
+            _user_repository=PostgresUserRepository(_session=session),
+            _role_repository=PostgresRoleRepository(_session=session),
+            _uow=SqlAlchemyUnitOfWork(_session=session),
+            _events=DomainEvents(_sender=sender),
+        )
+        user = (await user_service.create_user(
+            UserCreateDTO(login="events", password="password")
+        )).response
+        role = (await role_service.create_role(RoleCreateDTO(name="events"))).response
+        sender.sent.clear()
+        
+        await user_role_service.assign_role_to_user(user_id=user.id, role_id=role.id)
+        # assigning it again changes nothing and emits nothing
+        await user_role_service.assign_role_to_user(user_id=user.id, role_id=role.id)
+        await user_role_service.remove_role_from_user(user_id=user.id, role_id=role.id)
+        await role_service.update_role(role.id, RoleUpdateDTO(name="renamed"))
+        await user_service.delete_user(user_id=user.id)
+        
+        assert [(topic, message["event"]) for topic, _, message in sender.sent] == [
+            ("user.events", "user.role_assigned"),
+            ("user.events", "user.role_removed"),
+            ("role.events", "role.updated"),
+            ("user.events", "user.deleted"),
+        ]
+        user_key = str(user.id).encode()
+        assert [key for topic, key, _ in sender.sent if topic == "user.events"] == [
+            user_key, user_key, user_key
+        ]
+        assert sender.sent[0][2]["role_name"] == "events"
@@ -0,0 +1,118 @@
+import orjson
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from infrastructure.kafka.sender import BaseSender
+from infrastructure.repositories.role import PostgresRoleRepository
+from infrastructure.repositories.user import PostgresUserRepository
+from logic.services.role import RoleService
+from logic.services.user import UserService
+from logic.services.user_role import UserRoleService
+from logic.services.user_snapshots import UserSnapshotPublisher
+from logic.unit_of_work.sqlalchemy import SqlAlchemyUnitOfWork
+from schemas.role import RoleCreateDTO
+from schemas.user import UserCreateDTO
+
+
+class RecordingSender(BaseSender):
+    def __init__(self):
+        self.sent = []
+        
+    async def send(self, topic, value, key=None):
+        self.sent.append(
+            (topic, key.decode(), orjson.loads(value) if value is not None else None)
+        )
+
+
+@pytest.mark.asyncio
+async def test_user_changes_publish_snapshots(db_session: AsyncSession):
+    async with db_session as session:
+        sender = RecordingSender()
+        snapshots = UserSnapshotPublisher(
+            _sender=sender, _session_factory=async_sessionmaker(bind=session.bind)
+        )
+        uow = SqlAlchemyUnitOfWork(_session=session)
+        user_service = UserService(
+            _repository=PostgresUserRepository(_session=session),
+            _uow=uow,
+            _snapshots=snapshots,
+        )
+        role_service = RoleService(
+            _repository=PostgresRoleRepository(_session=session), _uow=uow
+        )
+        user_role_service = UserRoleService(
+            _user_repository=PostgresUserRepository(_session=session),
+            _role_repository=PostgresRoleRepository(_session=session),
+            _uow=uow,
+            _snapshots=snapshots,
+        )
+        user = (await user_service.create_user(
+            UserCreateDTO(login="snapshot", password="password")
+        )).response
+        role = (await role_service.create_role(RoleCreateDTO(name="reader"))).response
+        await user_role_service.assign_role_to_user(user_id=user.id, role_id=role.id)
+        await user_service.delete_user(user_id=user.id)
+        
+        assert {key for _, key, _ in sender.sent} == {str(user.id)}
+        created, assigned, deleted = [value for _, _, value in sender.sent]
+        assert created["login"] == "snapshot" and created["roles"] == []
+        assert "password" not in created
+        assert [role["name"] for role in assigned["roles"]] == ["reader"]
+        assert deleted is None
+
+
+@pytest.mark.asyncio
+async def test_backfill_walks_users_in_batches(db_session: AsyncSession):
+    async with db_session as session:
+        repository = PostgresUserRepository(_session=session)
+        for number in range(5):
+            await repository.insert(
+                body=UserCreateDTO(login=f"backfill{number}", password="password")
+            )
+        await session.commit()
+        
+        sender = RecordingSender()
+        publisher = UserSnapshotPublisher(
+            _sender=sender,
+            _session_factory=async_sessionmaker(bind=session.bind),
+            _batch_size=2,
+        )
+        assert await publisher.backfill() >= 5
+        keys = [key for _, key, _ in sender.sent]
+        assert keys == sorted(keys)
+        assert len(set(keys)) == len(keys)
+
+
+@pytest.mark.asyncio
+async def test_backfill_chunks_user_ids(db_session: AsyncSession):
+    async with db_session as session:
+        repository = PostgresUserRepository(_session=session)
+        users = [
+            await repository.insert(
+                body=UserCreateDTO(login=f"chunk{number}", password="password")
+            )
+            for number in range(5)
+        ]
+        await session.commit()
+        
+        statements = []
+        def count_select(conn, cursor, statement, parameters, *args):
+            if "FROM users" in statement and "users_1" not in statement:
+                statements.append(parameters)
+        event.listen(session.bind.sync_engine, "before_cursor_execute", count_select)
+        try:
+            sender = RecordingSender()
+            publisher = UserSnapshotPublisher(
+                _sender=sender,
+                _session_factory=async_sessionmaker(bind=session.bind),
+                _batch_size=2,
+            )
+            published = await publisher.backfill(user_ids=[user.id for user in users])
+        finally:
+            event.remove(session.bind.sync_engine, "before_cursor_execute", count_select)
+        
+        assert published == 5
+        assert {key for _, key, _ in sender.sent} == {str(user.id) for user in users}
+        assert len(statements) == 3
+        assert all(len(parameters) <= 3 for parameters in statements)
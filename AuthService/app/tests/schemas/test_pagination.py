@@ -0,0 +1,24 @@
+import pytest
+
+from schemas.pagination import Page, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("3984c4ce-a8fb-40c4-9198-52f11b68358c")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ["3984c4ce-a8fb-40c4-9198-52f11b68358c"]
+    assert decode_cursor(encode_cursor("2025-01-01T00:00:00+00:00", 1)) == [
+        "2025-01-01T00:00:00+00:00", "1"
+    ]
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "e30", "W10", encode_cursor("a")[:-2], "ünï"])
+def test_decode_cursor_rejects_foreign_cursors(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_page_defaults():
+    page = Page[int](items=[1, 2])
+    assert page.next_cursor is None
+    assert page.estimated_total is None